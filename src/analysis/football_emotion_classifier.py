@@ -7,14 +7,125 @@ Berdasarkan 6 kategori emosi konteks sepakbola Indonesia
 import pandas as pd
 import numpy as np
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
 import logging
 
+from src.preprocessing.document import AnalyzedDocument
+from src.preprocessing.trie_regex import SubstringFinder
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# Karakter non-ASCII yang cocok dengan huruf ASCII di bawah re.IGNORECASE
+# tetapi tidak menjadi huruf itu lewat str.lower()
+_CASEFOLD_SPECIALS = frozenset('\u0130\u0131\u017f\u212a')
+
+
+def _leading_literals(items) -> Optional[FrozenSet[str]]:
+    """Literal yang pasti mengawali setiap match (salah satunya), atau None"""
+    items = list(items)
+    if not items:
+        return None
+    op, av = items[0]
+    if op is sre_parse.LITERAL:
+        prefix = ''
+        for op, av in items:
+            if op is not sre_parse.LITERAL:
+                break
+            prefix += chr(av)
+        if not prefix.isascii():
+            return None
+        # re factors shared prefixes out of alternations ("kenapa|kok" -> "k" + ...)
+        tails = _leading_literals(items[len(prefix):])
+        if tails is None:
+            return frozenset([prefix.lower()])
+        return frozenset(prefix.lower() + tail for tail in tails)
+    if op is sre_parse.SUBPATTERN:
+        return _leading_literals(av[-1])
+    if op is sre_parse.BRANCH:
+        literals = set()
+        for branch in av[1]:
+            branch_literals = _leading_literals(branch)
+            if branch_literals is None:
+                return None
+            literals |= branch_literals
+        return frozenset(literals)
+    return None
+
+
+class CompiledEmotionEngine:
+    """
+    Skor semua emosi sebuah teks dengan pola yang dikompilasi sekali
+
+    Semua keyword, ditambah literal yang harus mengawali setiap pola regex
+    (mis. ``kecewa``/``sedih`` untuk ``(kecewa|sedih)\\s+...``), dicari
+    dengan satu ``SubstringFinder`` di atas teks lowercase. Pola yang
+    literal awalnya tidak muncul pasti tidak cocok, jadi hanya sisanya yang
+    dijalankan (sudah dikompilasi, ``re.IGNORECASE``). Hasilnya sama persis
+    dengan loop ``keyword in text_lower`` / ``re.search`` per emosi.
+    """
+    
+    def __init__(self, emotion_keywords: Dict[str, List[str]],
+                 emotion_patterns: Dict[str, List[str]]):
+        self.emotions = list(emotion_keywords)
+        emotion_index = {emotion: i for i, emotion in enumerate(self.emotions)}
+        
+        # keyword -> {emotion index: berapa kali keyword ada di daftar emosi}
+        self._keyword_emotions: Dict[str, Dict[int, int]] = {}
+        for emotion, keywords in emotion_keywords.items():
+            for keyword in keywords:
+                counts = self._keyword_emotions.setdefault(keyword, {})
+                counts[emotion_index[emotion]] = counts.get(emotion_index[emotion], 0) + 1
+        
+        # (emotion index, compiled pattern); literal -> pola yang diawalinya
+        self._patterns: List[Tuple[int, Pattern]] = []
+        self._ungated: List[int] = []
+        self._anchor_patterns: Dict[str, List[int]] = {}
+        for emotion, patterns in emotion_patterns.items():
+            for pattern in patterns:
+                pattern_id = len(self._patterns)
+                self._patterns.append((emotion_index[emotion], re.compile(pattern, re.IGNORECASE)))
+                anchors = _leading_literals(sre_parse.parse(pattern))
+                if anchors is None:
+                    self._ungated.append(pattern_id)
+                    continue
+                for anchor in anchors:
+                    self._anchor_patterns.setdefault(anchor, []).append(pattern_id)
+        
+        self._finder = SubstringFinder(list(self._keyword_emotions) + list(self._anchor_patterns))
+    
+    def matched_patterns(self, text: str, present=None) -> List[int]:
+        """Index pola yang cocok di mana pun dalam teks"""
+        if present is None or not _CASEFOLD_SPECIALS.isdisjoint(text):
+            candidates = range(len(self._patterns))
+        else:
+            candidates = set(self._ungated)
+            for literal in present:
+                candidates.update(self._anchor_patterns.get(literal, ()))
+            candidates = sorted(candidates)
+        return [
+            pattern_id for pattern_id in candidates
+            if self._patterns[pattern_id][1].search(text)
+        ]
+    
+    def scores(self, text: str) -> List[int]:
+        """keyword (1x) + pattern (2x) per emosi, urutan ``self.emotions``"""
+        scores = [0] * len(self.emotions)
+        present = self._finder.find(text.lower())
+        for literal in present:
+            for emotion, count in self._keyword_emotions.get(literal, {}).items():
+                scores[emotion] += count
+        for pattern_id in self.matched_patterns(text, present):
+            scores[self._patterns[pattern_id][0]] += 2
+        return scores
+
+
 class FootballEmotionClassifier:
     """
     Classifier untuk 6 emosi spesifik sepakbola:
@@ -29,6 +140,7 @@ class FootballEmotionClassifier:
     def __init__(self):
         self.emotion_keywords = self._build_emotion_keywords()
         self.emotion_patterns = self._build_emotion_patterns()
+        self.engine = CompiledEmotionEngine(self.emotion_keywords, self.emotion_patterns)
         
     def _build_emotion_keywords(self) -> Dict[str, List[str]]:
         """Build keyword dictionary untuk setiap emosi"""
@@ -151,9 +263,8 @@ class FootballEmotionClassifier:
             ]
         }
     
-    def _count_keyword_matches(self, text: str, keywords: List[str]) -> int:
-        """Hitung jumlah keyword yang cocok dalam teks"""
-        text_lower = text.lower()
+    def _count_keyword_matches(self, text_lower: str, keywords: List[str]) -> int:
+        """Hitung jumlah keyword yang cocok dalam teks (sudah lowercase)"""
         count = 0
         for keyword in keywords:
             if keyword in text_lower:
@@ -168,14 +279,23 @@ class FootballEmotionClassifier:
                 count += 1
         return count
     
-    def _calculate_emotion_scores(self, text: str) -> Dict[str, float]:
-        """Hitung score untuk setiap emosi"""
+    def _calculate_emotion_scores(self, text: str, use_engine: bool = True) -> Dict[str, float]:
+        """
+        Hitung score untuk setiap emosi
+        
+        ``use_engine=False`` menjalankan loop per keyword / per pola yang
+        lama; hasilnya identik dengan ``CompiledEmotionEngine``.
+        """
+        if use_engine:
+            return dict(zip(self.engine.emotions, self.engine.scores(text)))
+        
         scores = {}
+        text_lower = text.lower()
         
         for emotion in self.emotion_keywords.keys():
             # Hitung keyword matches
             keyword_count = self._count_keyword_matches(
-                text, 
+                text_lower,
                 self.emotion_keywords[emotion]
             )
             
@@ -238,6 +358,75 @@ class FootballEmotionClassifier:
         
         return primary_emotion, confidence, scores
     
+    def classify_document(self, document: AnalyzedDocument,
+                          core_sentiment: str = None) -> Tuple[str, float, Dict[str, float]]:
+        """
+        Klasifikasi emosi dari dokumen yang sudah dianalisis
+        
+        Memakai ``clean_text`` dokumen, sama seperti ``process_dataframe``
+        dengan kolom default ``clean_text``.
+        """
+        return self.classify_emotion(document.clean_text, core_sentiment)
+    
+    def classify_batch(self, texts: pd.Series,
+                       core_sentiments: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Klasifikasi emosi untuk satu kolom teks sekaligus
+        
+        Setiap teks unik diskor sekali oleh engine, lalu label dan confidence
+        dihitung per kolom dengan NumPy mengikuti aturan ``classify_emotion``.
+        
+        Returns:
+            DataFrame (index sama dengan ``texts``): football_emotion,
+            emotion_confidence, dan satu kolom numerik emotion_score_<emosi>
+        """
+        emotions = self.engine.emotions
+        codes, uniques = pd.factorize(texts)
+        unique_valid = np.array([isinstance(text, str) and bool(text) for text in uniques], dtype=bool)
+        unique_scores = np.array(
+            [self.engine.scores(text) if ok else [0] * len(emotions) for text, ok in zip(uniques, unique_valid)],
+            dtype=np.int64
+        ).reshape(len(uniques), len(emotions))
+        
+        # Teks kosong / NaN (kode -1) -> 'unknown' tanpa skor
+        valid = (codes >= 0) & np.append(unique_valid, False)[codes]
+        scores = np.where(valid[:, None], unique_scores[np.where(valid, codes, 0)] if len(uniques) else 0, 0)
+        
+        max_score = scores.max(axis=1)
+        total_score = scores.sum(axis=1)
+        primary = np.asarray(emotions, dtype=object)[scores.argmax(axis=1)]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidence = np.where(total_score > 0, max_score / np.maximum(total_score, 1), 0.0)
+        confidence = np.select(
+            [max_score == 1, max_score == 2, max_score >= 3],
+            [np.minimum(confidence, 0.5), np.minimum(confidence, 0.6), np.minimum(confidence + 0.2, 1.0)],
+            confidence
+        )
+        
+        # Context adjustment berdasarkan core sentiment
+        if core_sentiments is not None:
+            sentiment = np.asarray(core_sentiments, dtype=object)
+            boost = (
+                ((sentiment == 'negative') & np.isin(primary, ['passionate_disappointment', 'strategic_frustration', 'patriotic_sadness']))
+                | ((sentiment == 'positive') & np.isin(primary, ['respectful_acknowledgment', 'future_hope']))
+            )
+            confidence = np.where(boost, np.minimum(confidence + 0.1, 1.0), confidence)
+        
+        no_match = max_score == 0
+        labels = np.where(no_match, 'neutral_observation', primary)
+        confidence = np.where(no_match, 0.3, confidence)
+        labels = np.where(valid, labels, 'unknown')
+        confidence = np.where(valid, confidence, 0.0)
+        
+        result = pd.DataFrame(
+            {'football_emotion': labels.astype(object), 'emotion_confidence': confidence},
+            index=texts.index
+        )
+        for i, emotion in enumerate(emotions):
+            result[f'emotion_score_{emotion}'] = scores[:, i]
+        return result
+    
     def process_dataframe(self, df: pd.DataFrame, text_column: str = 'clean_text', 
                          sentiment_column: str = 'core_sentiment') -> pd.DataFrame:
         """
@@ -249,27 +438,16 @@ class FootballEmotionClassifier:
             sentiment_column: Nama kolom yang berisi core sentiment
             
         Returns:
-            DataFrame dengan kolom baru: football_emotion, emotion_confidence, emotion_scores
+            DataFrame dengan kolom baru: football_emotion, emotion_confidence,
+            dan skor numerik emotion_score_<emosi> untuk setiap emosi
         """
         logger.info(f"Processing {len(df)} comments for emotion classification...")
         
-        results = []
-        for idx, row in df.iterrows():
-            text = row[text_column] if text_column in row else ''
-            sentiment = row[sentiment_column] if sentiment_column in row else None
-            
-            emotion, confidence, scores = self.classify_emotion(text, sentiment)
-            results.append({
-                'football_emotion': emotion,
-                'emotion_confidence': confidence,
-                'emotion_scores': str(scores)  # Store as string for CSV compatibility
-            })
-            
-            if (idx + 1) % 1000 == 0:
-                logger.info(f"Processed {idx + 1}/{len(df)} comments...")
+        texts = df[text_column] if text_column in df.columns else pd.Series('', index=df.index)
+        sentiments = df[sentiment_column] if sentiment_column in df.columns else None
+        result_df = self.classify_batch(texts, sentiments)
         
         # Tambahkan hasil ke dataframe
-        result_df = pd.DataFrame(results)
         df_output = pd.concat([df, result_df], axis=1)
         
         logger.info("Emotion classification completed!")
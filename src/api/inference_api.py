@@ -3,7 +3,7 @@ FastAPI Inference Endpoint for Sentiment Analysis
 """
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import pickle
 import logging
 from pathlib import Path
@@ -58,6 +58,19 @@ def load_model(model_path: str = "data/models/svm_model.pkl",
         _logger.error(f"Error loading model: {e}")
         raise
 
+def _predict(model, label_encoder, features) -> Tuple[List[str], List[float]]:
+    """Labels and confidences; calibrated linear models need a single dot product"""
+    if hasattr(model, 'predict_with_confidence'):
+        predictions, confidences = model.predict_with_confidence(features)
+        confidences = [float(c) for c in confidences]
+    else:
+        predictions = model.predict(features)
+        probabilities = model.predict_proba(features)
+        confidences = [float(max(row)) for row in probabilities]
+    # Models are trained on LabelEncoder codes
+    labels = label_encoder.inverse_transform(predictions)
+    return [str(label) for label in labels], confidences
+
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup"""
@@ -85,9 +98,9 @@ async def predict(input_data: TextInput):
         features = feature_extractor.transform([input_data.text])
         
         # Prediction
-        prediction = model.predict(features)[0]
-        probabilities = model.predict_proba(features)[0]
-        confidence = float(max(probabilities))
+        predictions, confidences = _predict(model, label_encoder, features)
+        prediction = predictions[0]
+        confidence = confidences[0]
         
         return SentimentResponse(
             text=input_data.text,
@@ -107,13 +120,14 @@ async def predict_batch(input_data: BatchTextInput):
         label_encoder = cache['label_encoder']
         
         results = []
+        if not input_data.texts:
+            return BatchSentimentResponse(results=results)
+        
+        # One vectorization and prediction call for the whole batch
+        features = feature_extractor.transform(input_data.texts)
+        predictions, confidences = _predict(model, label_encoder, features)
         
-        for text in input_data.texts:
-            features = feature_extractor.transform([text])
-            prediction = model.predict(features)[0]
-            probabilities = model.predict_proba(features)[0]
-            confidence = float(max(probabilities))
-            
+        for text, prediction, confidence in zip(input_data.texts, predictions, confidences):
             results.append(SentimentResponse(
                 text=text,
                 sentiment=prediction,
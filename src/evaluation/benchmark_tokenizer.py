@@ -0,0 +1,97 @@
+"""Benchmark the fast tokenizer mode against the NLTK path."""
+import argparse
+import json
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.text_cleaner import TextCleaner
+from src.preprocessing.tokenizer import IndonesianTokenizer
+
+
+def time_tokenizer(tokenizer, texts, repeats=3):
+    """Best-of-N wall time for tokenizing the whole corpus."""
+    timings = []
+    tokens = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tokens = tokenizer.tokenize_batch(texts)
+        timings.append(time.perf_counter() - start)
+    return min(timings), tokens
+
+
+def token_agreement(reference, candidate):
+    """Share of texts and of tokens on which both tokenizers agree."""
+    same_texts = 0
+    matched_tokens = 0
+    total_tokens = 0
+    for ref_tokens, cand_tokens in zip(reference, candidate):
+        if ref_tokens == cand_tokens:
+            same_texts += 1
+        matched_tokens += sum(
+            min(ref_tokens.count(tok), cand_tokens.count(tok)) for tok in set(ref_tokens)
+        )
+        total_tokens += max(len(ref_tokens), len(cand_tokens))
+    return {
+        'text_agreement': same_texts / len(reference) if reference else 1.0,
+        'token_agreement': matched_tokens / total_tokens if total_tokens else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tokenizer modes")
+    parser.add_argument('--input', default='data/raw/full_run/comments.csv')
+    parser.add_argument('--output', default='data/models/tokenizer_benchmark.json')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⚡ TOKENIZER BENCHMARK")
+    print("=" * 80)
+
+    df = pd.read_csv(args.input)
+    cleaner = TextCleaner()
+    cleaner.logger.setLevel(logging.ERROR)
+    clean_texts, _ = cleaner.clean_column(df['text'], indonesian=True)
+    texts = clean_texts[clean_texts != ""].tolist()
+    print(f"\nDataset: {len(texts):,} cleaned comments")
+
+    fast_time, fast_tokens = time_tokenizer(IndonesianTokenizer(mode="fast"), texts, args.repeats)
+    try:
+        nltk_time, nltk_tokens = time_tokenizer(IndonesianTokenizer(mode="nltk"), texts, args.repeats)
+    except LookupError as e:
+        print(f"\n⚠️  NLTK mode unavailable ({e}); reporting fast mode only")
+        nltk_time, nltk_tokens = None, None
+
+    n_tokens = int(np.sum([len(tokens) for tokens in fast_tokens]))
+    results = {
+        'texts': len(texts),
+        'tokens': n_tokens,
+        'fast': {
+            'seconds': fast_time,
+            'texts_per_sec': len(texts) / fast_time if fast_time else None,
+        },
+    }
+    print(f"\nFast mode: {fast_time:.3f}s ({len(texts) / fast_time:,.0f} texts/sec)")
+
+    if nltk_tokens is not None:
+        results['nltk'] = {
+            'seconds': nltk_time,
+            'texts_per_sec': len(texts) / nltk_time if nltk_time else None,
+        }
+        results['speedup'] = nltk_time / fast_time if fast_time else None
+        results.update(token_agreement(nltk_tokens, fast_tokens))
+        print(f"NLTK mode: {nltk_time:.3f}s ({len(texts) / nltk_time:,.0f} texts/sec)")
+        print(f"Speedup:   {results['speedup']:.1f}x")
+        print(f"Agreement: {results['text_agreement']:.2%} of texts, "
+              f"{results['token_agreement']:.2%} of tokens")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Resumable Experiment Runner - (config, fold) jobs over a process pool.
+
+A declarative experiment grid is expanded into configs, each config is
+split into one job per fold, and the jobs run in a process pool. Every
+finished fold is written to a ResultStore (SQLite) right away, so a crash
+only loses the jobs in flight and a rerun skips the completed ones.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MaxAbsScaler
+from sklearn.svm import LinearSVC
+
+from src.modeling.feature_cache import FeatureMatrixCache, dataset_hash
+
+VECTORIZERS = {
+    'count': CountVectorizer,
+    'tfidf': TfidfVectorizer,
+}
+
+
+def expand_grid(families: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a declarative grid into a list of experiment configs
+
+    Each family has a ``base`` (``vectorizer``, ``vectorizer_params``,
+    ``C``) and either:
+    - ``variants``: list of dicts with a ``name`` and overrides
+      (``vectorizer_params`` are merged into the base, other keys replace it)
+    - ``sweep``: ``{'param': name, 'values': [...]}``, where ``param`` is
+      ``C`` or a vectorizer parameter
+
+    Args:
+        families: Experiment family definitions
+
+    Returns:
+        List of configs with ``id``, ``family``, ``name``, ``vectorizer``,
+        ``vectorizer_params`` and ``C``
+    """
+    configs = []
+    for family in families:
+        base = family['base']
+        if 'sweep' in family:
+            param = family['sweep']['param']
+            variants = []
+            for value in family['sweep']['values']:
+                if param == 'C':
+                    variants.append({'name': f"C = {value}", 'C': value})
+                else:
+                    variants.append({'name': f"{param} = {value}", 'vectorizer_params': {param: value}})
+        else:
+            variants = family['variants']
+
+        for variant in variants:
+            config = {
+                'family': family['family'],
+                'name': variant['name'],
+                'vectorizer': variant.get('vectorizer', base.get('vectorizer', 'tfidf')),
+                'vectorizer_params': {**base.get('vectorizer_params', {}),
+                                      **variant.get('vectorizer_params', {})},
+                'C': variant.get('C', base.get('C', 1.0)),
+            }
+            config['id'] = experiment_id(config)
+            configs.append(config)
+    return configs
+
+
+def experiment_id(config: Dict[str, Any]) -> str:
+    """Config id: hash of the parameters that affect the score (not the name or family)"""
+    payload = json.dumps(
+        [config['vectorizer'], config['vectorizer_params'], config['C']],
+        sort_keys=True, default=repr
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def build_vectorizer(config: Dict[str, Any]):
+    params = dict(config['vectorizer_params'])
+    if 'ngram_range' in params:
+        # JSON round trips turn tuples into lists
+        params['ngram_range'] = tuple(params['ngram_range'])
+    return VECTORIZERS[config['vectorizer']](**params)
+
+
+def build_classifier(config: Dict[str, Any]) -> Pipeline:
+    return Pipeline([
+        ('scaler', MaxAbsScaler()),
+        ('svm', LinearSVC(C=config['C'], max_iter=5000, random_state=42, dual=False))
+    ])
+
+
+class ResultStore:
+    """Scores per (dataset, experiment, fold) in SQLite"""
+
+    def __init__(self, path: str = 'data/models/ablation_results.sqlite'):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict:
+        # Connections are per process
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pid=None)
+        return state
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "dataset TEXT NOT NULL, experiment TEXT NOT NULL, fold INTEGER NOT NULL, "
+            "family TEXT NOT NULL, name TEXT NOT NULL, config TEXT NOT NULL, "
+            "score REAL NOT NULL, seconds REAL NOT NULL, finished_at REAL NOT NULL, "
+            "PRIMARY KEY (dataset, experiment, fold))"
+        )
+        conn.commit()
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def completed(self, dataset: str) -> set:
+        rows = self._connect().execute(
+            "SELECT experiment, fold FROM results WHERE dataset = ?", (dataset,)
+        ).fetchall()
+        return {(experiment, fold) for experiment, fold in rows}
+
+    def record(self, dataset: str, config: Dict[str, Any], fold: int, score: float, seconds: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (dataset, config['id'], fold, config['family'], config['name'],
+             json.dumps(config, sort_keys=True, default=repr), float(score), float(seconds), time.time())
+        )
+        conn.commit()
+
+    def scores(self, dataset: str, experiment: str) -> List[float]:
+        rows = self._connect().execute(
+            "SELECT score FROM results WHERE dataset = ? AND experiment = ? ORDER BY fold",
+            (dataset, experiment)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+# State per worker process, set once by _init_worker
+_worker_texts: Optional[List[str]] = None
+_worker_labels: Optional[np.ndarray] = None
+_worker_splits: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+_worker_dataset: Optional[str] = None
+_worker_cache: Optional[FeatureMatrixCache] = None
+
+
+def _init_worker(texts: List[str], labels: np.ndarray, splits: List[Tuple[np.ndarray, np.ndarray]],
+                 dataset: str, cache_dir: Optional[str]) -> None:
+    global _worker_texts, _worker_labels, _worker_splits, _worker_dataset, _worker_cache
+    _worker_texts = texts
+    _worker_labels = labels
+    _worker_splits = splits
+    _worker_dataset = dataset
+    _worker_cache = FeatureMatrixCache(cache_dir, persist=cache_dir is not None)
+
+
+def _run_job(config: Dict[str, Any], fold: int) -> Tuple[str, int, float, float]:
+    """Train and score one (config, fold) in a worker"""
+    start = time.perf_counter()
+    train_index, test_index = _worker_splits[fold]
+    X_train, X_test = _worker_cache.fold_matrices(
+        build_vectorizer(config), _worker_texts, train_index, test_index, _worker_dataset
+    )
+    classifier = build_classifier(config).fit(X_train, _worker_labels[train_index])
+    score = accuracy_score(_worker_labels[test_index], classifier.predict(X_test))
+    return config['id'], fold, float(score), time.perf_counter() - start
+
+
+class ExperimentRunner:
+    """
+    Run an experiment grid as resumable (config, fold) jobs
+
+    Fold splits are computed once in the parent process (StratifiedKFold
+    with a fixed seed) and sent to the workers, so every job and every
+    rerun uses the same splits. Feature matrices come from the on-disk
+    FeatureMatrixCache, which all workers share.
+    """
+
+    def __init__(self, store: ResultStore, n_splits: int = 5, random_state: int = 42,
+                 workers: Optional[int] = None, cache_dir: Optional[str] = 'data/cache/features'):
+        """
+        Args:
+            store (ResultStore): Result store
+            n_splits (int): Number of folds
+            random_state (int): StratifiedKFold seed
+            workers (int, optional): Worker processes (default: CPU count; 1 = no pool)
+            cache_dir (str, optional): FeatureMatrixCache directory (None = memory only)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+
+    def run(self, configs: Sequence[Dict[str, Any]], X: Sequence[str], y: Sequence[Any],
+            progress: Optional[Callable[[Dict[str, Any], int, float], None]] = None) -> Dict[str, Any]:
+        """
+        Run every job that is not in the store yet
+
+        A failing job is logged and listed in the summary; the other jobs
+        still run and are recorded, and a rerun retries only the failed ones.
+
+        Args:
+            configs: Configs from ``expand_grid``
+            X: Texts
+            y: Labels
+            progress: Callback ``(config, fold, score)`` after each finished job
+
+        Returns:
+            Dict with ``dataset``, ``jobs_total``, ``jobs_skipped``, ``jobs_run``
+            and ``jobs_failed`` (list of ``{'id', 'name', 'fold', 'error'}``)
+        """
+        texts = [str(text) for text in X]
+        labels = np.asarray(y)
+        dataset = dataset_hash(texts, labels) + f":{self.n_splits}:{self.random_state}"
+        splits = list(StratifiedKFold(
+            n_splits=self.n_splits, shuffle=True, random_state=self.random_state
+        ).split(texts, labels))
+
+        by_id = {config['id']: config for config in configs}
+        done = self.store.completed(dataset)
+        jobs = [
+            (config_id, fold) for config_id in by_id for fold in range(self.n_splits)
+            if (config_id, fold) not in done
+        ]
+        summary = {
+            'dataset': dataset,
+            'jobs_total': len(by_id) * self.n_splits,
+            'jobs_skipped': len(by_id) * self.n_splits - len(jobs),
+            'jobs_run': 0,
+            'jobs_failed': [],
+        }
+        if not jobs:
+            return summary
+
+        data_hash = dataset_hash(texts, labels)
+        init_args = (texts, labels, splits, data_hash, self.cache_dir)
+        if self.cache_dir is not None:
+            # Tokenize each analyzer setting once up front instead of in every worker
+            cache = FeatureMatrixCache(self.cache_dir)
+            for config_id in dict.fromkeys(config_id for config_id, _ in jobs):
+                cache.analyzed(build_vectorizer(by_id[config_id]), texts, data_hash)
+
+        def finish(config_id: str, fold: int, score: float, seconds: float) -> None:
+            self.store.record(dataset, by_id[config_id], fold, score, seconds)
+            summary['jobs_run'] += 1
+            if progress is not None:
+                progress(by_id[config_id], fold, score)
+
+        def fail(config_id: str, fold: int, error: Exception) -> None:
+            config = by_id[config_id]
+            self.logger.warning(f"Experiment {config['name']!r} fold {fold} failed: {error!r}")
+            summary['jobs_failed'].append(
+                {'id': config_id, 'name': config['name'], 'fold': fold, 'error': repr(error)}
+            )
+
+        if self.workers <= 1:
+            _init_worker(*init_args)
+            for config_id, fold in jobs:
+                try:
+                    result = _run_job(by_id[config_id], fold)
+                except Exception as e:
+                    fail(config_id, fold, e)
+                    continue
+                finish(*result)
+            return summary
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            futures = {
+                executor.submit(_run_job, by_id[config_id], fold): (config_id, fold)
+                for config_id, fold in jobs
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail(*futures[future], e)
+                    continue
+                finish(*result)
+        return summary
+
+    def results(self, configs: Sequence[Dict[str, Any]], dataset: str) -> List[Dict[str, Any]]:
+        """Mean/std per config from the store (only configs with every fold finished)"""
+        results = []
+        for config in configs:
+            scores = self.store.scores(dataset, config['id'])
+            if len(scores) < self.n_splits:
+                continue
+            results.append({
+                **config,
+                'scores': scores,
+                'mean_accuracy': float(np.mean(scores)),
+                'std_accuracy': float(np.std(scores)),
+            })
+        return results
@@ -0,0 +1,138 @@
+"""
+Benchmark: Fast Linear Model vs SVC
+
+Compares accuracy, calibration and serving latency of the calibrated
+liblinear model against the SVC(probability=True) artifact on the same
+stratified test split the training pipeline uses.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, log_loss
+from sklearn.model_selection import train_test_split
+
+from src.modeling.features import FeatureExtractor
+from src.modeling.svm_model import SVMSentimentModel
+from src.pipeline.train_model import load_data
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fast linear model against the SVC artifact"
+    )
+    parser.add_argument("--input", type=str, default="data/processed/comments_clean.csv",
+                        help="Path to preprocessed comments CSV")
+    parser.add_argument("--text-column", type=str, default="normalized_text",
+                        help="Column containing processed text")
+    parser.add_argument("--label-column", type=str, default="sentiment_label",
+                        help="Column containing sentiment labels")
+    parser.add_argument("--test-size", type=float, default=0.2,
+                        help="Proportion of data for testing (same split as the pipeline)")
+    parser.add_argument("--model-dir", type=str, default="data/models",
+                        help="Directory with svm_model.pkl, label_encoder.pkl, feature_extractor.pkl")
+    parser.add_argument("--calibration", choices=["sigmoid", "isotonic"], default="sigmoid",
+                        help="Calibration map of the fast linear model")
+    parser.add_argument("--latency-samples", type=int, default=500,
+                        help="Single-request predictions timed per model")
+    parser.add_argument("--output", type=str, default="data/models/fast_linear_benchmark.json",
+                        help="Where to write the benchmark results")
+    return parser.parse_args()
+
+
+def time_requests(predict: Callable, features, n_samples: int) -> Dict[str, float]:
+    """Per-request latency (ms) of ``predict`` on single rows"""
+    timings: List[float] = []
+    for row in range(min(n_samples, features.shape[0])):
+        single = features[row]
+        start = time.perf_counter()
+        predict(single)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": float(np.mean(timings)),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+    }
+
+
+def evaluate(model: SVMSentimentModel, X_test, y_test, n_samples: int) -> Dict[str, object]:
+    """Quality metrics plus single-request and batch latency of predict + confidence"""
+    start = time.perf_counter()
+    y_pred, _ = model.predict_with_confidence(X_test)
+    batch_seconds = time.perf_counter() - start
+    proba = model.predict_proba(X_test)
+    return {
+        "accuracy": float(accuracy_score(y_test, y_pred)),
+        "f1_weighted": float(f1_score(y_test, y_pred, average="weighted")),
+        "log_loss": float(log_loss(model.label_encoder.transform(y_test), proba,
+                                   labels=np.arange(len(model.label_encoder.classes_)))),
+        "request_latency": time_requests(model.predict_with_confidence, X_test, n_samples),
+        "batch_rows_per_second": float(X_test.shape[0] / batch_seconds) if batch_seconds else None,
+    }
+
+
+def main():
+    args = parse_args()
+    model_dir = Path(args.model_dir)
+
+    print("=" * 60)
+    print("FAST LINEAR vs SVC BENCHMARK")
+    print("=" * 60)
+
+    X, y = load_data(args.input, args.text_column, args.label_column)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=args.test_size, random_state=42, stratify=y
+    )
+    print(f"Train: {len(X_train)} samples, test: {len(X_test)} samples")
+
+    feature_path = model_dir / "feature_extractor.pkl"
+    svc_path, encoder_path = model_dir / "svm_model.pkl", model_dir / "label_encoder.pkl"
+    if feature_path.exists():
+        feature_extractor = FeatureExtractor.load(str(feature_path))
+    else:
+        feature_extractor = FeatureExtractor().fit(X_train)
+    X_train_features = feature_extractor.transform(X_train)
+    X_test_features = feature_extractor.transform(X_test)
+
+    results = {"input_file": args.input, "test_samples": len(X_test)}
+
+    if svc_path.exists() and encoder_path.exists():
+        svc = SVMSentimentModel.load(str(svc_path), str(encoder_path))
+        results["svc_source"] = str(svc_path)
+    else:
+        svc = SVMSentimentModel()
+        start = time.perf_counter()
+        svc.fit(X_train_features, y_train)
+        results["svc_train_seconds"] = time.perf_counter() - start
+        results["svc_source"] = "trained"
+
+    fast = SVMSentimentModel(fast_linear=True, calibration=args.calibration)
+    start = time.perf_counter()
+    fast.fit(X_train_features, y_train)
+    results["fast_linear_train_seconds"] = time.perf_counter() - start
+
+    results["svc"] = evaluate(svc, X_test_features, y_test, args.latency_samples)
+    results["fast_linear"] = evaluate(fast, X_test_features, y_test, args.latency_samples)
+    results["fast_linear"]["calibration"] = args.calibration
+
+    print(f"\n{'Model':<14} {'Accuracy':<10} {'F1':<10} {'LogLoss':<10} {'p50 ms':<10} {'rows/s':<10}")
+    print("-" * 64)
+    for name in ("svc", "fast_linear"):
+        metrics = results[name]
+        print(f"{name:<14} {metrics['accuracy']:<10.4f} {metrics['f1_weighted']:<10.4f} "
+              f"{metrics['log_loss']:<10.4f} {metrics['request_latency']['p50_ms']:<10.3f} "
+              f"{metrics['batch_rows_per_second']:<10.0f}")
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
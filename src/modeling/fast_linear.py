@@ -0,0 +1,181 @@
+"""
+Fast Linear Model Module for Sentiment Analysis
+
+This module implements a liblinear SVM with a separately fitted,
+stored probability calibration, so serving needs a single sparse dot
+product per request for both the label and its confidence.
+"""
+
+from typing import Optional, Tuple, Union
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.svm import LinearSVC
+
+CALIBRATION_METHODS = ('sigmoid', 'isotonic')
+
+
+class FastLinearClassifier(BaseEstimator, ClassifierMixin):
+    """
+    LinearSVC decision function plus a stored calibration map
+
+    Calibration maps are fitted on out-of-fold decision values (``cv``
+    folds of cheap liblinear fits), then the final LinearSVC is fitted on
+    all data; the calibration is not refitted inside probability calls.
+    Each class score is mapped one-vs-rest by a sigmoid ``1 / (1 + exp(a*s + b))``
+    or an isotonic step function (stored as thresholds), and multiclass
+    probabilities are normalized to sum to 1. Labels always come from the
+    raw decision function, as with LinearSVC.
+    """
+
+    def __init__(self,
+                 C: float = 1.0,
+                 class_weight: Optional[Union[str, dict]] = 'balanced',
+                 calibration: str = 'sigmoid',
+                 cv: int = 3,
+                 random_state: int = 42):
+        """
+        Initialize Fast Linear Classifier
+
+        Args:
+            C (float): Regularization parameter
+            class_weight (str or dict): Class weight strategy
+            calibration (str): 'sigmoid' (Platt) or 'isotonic'
+            cv (int): Folds used to produce out-of-fold scores for calibration
+            random_state (int): Random seed
+        """
+        self.C = C
+        self.class_weight = class_weight
+        self.calibration = calibration
+        self.cv = cv
+        self.random_state = random_state
+
+    def _estimator(self) -> LinearSVC:
+        return LinearSVC(C=self.C, class_weight=self.class_weight, random_state=self.random_state)
+
+    def fit(self, X, y) -> 'FastLinearClassifier':
+        """
+        Fit calibration on out-of-fold scores, then the final linear model
+
+        Args:
+            X: Feature matrix (sparse or dense)
+            y: Target labels
+
+        Returns:
+            self
+        """
+        if self.calibration not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration '{self.calibration}', expected one of {CALIBRATION_METHODS}")
+        y = np.asarray(y)
+        self.classes_ = np.unique(y)
+
+        folds = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        oof_scores = cross_val_predict(self._estimator(), X, y, cv=folds, method='decision_function')
+        self._fit_calibrators(oof_scores, y)
+
+        final = self._estimator().fit(X, y)
+        self.coef_ = final.coef_
+        self.intercept_ = final.intercept_
+        return self
+
+    @classmethod
+    def from_linear_model(cls, model, scores: np.ndarray, y: np.ndarray,
+                          calibration: str = 'sigmoid') -> 'FastLinearClassifier':
+        """
+        Wrap an already trained linear model (e.g. a hinge SGDClassifier)
+
+        Args:
+            model: Fitted linear classifier with ``coef_``, ``intercept_`` and ``classes_``
+            scores (np.ndarray): Held-out decision values of that model
+            y (np.ndarray): Labels of the scored rows
+            calibration (str): 'sigmoid' (Platt) or 'isotonic'
+
+        Returns:
+            FastLinearClassifier with the model's weights and a calibration map
+        """
+        if calibration not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration '{calibration}', expected one of {CALIBRATION_METHODS}")
+        instance = cls(calibration=calibration)
+        instance.classes_ = np.asarray(model.classes_)
+        instance.coef_ = model.coef_.copy()
+        instance.intercept_ = model.intercept_.copy()
+        instance._fit_calibrators(scores, np.asarray(y))
+        return instance
+
+    def _fit_calibrators(self, scores: np.ndarray, y: np.ndarray) -> None:
+        scores = self._score_columns(np.asarray(scores))
+        targets = [y == self.classes_[-1]] if len(self.classes_) == 2 else [y == c for c in self.classes_]
+        self.calibrators_ = [
+            self._fit_calibrator(scores[:, column], target)
+            for column, target in enumerate(targets)
+        ]
+
+    def _fit_calibrator(self, scores: np.ndarray, target: np.ndarray) -> Tuple:
+        """(a, b) of the sigmoid, or (thresholds, values) of the isotonic fit"""
+        if self.calibration == 'sigmoid':
+            if target.all() or not target.any():
+                # One-sided sample: a constant, Laplace-smoothed rate
+                rate = (target.sum() + 1.0) / (len(target) + 2.0)
+                return (0.0, float(np.log((1.0 - rate) / rate)))
+            platt = LogisticRegression(C=1e6).fit(scores.reshape(-1, 1), target)
+            return (-float(platt.coef_[0, 0]), -float(platt.intercept_[0]))
+        isotonic = IsotonicRegression(out_of_bounds='clip', y_min=0.0, y_max=1.0).fit(scores, target)
+        return (isotonic.X_thresholds_, isotonic.y_thresholds_)
+
+    @staticmethod
+    def _score_columns(scores: np.ndarray) -> np.ndarray:
+        return scores.reshape(-1, 1) if scores.ndim == 1 else scores
+
+    def decision_function(self, X) -> np.ndarray:
+        """Raw linear scores (one sparse dot product)"""
+        scores = X @ self.coef_.T + self.intercept_
+        scores = np.asarray(scores)
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def _proba_from_scores(self, scores: np.ndarray) -> np.ndarray:
+        scores = self._score_columns(scores)
+        columns = []
+        for column, (first, second) in enumerate(self.calibrators_):
+            if self.calibration == 'sigmoid':
+                columns.append(1.0 / (1.0 + np.exp(first * scores[:, column] + second)))
+            else:
+                columns.append(np.interp(scores[:, column], first, second))
+        proba = np.column_stack(columns)
+        if len(self.classes_) == 2:
+            return np.column_stack([1.0 - proba[:, 0], proba[:, 0]])
+        totals = proba.sum(axis=1, keepdims=True)
+        uniform = np.full_like(proba, 1.0 / len(self.classes_))
+        return np.divide(proba, totals, out=uniform, where=totals > 0)
+
+    def _labels_from_scores(self, scores: np.ndarray) -> np.ndarray:
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+    def predict(self, X) -> np.ndarray:
+        return self._labels_from_scores(self.decision_function(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self._proba_from_scores(self.decision_function(X))
+
+    def predict_with_confidence(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Labels and calibrated probability of each predicted label
+
+        Args:
+            X: Feature matrix
+
+        Returns:
+            Tuple of (labels, confidences) from a single decision_function call
+        """
+        scores = self.decision_function(X)
+        proba = self._proba_from_scores(scores)
+        labels = self._labels_from_scores(scores)
+        predicted = np.searchsorted(self.classes_, labels)
+        return labels, proba[np.arange(len(labels)), predicted]
+
+
+# Export classifier
+__all__ = ['FastLinearClassifier', 'CALIBRATION_METHODS']
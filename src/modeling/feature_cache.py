@@ -0,0 +1,255 @@
+"""
+Feature Matrix Cache for Cross-Validated Experiments
+
+Content-addressed cache of tokenized corpora and per-fold vectorizer
+outputs, so experiments that only change classifier settings (e.g. a C
+sweep) reuse the fold matrices instead of re-tokenizing and re-fitting the
+vectorizer in every fold.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid
+
+# Bump when the cached layout or the key derivation changes
+FEATURE_CACHE_VERSION = 1
+
+# Vectorizer parameters that shape the vocabulary/weights but not the analyzer output
+_VOCABULARY_PARAMS = {
+    'binary', 'dtype', 'max_df', 'max_features', 'min_df', 'norm',
+    'smooth_idf', 'sublinear_tf', 'use_idf', 'vocabulary'
+}
+
+Fold = Tuple[sparse.csr_matrix, sparse.csr_matrix, np.ndarray, np.ndarray]
+
+
+def _digest(*parts: Any) -> str:
+    payload = json.dumps([FEATURE_CACHE_VERSION, *parts], sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def dataset_hash(texts: Sequence[str], labels: Optional[Sequence[Any]] = None) -> str:
+    """Hash of a corpus (and its labels): the content address of everything derived from it"""
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(str(text).encode('utf-8'))
+        digest.update(b'\0')
+    if labels is not None:
+        digest.update(b'\1')
+        for label in labels:
+            digest.update(str(label).encode('utf-8'))
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def vectorizer_key(vectorizer) -> Dict[str, Any]:
+    return {'class': type(vectorizer).__name__, 'params': vectorizer.get_params()}
+
+
+def analyzer_key(vectorizer) -> Dict[str, Any]:
+    params = {
+        name: value for name, value in vectorizer.get_params().items()
+        if name not in _VOCABULARY_PARAMS
+    }
+    return {'params': params}
+
+
+def _identity(tokens: List[str]) -> List[str]:
+    return tokens
+
+
+def _pretokenized(vectorizer):
+    """Clone of ``vectorizer`` that consumes analyzer output instead of raw text"""
+    return clone(vectorizer).set_params(
+        analyzer=_identity, token_pattern=None, ngram_range=(1, 1),
+        preprocessor=None, tokenizer=None, stop_words=None
+    )
+
+
+class FeatureMatrixCache:
+    """
+    Tokenized corpora and per-fold ``(X_train, X_test)`` matrices, in memory and on disk
+
+    Keys are content addresses: tokenized corpora by dataset hash and
+    analyzer settings (lowercase, token pattern, n-gram range, ...); fold
+    matrices by dataset hash, the fold's train indices (i.e. splitter and
+    seed) and all vectorizer parameters. A vectorizer is fitted on the
+    cached analyzer output of the train rows only, so the matrices equal a
+    ``Pipeline([vectorizer, ...])`` inside ``cross_val_score``.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = 'data/cache/features', persist: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir and persist else None
+        self._memory: Dict[str, Any] = {}
+        self.tokenizations = 0
+        self.vectorizations = 0
+        self.hits = 0
+
+    def _path(self, kind: str, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / kind / f"{key}.pkl"
+
+    def _load(self, kind: str, key: str) -> Any:
+        if key in self._memory:
+            self.hits += 1
+            return self._memory[key]
+        path = self._path(kind, key)
+        if path is not None and path.exists():
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except Exception as e:  # truncated or from an incompatible version
+                self.logger.warning(f"Ignoring feature cache entry {path}: {e}")
+                return None
+            self._memory[key] = value
+            self.hits += 1
+            return value
+        return None
+
+    def _store(self, kind: str, key: str, value: Any) -> None:
+        self._memory[key] = value
+        path = self._path(kind, key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write feature cache entry {path}: {e}")
+
+    def analyzed(self, vectorizer, texts: Sequence[str], data_hash: Optional[str] = None) -> List[List[str]]:
+        """Analyzer output (token / n-gram lists) of every text"""
+        data_hash = data_hash or dataset_hash(texts)
+        key = _digest('tokens', data_hash, analyzer_key(vectorizer))
+        tokens = self._load('tokens', key)
+        if tokens is None:
+            analyze = vectorizer.build_analyzer()
+            tokens = [analyze(text) for text in texts]
+            self.tokenizations += 1
+            self._store('tokens', key, tokens)
+        return tokens
+
+    def fold_matrices(self, vectorizer, texts: Sequence[str], train_index: np.ndarray,
+                      test_index: np.ndarray, data_hash: str) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        """``(X_train, X_test)`` of one fold; ``data_hash`` is ``dataset_hash(texts, labels)``"""
+        key = _digest('fold', data_hash, hashlib.sha1(np.asarray(train_index).tobytes()).hexdigest(),
+                      len(texts), vectorizer_key(vectorizer))
+        matrices = self._load('folds', key)
+        if matrices is None:
+            tokens = self.analyzed(vectorizer, texts, data_hash)
+            fold_vectorizer = _pretokenized(vectorizer)
+            X_train = fold_vectorizer.fit_transform([tokens[i] for i in train_index]).tocsr()
+            X_test = fold_vectorizer.transform([tokens[i] for i in test_index]).tocsr()
+            matrices = (X_train, X_test)
+            self.vectorizations += 1
+            self._store('folds', key, matrices)
+        return matrices
+
+    def folds(self, vectorizer, X: Sequence[str], y: Sequence[Any], cv) -> List[Fold]:
+        """``(X_train, X_test, y_train, y_test)`` per fold of ``cv.split(X, y)``"""
+        texts = [str(text) for text in X]
+        labels = np.asarray(y)
+        data_hash = dataset_hash(texts, labels)
+        folds: List[Fold] = []
+        for train_index, test_index in cv.split(texts, labels):
+            X_train, X_test = self.fold_matrices(vectorizer, texts, train_index, test_index, data_hash)
+            folds.append((X_train, X_test, labels[train_index], labels[test_index]))
+        return folds
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'tokenizations': self.tokenizations,
+            'vectorizations': self.vectorizations,
+            'hits': self.hits,
+            'memory_entries': len(self._memory),
+        }
+
+
+def _fit_and_score(estimator, scorer, fold: Fold) -> float:
+    X_train, X_test, y_train, y_test = fold
+    estimator.fit(X_train, y_train)
+    return scorer(estimator, X_test, y_test)
+
+
+def cross_val_score_cached(estimator, vectorizer, X: Sequence[str], y: Sequence[Any], cv,
+                           cache: Optional[FeatureMatrixCache] = None,
+                           scoring: str = 'accuracy', n_jobs: Optional[int] = None) -> np.ndarray:
+    """
+    ``cross_val_score(Pipeline([('vectorizer', vectorizer), *estimator]), X, y)`` on cached folds
+
+    Args:
+        estimator: Classifier (or Pipeline of the steps after the vectorizer)
+        vectorizer: Unfitted CountVectorizer / TfidfVectorizer
+        X: Raw texts
+        y: Labels
+        cv: Splitter with ``split(X, y)`` (e.g. StratifiedKFold with a fixed seed)
+        cache (FeatureMatrixCache, optional): Shared cache (default: memory only)
+        scoring (str): sklearn scorer name
+        n_jobs (int, optional): Folds fitted in parallel
+
+    Returns:
+        Array of per-fold scores
+    """
+    cache = cache or FeatureMatrixCache(persist=False)
+    scorer = get_scorer(scoring)
+    folds = cache.folds(vectorizer, X, y, cv)
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score)(clone(estimator), scorer, fold) for fold in folds
+    )
+    return np.asarray(scores)
+
+
+def grid_search_cached(estimator, param_grid: Dict[str, Sequence[Any]], vectorizer,
+                       X: Sequence[str], y: Sequence[Any], cv,
+                       cache: Optional[FeatureMatrixCache] = None,
+                       scoring: str = 'f1_weighted', n_jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Grid search over classifier parameters, vectorizing each fold once
+
+    Returns:
+        Dict with best_params, best_score and per-candidate cv_results
+    """
+    cache = cache or FeatureMatrixCache(persist=False)
+    folds = cache.folds(vectorizer, X, y, cv)
+    scorer = get_scorer(scoring)
+    candidates = list(ParameterGrid(param_grid))
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score)(clone(estimator).set_params(**params), scorer, fold)
+        for params in candidates for fold in folds
+    )
+    scores = np.asarray(scores).reshape(len(candidates), len(folds))
+    mean_scores = scores.mean(axis=1)
+    best = int(np.argmax(mean_scores))
+    return {
+        'best_params': candidates[best],
+        'best_score': float(mean_scores[best]),
+        'cv_results': {
+            'params': candidates,
+            'mean_test_score': mean_scores,
+            'std_test_score': scores.std(axis=1),
+        },
+    }
+
+
+# Export cache API
+__all__ = [
+    'FeatureMatrixCache', 'cross_val_score_cached', 'grid_search_cached',
+    'dataset_hash', 'FEATURE_CACHE_VERSION'
+]
@@ -7,22 +7,43 @@ for the sentiment analysis model.
 
 import pickle
 import logging
-from typing import Tuple, Optional, Any
+import zlib
+from typing import Tuple, Optional, Any, Iterable, Iterator
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import normalize
+
+from src.preprocessing.document import document_texts
+
+FEATURE_MODES = ('tfidf', 'hashing')
+
 
 class FeatureExtractor(BaseEstimator, TransformerMixin):
     """
     TF-IDF Feature Extractor wrapper
+    
+    ``mode='tfidf'`` wraps a fitted ``TfidfVectorizer`` (vocabulary learned
+    in a full pass over the corpus). ``mode='hashing'`` hashes n-grams into
+    ``n_features`` columns instead: no vocabulary, so nothing has to be fit
+    before transforming and chunks can be vectorized independently. With
+    ``use_idf`` the document frequency of every hashed column is
+    accumulated by ``fit``/``partial_fit`` and applied like TfidfVectorizer
+    (sublinear tf, smooth idf, l2 norm). ``max_features``, ``min_df`` and
+    ``max_df`` only apply to the tfidf mode.
     """
     
     def __init__(self, 
                  max_features: int = 5000, 
                  ngram_range: Tuple[int, int] = (1, 2),
                  min_df: int = 2,
-                 max_df: float = 0.95):
+                 max_df: float = 0.95,
+                 text_field: str = 'clean_text',
+                 mode: str = 'tfidf',
+                 n_features: int = 2 ** 18,
+                 use_idf: bool = True):
         """
         Initialize Feature Extractor
         
@@ -31,20 +52,42 @@ class FeatureExtractor(BaseEstimator, TransformerMixin):
             ngram_range (Tuple[int, int]): Range for n-grams
             min_df (int): Minimum document frequency
             max_df (float): Maximum document frequency
+            text_field (str): AnalyzedDocument field used when documents
+                are passed instead of strings
+            mode (str): 'tfidf' (fitted vocabulary) or 'hashing' (stateless)
+            n_features (int): Number of hashed columns in hashing mode
+            use_idf (bool): Weight hashed columns by streaming IDF statistics
         """
+        if mode not in FEATURE_MODES:
+            raise ValueError(f"Unknown feature mode '{mode}', expected one of {FEATURE_MODES}")
         self.logger = self._setup_logger()
         self.max_features = max_features
         self.ngram_range = ngram_range
         self.min_df = min_df
         self.max_df = max_df
+        self.text_field = text_field
+        self.mode = mode
+        self.n_features = n_features
+        self.use_idf = use_idf
         
-        self.vectorizer = TfidfVectorizer(
-            max_features=max_features,
-            ngram_range=ngram_range,
-            min_df=min_df,
-            max_df=max_df,
-            sublinear_tf=True  # Apply sublinear tf scaling
-        )
+        if mode == 'hashing':
+            # Raw counts; tf scaling, idf and normalization are applied in transform
+            self.vectorizer = HashingVectorizer(
+                n_features=n_features,
+                ngram_range=ngram_range,
+                alternate_sign=False,
+                norm=None
+            )
+            self.document_count_ = 0
+            self.document_frequency_ = np.zeros(n_features, dtype=np.int64)
+        else:
+            self.vectorizer = TfidfVectorizer(
+                max_features=max_features,
+                ngram_range=ngram_range,
+                min_df=min_df,
+                max_df=max_df,
+                sublinear_tf=True  # Apply sublinear tf scaling
+            )
         
     def _setup_logger(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -59,34 +102,131 @@ class FeatureExtractor(BaseEstimator, TransformerMixin):
         logger.setLevel(logging.INFO)
         return logger
 
+    def texts(self, X: Any) -> Any:
+        """Pull the configured text field out of AnalyzedDocument inputs"""
+        return document_texts(X, getattr(self, 'text_field', 'clean_text'))
+
+    @property
+    def hashing(self) -> bool:
+        # Extractors pickled before the hashing mode existed are tfidf
+        return getattr(self, 'mode', 'tfidf') == 'hashing'
+
+    def __getstate__(self) -> dict:
+        state = dict(super().__getstate__())
+        if self.hashing:
+            # The dense counts are mostly zeros and small numbers
+            state['document_frequency_'] = zlib.compress(self.document_frequency_.astype('<u4').tobytes())
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        if state.get('mode') == 'hashing':
+            counts = np.frombuffer(zlib.decompress(state['document_frequency_']), dtype='<u4')
+            state['document_frequency_'] = counts.astype(np.int64)
+        super().__setstate__(state)
+
+    def partial_fit(self, X: pd.Series, y: Optional[pd.Series] = None) -> 'FeatureExtractor':
+        """
+        Add a chunk of documents to the IDF statistics (hashing mode only)
+        
+        Args:
+            X (pd.Series): Text data or AnalyzedDocument objects
+            y (pd.Series, optional): Target labels
+            
+        Returns:
+            self
+        """
+        if not self.hashing:
+            raise ValueError("partial_fit needs mode='hashing'; a TF-IDF vocabulary is fit in one pass")
+        if self.use_idf:
+            counts = self.vectorizer.transform(self.texts(X))
+            counts.sum_duplicates()
+            self.document_frequency_ += np.bincount(counts.indices, minlength=self.n_features)
+            self.document_count_ += counts.shape[0]
+        return self
+    
     def fit(self, X: pd.Series, y: Optional[pd.Series] = None) -> 'FeatureExtractor':
         """
         Fit the vectorizer to the data
         
         Args:
-            X (pd.Series): Text data
+            X (pd.Series): Text data or AnalyzedDocument objects
             y (pd.Series, optional): Target labels
             
         Returns:
             self
         """
         self.logger.info(f"Fitting vectorizer on {len(X)} documents...")
-        self.vectorizer.fit(X)
+        if self.hashing:
+            self.document_count_ = 0
+            self.document_frequency_ = np.zeros(self.n_features, dtype=np.int64)
+            self.partial_fit(X)
+            self.logger.info(f"Hashed columns in use: {np.count_nonzero(self.document_frequency_)} / {self.n_features}")
+            return self
+        self.vectorizer.fit(self.texts(X))
         self.logger.info(f"Vocabulary size: {len(self.vectorizer.vocabulary_)}")
         return self
 
+    def fit_stream(self, chunks: Iterable[pd.Series]) -> 'FeatureExtractor':
+        """
+        Accumulate IDF statistics over an iterable of chunks (hashing mode only)
+        
+        Args:
+            chunks (Iterable[pd.Series]): Chunks of texts, e.g. from
+                ``pd.read_csv(..., chunksize=n)[column]``
+            
+        Returns:
+            self
+        """
+        self.document_count_ = 0
+        self.document_frequency_ = np.zeros(self.n_features, dtype=np.int64)
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        self.logger.info(f"IDF statistics over {self.document_count_} documents")
+        return self
+
+    def idf(self) -> Optional[np.ndarray]:
+        """Smoothed IDF weights of the hashed columns (None without IDF statistics)"""
+        if not self.use_idf or not self.document_count_:
+            return None
+        return np.log((1 + self.document_count_) / (1 + self.document_frequency_)) + 1.0
+
+    def _hashed_tfidf(self, texts: Any) -> sparse.csr_matrix:
+        """Hashed counts with TfidfVectorizer's sublinear tf, smooth idf and l2 norm"""
+        X = self.vectorizer.transform(texts)
+        X.sum_duplicates()
+        X.data = np.log(X.data) + 1.0
+        idf = self.idf()
+        if idf is not None:
+            X.data *= idf[X.indices]
+        return normalize(X, norm='l2', copy=False)
+
     def transform(self, X: pd.Series) -> Any:
         """
         Transform data to TF-IDF matrix
         
         Args:
-            X (pd.Series): Text data
+            X (pd.Series): Text data or AnalyzedDocument objects
             
         Returns:
             Sparse matrix of TF-IDF features
         """
         self.logger.info(f"Transforming {len(X)} documents...")
-        return self.vectorizer.transform(X)
+        if self.hashing:
+            return self._hashed_tfidf(self.texts(X))
+        return self.vectorizer.transform(self.texts(X))
+
+    def transform_stream(self, chunks: Iterable[pd.Series]) -> Iterator[Any]:
+        """
+        Transform chunks one at a time, yielding one feature matrix per chunk
+        
+        Args:
+            chunks (Iterable[pd.Series]): Chunks of texts or AnalyzedDocument objects
+            
+        Yields:
+            Sparse matrix of TF-IDF features for each chunk
+        """
+        for chunk in chunks:
+            yield self.transform(chunk)
 
     def fit_transform(self, X: pd.Series, y: Optional[pd.Series] = None) -> Any:
         """
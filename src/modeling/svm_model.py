@@ -5,25 +5,54 @@ This module implements the SVM classifier with hyperparameter tuning
 and model persistence capabilities.
 """
 
+import os
 import pickle
 import logging
-from typing import Dict, Any, Optional, Tuple
+import tempfile
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
+from sklearn.base import clone
 from sklearn.svm import SVC
-from sklearn.model_selection import GridSearchCV
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, cross_val_predict
 from sklearn.preprocessing import LabelEncoder
 
+from src.modeling.fast_linear import FastLinearClassifier
+
+# partial_fit losses: linear SVM, logistic regression, smoothed hinge
+INCREMENTAL_LOSSES = ('hinge', 'log_loss', 'modified_huber')
+
+# Most recent held-out decision values kept to calibrate hinge models
+CALIBRATION_ROWS = 20000
+
+
 class SVMSentimentModel:
     """
     Support Vector Machine classifier for sentiment analysis
+    
+    ``incremental=True`` swaps the kernel SVC for a linear
+    ``SGDClassifier`` that learns chunk by chunk through ``partial_fit``
+    (``loss='hinge'`` is a linear SVM; ``'log_loss'`` and
+    ``'modified_huber'`` give ``predict_proba`` directly). Hinge models are
+    served as a ``FastLinearClassifier`` whose calibration map is fitted on
+    decision values of rows the model had not trained on yet (each chunk
+    is scored before its update). ``fast_linear=True``
+    uses ``FastLinearClassifier``: liblinear plus a stored calibration map
+    instead of SVC's internal 5-fold Platt scaling. Saved artifacts have
+    the same layout in all modes.
     """
     
     def __init__(self, 
                  kernel: str = 'linear',
                  C: float = 1.0,
                  class_weight: str = 'balanced',
-                 random_state: int = 42):
+                 random_state: int = 42,
+                 incremental: bool = False,
+                 loss: str = 'log_loss',
+                 alpha: float = 1e-4,
+                 fast_linear: bool = False,
+                 calibration: str = 'sigmoid'):
         """
         Initialize SVM Model
         
@@ -32,22 +61,57 @@ class SVMSentimentModel:
             C (float): Regularization parameter
             class_weight (str): Class weight strategy
             random_state (int): Random seed
+            incremental (bool): Train a linear model with partial_fit
+            loss (str): Incremental loss, one of INCREMENTAL_LOSSES
+            alpha (float): Incremental regularization strength
+            fast_linear (bool): Use the calibrated liblinear model
+            calibration (str): 'sigmoid' or 'isotonic' (fast_linear and
+                incremental hinge models)
         """
         self.logger = self._setup_logger()
         self.kernel = kernel
         self.C = C
         self.class_weight = class_weight
         self.random_state = random_state
+        self.incremental = incremental
+        self.loss = loss
+        self.alpha = alpha
+        self.fast_linear = fast_linear
+        self.calibration = calibration
         
-        self.model = SVC(
-            kernel=kernel,
-            C=C,
-            class_weight=class_weight,
-            random_state=random_state,
-            probability=True  # Enable probability estimates
-        )
+        if incremental and fast_linear:
+            raise ValueError("incremental and fast_linear are exclusive")
+        if fast_linear:
+            self.model = FastLinearClassifier(
+                C=C,
+                class_weight=class_weight,
+                calibration=calibration,
+                random_state=random_state
+            )
+        elif incremental:
+            if loss not in INCREMENTAL_LOSSES:
+                raise ValueError(f"Unknown incremental loss '{loss}', expected one of {INCREMENTAL_LOSSES}")
+            self.model = SGDClassifier(
+                loss=loss,
+                alpha=alpha,
+                random_state=random_state
+            )
+        else:
+            self.model = SVC(
+                kernel=kernel,
+                C=C,
+                class_weight=class_weight,
+                random_state=random_state,
+                probability=True  # Enable probability estimates
+            )
         
         self.label_encoder = LabelEncoder()
+        self.class_counts_ = None
+        self.rows_seen_ = 0
+        self.stream_position_ = 0
+        self.calibration_scores_ = None
+        self.calibration_labels_ = None
+        self._calibrated = None
         self.is_fitted = False
         
     def _setup_logger(self) -> logging.Logger:
@@ -63,6 +127,39 @@ class SVMSentimentModel:
         logger.setLevel(logging.INFO)
         return logger
 
+    @property
+    def needs_calibration(self) -> bool:
+        return self.incremental and self.loss == 'hinge'
+    
+    def _remember_scores(self, scores: np.ndarray, y_encoded: np.ndarray) -> None:
+        """Keep the last CALIBRATION_ROWS held-out decision values for the hinge calibration"""
+        if self.calibration_scores_ is not None:
+            scores = np.concatenate([self.calibration_scores_, scores])
+            y_encoded = np.concatenate([self.calibration_labels_, y_encoded])
+        self.calibration_scores_ = scores[-CALIBRATION_ROWS:]
+        self.calibration_labels_ = y_encoded[-CALIBRATION_ROWS:]
+        self._calibrated = None
+    
+    def _serving_model(self):
+        """The estimator used for prediction and saved as the model artifact"""
+        if not self.needs_calibration:
+            return self.model
+        if self._calibrated is None:
+            self._calibrated = FastLinearClassifier.from_linear_model(
+                self.model, self.calibration_scores_, self.calibration_labels_,
+                calibration=self.calibration
+            )
+        return self._calibrated
+    
+    def _calibrate_out_of_fold(self, X, y_encoded: np.ndarray) -> None:
+        """Calibration scores from a batch fit: out-of-fold decision values"""
+        self.calibration_scores_ = None
+        folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=self.random_state)
+        self._remember_scores(
+            cross_val_predict(clone(self.model), X, y_encoded, cv=folds, method='decision_function'),
+            y_encoded
+        )
+    
     def fit(self, X, y: pd.Series) -> 'SVMSentimentModel':
         """
         Train the SVM model
@@ -80,12 +177,160 @@ class SVMSentimentModel:
         y_encoded = self.label_encoder.fit_transform(y)
         
         # Train model
+        if self.needs_calibration:
+            self._calibrate_out_of_fold(X, y_encoded)
         self.model.fit(X, y_encoded)
         self.is_fitted = True
         
         self.logger.info(f"Training complete. Classes: {self.label_encoder.classes_}")
         return self
 
+    def partial_fit(self, X, y: pd.Series, classes: Optional[Sequence[str]] = None) -> 'SVMSentimentModel':
+        """
+        Update the incremental model with one chunk
+        
+        The first call needs every class label up front (``classes``).
+        ``class_weight='balanced'`` is approximated with sample weights from
+        the class counts seen so far, since partial_fit cannot look ahead.
+        
+        Args:
+            X: Feature matrix of the chunk
+            y (pd.Series): Target labels of the chunk
+            classes (Sequence[str], optional): All labels (first call only)
+            
+        Returns:
+            self
+        """
+        if not self.incremental:
+            raise ValueError("partial_fit needs incremental=True")
+        if self.class_counts_ is None:
+            if classes is None:
+                raise ValueError("The first partial_fit call needs all classes")
+            self.label_encoder.fit(list(classes))
+            self.class_counts_ = np.zeros(len(self.label_encoder.classes_), dtype=np.int64)
+        
+        y_encoded = self.label_encoder.transform(y)
+        self.class_counts_ += np.bincount(y_encoded, minlength=len(self.class_counts_))
+        self.rows_seen_ += len(y_encoded)
+        
+        sample_weight = None
+        if self.class_weight == 'balanced':
+            weights = self.rows_seen_ / (len(self.class_counts_) * np.maximum(self.class_counts_, 1))
+            sample_weight = weights[y_encoded]
+        
+        if self.needs_calibration and self.is_fitted:
+            # Scored before the update, so these rows are still held out
+            self._remember_scores(self.model.decision_function(X), y_encoded)
+        self.model.partial_fit(
+            X, y_encoded,
+            classes=np.arange(len(self.class_counts_)),
+            sample_weight=sample_weight
+        )
+        if self.needs_calibration and not self.is_fitted:
+            # Nothing to score the first chunk with: use its post-update scores
+            self._remember_scores(self.model.decision_function(X), y_encoded)
+        self._calibrated = None
+        self.is_fitted = True
+        return self
+
+    def fit_stream(self, chunks: Iterable[Tuple],
+                   classes: Optional[Sequence[str]] = None,
+                   checkpoint_path: Optional[str] = None,
+                   checkpoint_every: int = 10) -> 'SVMSentimentModel':
+        """
+        Train incrementally on ``(X, y)`` chunks, checkpointing as it goes
+        
+        ``stream_position_`` (saved in checkpoints) counts the source rows
+        consumed, so a reader can skip them when resuming.
+        
+        Args:
+            chunks (Iterable): ``(feature matrix, labels)`` per chunk, or
+                ``(feature matrix, labels, source rows read)`` when the
+                reader drops rows (e.g. unlabeled ones)
+            classes (Sequence[str], optional): All labels (unless resuming)
+            checkpoint_path (str, optional): Checkpoint file, written every
+                ``checkpoint_every`` chunks and at the end
+            checkpoint_every (int): Chunks between checkpoints
+            
+        Returns:
+            self
+        """
+        n_chunks = 0
+        for chunk in chunks:
+            X, y = chunk[0], chunk[1]
+            if len(y):
+                self.partial_fit(X, y, classes=classes)
+            self.stream_position_ += chunk[2] if len(chunk) > 2 else len(y)
+            n_chunks += 1
+            if checkpoint_path and n_chunks % max(1, checkpoint_every) == 0:
+                self.save_checkpoint(checkpoint_path)
+                self.logger.info(f"Checkpoint after {self.rows_seen_} rows saved to {checkpoint_path}")
+        
+        if checkpoint_path and self.is_fitted:
+            self.save_checkpoint(checkpoint_path)
+        self.logger.info(f"Incremental training: {n_chunks} chunks, {self.rows_seen_} rows seen in total")
+        return self
+
+    def save_checkpoint(self, checkpoint_path: str):
+        """
+        Save the whole training state (atomically) to resume later
+        
+        Args:
+            checkpoint_path (str): Path to save the checkpoint
+        """
+        state = {
+            'params': {
+                'kernel': self.kernel, 'C': self.C, 'class_weight': self.class_weight,
+                'random_state': self.random_state, 'incremental': self.incremental,
+                'loss': self.loss, 'alpha': self.alpha,
+                'fast_linear': self.fast_linear, 'calibration': self.calibration
+            },
+            'model': self.model,
+            'label_encoder': self.label_encoder,
+            'class_counts': self.class_counts_,
+            'rows_seen': self.rows_seen_,
+            'stream_position': self.stream_position_,
+            'calibration_scores': self.calibration_scores_,
+            'calibration_labels': self.calibration_labels_,
+            'is_fitted': self.is_fitted
+        }
+        directory = os.path.dirname(os.path.abspath(checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f)
+            os.replace(tmp_path, checkpoint_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path: str) -> 'SVMSentimentModel':
+        """
+        Restore a model saved by ``save_checkpoint``
+        
+        Args:
+            checkpoint_path (str): Path to load the checkpoint from
+            
+        Returns:
+            SVMSentimentModel: Instance ready to continue ``partial_fit``
+        """
+        with open(checkpoint_path, 'rb') as f:
+            state = pickle.load(f)
+        instance = SVMSentimentModel(**state['params'])
+        instance.model = state['model']
+        instance.label_encoder = state['label_encoder']
+        instance.class_counts_ = state['class_counts']
+        instance.rows_seen_ = state['rows_seen']
+        instance.stream_position_ = state['stream_position']
+        instance.calibration_scores_ = state.get('calibration_scores')
+        instance.calibration_labels_ = state.get('calibration_labels')
+        instance.is_fitted = state['is_fitted']
+        instance.logger.info(f"Resumed from {checkpoint_path} after {instance.stream_position_} source rows")
+        return instance
+
     def predict(self, X) -> np.ndarray:
         """
         Predict sentiment labels
@@ -99,7 +344,7 @@ class SVMSentimentModel:
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         
-        y_pred_encoded = self.model.predict(X)
+        y_pred_encoded = self._serving_model().predict(X)
         return self.label_encoder.inverse_transform(y_pred_encoded)
 
     def predict_proba(self, X) -> np.ndarray:
@@ -115,7 +360,33 @@ class SVMSentimentModel:
         if not self.is_fitted:
             raise ValueError("Model must be fitted before prediction")
         
-        return self.model.predict_proba(X)
+        return self._serving_model().predict_proba(X)
+
+    def predict_with_confidence(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict labels and the probability of each predicted label
+        
+        Calibrated linear models need one decision_function call for both;
+        other models fall back to predict + predict_proba.
+        
+        Args:
+            X: Feature matrix
+            
+        Returns:
+            Tuple of (labels, confidences)
+        """
+        if not self.is_fitted:
+            raise ValueError("Model must be fitted before prediction")
+        
+        model = self._serving_model()
+        if hasattr(model, 'predict_with_confidence'):
+            y_pred_encoded, confidence = model.predict_with_confidence(X)
+        else:
+            y_pred_encoded = model.predict(X)
+            proba = model.predict_proba(X)
+            columns = np.searchsorted(model.classes_, y_pred_encoded)
+            confidence = proba[np.arange(len(y_pred_encoded)), columns]
+        return self.label_encoder.inverse_transform(y_pred_encoded), confidence
 
     def hyperparameter_tuning(self, X, y: pd.Series, 
                              param_grid: Optional[Dict] = None,
@@ -132,12 +403,22 @@ class SVMSentimentModel:
         Returns:
             Dict: Best parameters and score
         """
-        if param_grid is None:
-            param_grid = {
+        if self.fast_linear:
+            estimator = FastLinearClassifier(calibration=self.calibration, random_state=self.random_state)
+            default_grid = {'C': [0.01, 0.1, 1, 10], 'class_weight': ['balanced', None]}
+        elif self.incremental:
+            # Same loss, so the tuned model can keep learning with partial_fit
+            estimator = SGDClassifier(loss=self.loss, random_state=self.random_state)
+            default_grid = {'alpha': [1e-5, 1e-4, 1e-3, 1e-2]}
+        else:
+            estimator = SVC(random_state=self.random_state, probability=True)
+            default_grid = {
                 'C': [0.1, 1, 10, 100],
                 'kernel': ['linear', 'rbf'],
                 'class_weight': ['balanced', None]
             }
+        if param_grid is None:
+            param_grid = default_grid
         
         self.logger.info("Starting hyperparameter tuning...")
         
@@ -146,7 +427,7 @@ class SVMSentimentModel:
         
         # GridSearch
         grid_search = GridSearchCV(
-            SVC(random_state=self.random_state, probability=True),
+            estimator,
             param_grid,
             cv=cv,
             scoring='f1_weighted',
@@ -158,6 +439,11 @@ class SVMSentimentModel:
         
         # Update model with best parameters
         self.model = grid_search.best_estimator_
+        if self.incremental:
+            self.alpha = self.model.alpha
+            if self.needs_calibration:
+                self._calibrate_out_of_fold(X, y_encoded)
+            self._calibrated = None
         self.is_fitted = True
         
         self.logger.info(f"Best parameters: {grid_search.best_params_}")
@@ -182,7 +468,7 @@ class SVMSentimentModel:
         
         try:
             with open(model_path, 'wb') as f:
-                pickle.dump(self.model, f)
+                pickle.dump(self._serving_model(), f)
             self.logger.info(f"Model saved to {model_path}")
             
             with open(encoder_path, 'wb') as f:
@@ -2,17 +2,27 @@
 Advanced SVM Hyperparameter Tuning with Optimization
 """
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 import numpy as np
 import pandas as pd
 from sklearn.svm import SVC
-from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, StratifiedKFold
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import f1_score, precision_score, recall_score
 
+from src.modeling.feature_cache import FeatureMatrixCache, grid_search_cached
+
 class SVMTuner:
     """Advanced SVM hyperparameter tuning"""
     
+    PARAM_GRID = {
+        'C': [0.1, 1, 10, 100, 1000],
+        'kernel': ['linear', 'rbf', 'poly'],
+        'gamma': ['scale', 'auto', 0.001, 0.01, 0.1],
+        'degree': [2, 3, 4],
+        'class_weight': ['balanced', None]
+    }
+    
     def __init__(self, random_state: int = 42):
         self.random_state = random_state
         self.logger = self._setup_logger()
@@ -37,13 +47,7 @@ class SVMTuner:
         """
         Comprehensive grid search for SVM hyperparameters
         """
-        param_grid = {
-            'C': [0.1, 1, 10, 100, 1000],
-            'kernel': ['linear', 'rbf', 'poly'],
-            'gamma': ['scale', 'auto', 0.001, 0.01, 0.1],
-            'degree': [2, 3, 4],
-            'class_weight': ['balanced', None]
-        }
+        param_grid = self.PARAM_GRID
         
         self.logger.info("Starting comprehensive grid search...")
         
@@ -118,6 +122,40 @@ class SVMTuner:
         
         return self.best_model, self.tuning_results
     
+    def cached_grid_search(self, texts: pd.Series, y_train: pd.Series, vectorizer,
+                           param_grid: Optional[Dict[str, Any]] = None, cv: int = 5,
+                           cache: Optional[FeatureMatrixCache] = None) -> Tuple[SVC, Dict[str, Any]]:
+        """
+        Grid search over SVM parameters (default: PARAM_GRID) on raw texts,
+        vectorizing inside each fold once
+
+        Fold matrices come from ``cache`` (keyed by dataset, folds and
+        vectorizer params), so later searches with the same vectorizer only
+        refit the classifiers. ``vectorizer`` is left fitted on all of
+        ``texts`` so it can be saved with the returned model.
+        """
+        self.logger.info("Starting cached grid search...")
+
+        label_encoder = LabelEncoder()
+        y_encoded = label_encoder.fit_transform(y_train)
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=self.random_state)
+
+        results = grid_search_cached(
+            SVC(random_state=self.random_state, probability=True),
+            param_grid or self.PARAM_GRID, vectorizer, texts, y_encoded, folds,
+            cache=cache, scoring='f1_weighted', n_jobs=-1
+        )
+
+        self.best_params = results['best_params']
+        self.best_model = SVC(random_state=self.random_state, probability=True, **self.best_params)
+        self.best_model.fit(vectorizer.fit_transform(texts), y_encoded)
+        self.tuning_results = results
+
+        self.logger.info(f"Best parameters: {self.best_params}")
+        self.logger.info(f"Best CV score: {results['best_score']:.4f}")
+
+        return self.best_model, self.tuning_results
+
     def get_tuning_summary(self) -> Dict[str, Any]:
         """Get summary of tuning results"""
         if self.tuning_results is None:
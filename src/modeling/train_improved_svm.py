@@ -14,6 +14,7 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report, accuracy_score
 
 from src.modeling.features import FeatureExtractor
+from src.modeling.feature_cache import FeatureMatrixCache
 from src.modeling.svm_tuner import SVMTuner
 from src.modeling.error_analyzer import ErrorAnalyzer
 from src.modeling.model_versioning import ModelVersionManager
@@ -86,20 +87,20 @@ def train_improved_svm(X_train: pd.Series, y_train: pd.Series,
         max_df=0.95
     )
     
-    X_train_features = feature_extractor.fit_transform(X_train)
-    X_test_features = feature_extractor.transform(X_test)
-    
     # Encode labels
     label_encoder = LabelEncoder()
     y_train_encoded = label_encoder.fit_transform(y_train)
     y_test_encoded = label_encoder.transform(y_test)
     
-    # Hyperparameter tuning
+    # Hyperparameter tuning: the vectorizer is fitted inside each CV fold
+    # (fold matrices are cached), then on the whole training set
     logger.info("Starting hyperparameter tuning...")
     tuner = SVMTuner(random_state=42)
-    model, tuning_results = tuner.grid_search_tuning(
-        X_train_features, y_train, cv=5
+    model, tuning_results = tuner.cached_grid_search(
+        X_train, y_train, feature_extractor.vectorizer, cv=5,
+        cache=FeatureMatrixCache('data/cache/features')
     )
+    X_test_features = feature_extractor.transform(X_test)
     
     # Predictions
     y_pred_encoded = model.predict(X_test_features)
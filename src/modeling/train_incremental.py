@@ -0,0 +1,263 @@
+"""
+Incremental (Out-of-Core) Training Script for Sentiment Analysis
+
+Streams a labeled CSV/Parquet file chunk by chunk through hashed features
+and a partial_fit linear model, so the corpus never has to fit in memory.
+A checkpoint records the model and how many source rows it has consumed;
+rerunning with --resume continues from there (e.g. with the rows appended
+since the last nightly run).
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from src.modeling.features import FeatureExtractor
+from src.modeling.svm_model import INCREMENTAL_LOSSES, SVMSentimentModel
+
+
+def setup_logging() -> logging.Logger:
+    """Setup logging configuration"""
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    return logger
+
+
+def read_chunks(path: str, chunk_size: int, columns: Optional[List[str]] = None,
+                skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame chunks of a CSV or Parquet file, skipping the first ``skip_rows`` rows"""
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            if skip_rows >= batch.num_rows:
+                skip_rows -= batch.num_rows
+                continue
+            frame = batch.to_pandas().iloc[skip_rows:]
+            skip_rows = 0
+            yield frame
+    else:
+        yield from pd.read_csv(
+            path,
+            usecols=columns,
+            chunksize=chunk_size,
+            skiprows=range(1, skip_rows + 1)
+        )
+
+
+def discover_classes(path: str, label_column: str, chunk_size: int) -> List[str]:
+    """All training labels, from a streaming pass over the label column only"""
+    labels = set()
+    for chunk in read_chunks(path, chunk_size, columns=[label_column]):
+        labels.update(chunk[label_column].dropna())
+    labels.discard('unknown')
+    return sorted(labels)
+
+
+def labeled_chunks(frames: Iterable[pd.DataFrame], feature_extractor: FeatureExtractor,
+                   text_column: str, label_column: str) -> Iterator[tuple]:
+    """``(features, labels, source rows)`` per chunk, dropping unknown/empty rows"""
+    for df in frames:
+        n_rows = len(df)
+        df = df[df[label_column].notna()]
+        df = df[df[label_column] != 'unknown']
+        df = df[df[text_column].notna()]
+        df = df[df[text_column].astype(str).str.len() > 0]
+        yield feature_extractor.transform(df[text_column].astype(str)), df[label_column], n_rows
+
+
+def train_incremental(input_path: str, output_dir: str,
+                      text_column: str = 'normalized_text',
+                      label_column: str = 'sentiment_label',
+                      classes: Optional[Sequence[str]] = None,
+                      chunk_size: int = 10000,
+                      checkpoint_path: Optional[str] = None,
+                      resume: bool = False,
+                      loss: str = 'log_loss',
+                      alpha: float = 1e-4,
+                      n_features: int = 2 ** 18,
+                      idf_pass: bool = False,
+                      logger: Optional[logging.Logger] = None) -> SVMSentimentModel:
+    """
+    Train (or continue training) an incremental model and save its artifacts
+
+    Args:
+        input_path (str): Labeled CSV or Parquet file
+        output_dir (str): Directory for svm_model.pkl, label_encoder.pkl and
+            feature_extractor.pkl (same layout as the batch pipeline)
+        text_column (str): Column containing processed text
+        label_column (str): Column containing sentiment labels
+        classes (Sequence[str], optional): All labels; discovered from the
+            label column when omitted
+        chunk_size (int): Rows per chunk
+        checkpoint_path (str, optional): Checkpoint file
+            (default: <output_dir>/incremental_checkpoint.pkl)
+        resume (bool): Continue from the checkpoint, skipping consumed rows
+        loss (str): Incremental loss
+        alpha (float): Regularization strength
+        n_features (int): Number of hashed features
+        idf_pass (bool): Stream the texts once to collect IDF statistics first
+        logger (logging.Logger, optional): Logger
+    """
+    logger = logger or setup_logging()
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = checkpoint_path or str(output_path / "incremental_checkpoint.pkl")
+    feature_path = output_path / "feature_extractor.pkl"
+
+    if resume and Path(checkpoint_path).exists():
+        model = SVMSentimentModel.load_checkpoint(checkpoint_path)
+        # The features must not change between runs of one model
+        feature_extractor = FeatureExtractor.load(str(feature_path))
+    else:
+        model = SVMSentimentModel(incremental=True, loss=loss, alpha=alpha)
+        feature_extractor = FeatureExtractor(mode='hashing', n_features=n_features, use_idf=idf_pass)
+        if idf_pass:
+            logger.info("Collecting IDF statistics...")
+            feature_extractor.fit_stream(
+                chunk[text_column].dropna().astype(str)
+                for chunk in read_chunks(input_path, chunk_size, columns=[text_column])
+            )
+        feature_extractor.save(str(feature_path))
+        if classes is None:
+            classes = discover_classes(input_path, label_column, chunk_size)
+        logger.info(f"Classes: {list(classes)}")
+
+    skip_rows = model.stream_position_
+    logger.info(f"Training on {input_path} from row {skip_rows} in chunks of {chunk_size}")
+    frames = read_chunks(input_path, chunk_size, columns=[text_column, label_column], skip_rows=skip_rows)
+    model.fit_stream(
+        labeled_chunks(frames, feature_extractor, text_column, label_column),
+        classes=classes,
+        checkpoint_path=checkpoint_path
+    )
+
+    if not model.is_fitted:
+        raise ValueError(f"No labeled rows found in {input_path}")
+    model.save(str(output_path / "svm_model.pkl"), str(output_path / "label_encoder.pkl"))
+
+    summary = {
+        "input_file": input_path,
+        "mode": "incremental",
+        "loss": model.loss,
+        "alpha": model.alpha,
+        "n_features": feature_extractor.n_features,
+        "source_rows": int(model.stream_position_),
+        "train_samples": int(model.rows_seen_),
+        "rows_this_run": int(model.stream_position_ - skip_rows),
+        "label_distribution": dict(zip(model.label_encoder.classes_.tolist(), model.class_counts_.tolist())),
+        "checkpoint": checkpoint_path
+    }
+    with open(output_path / "training_summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    logger.info(f"Artifacts saved to {output_path}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a sentiment model incrementally on a CSV/Parquet stream")
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="data/processed/comments_clean.csv",
+        help="Labeled CSV or Parquet file"
+    )
+    parser.add_argument(
+        "--text-column",
+        type=str,
+        default="normalized_text",
+        help="Column containing processed text"
+    )
+    parser.add_argument(
+        "--label-column",
+        type=str,
+        default="sentiment_label",
+        help="Column containing sentiment labels"
+    )
+    parser.add_argument(
+        "--classes",
+        type=str,
+        default=None,
+        help="Comma-separated labels (default: discovered from the label column)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10000,
+        help="Rows per chunk"
+    )
+    parser.add_argument(
+        "--loss",
+        choices=INCREMENTAL_LOSSES,
+        default="log_loss",
+        help="hinge (linear SVM, served with a stored sigmoid calibration), log_loss or modified_huber"
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=1e-4,
+        help="Regularization strength"
+    )
+    parser.add_argument(
+        "--n-features",
+        type=int,
+        default=2 ** 18,
+        help="Number of hashed features"
+    )
+    parser.add_argument(
+        "--idf-pass",
+        action="store_true",
+        help="Stream the texts once to collect IDF statistics before training"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Checkpoint file (default: <output-dir>/incremental_checkpoint.pkl)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the checkpoint, skipping rows it has already consumed"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="data/models",
+        help="Directory to save model artifacts"
+    )
+
+    args = parser.parse_args()
+
+    train_incremental(
+        input_path=args.input,
+        output_dir=args.output_dir,
+        text_column=args.text_column,
+        label_column=args.label_column,
+        classes=args.classes.split(",") if args.classes else None,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        loss=args.loss,
+        alpha=args.alpha,
+        n_features=args.n_features,
+        idf_pass=args.idf_pass
+    )
+
+
+if __name__ == "__main__":
+    main()
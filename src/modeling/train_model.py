@@ -10,12 +10,13 @@ from typing import Dict, Any, Tuple
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
+from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold, cross_val_score
 from sklearn.svm import SVC
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.preprocessing import LabelEncoder
 
 from src.modeling.features import FeatureExtractor
+from src.modeling.feature_cache import FeatureMatrixCache, cross_val_score_cached
 
 
 def setup_logging() -> logging.Logger:
@@ -139,11 +140,21 @@ def evaluate_model(model: SVC, X_test: pd.Series, y_test: pd.Series,
     X_combined = pd.concat([X_train, X_test])
     y_combined = pd.concat([y_train, y_test])
     
-    cv_scores = cross_val_score(
-        model, feature_extractor.fit_transform(X_combined),
-        label_encoder.fit_transform(y_combined), 
-        cv=5, scoring='f1_weighted'
-    )
+    y_combined_encoded = label_encoder.transform(y_combined)
+    
+    # Vectorize inside each fold (cached) instead of refitting the extractor
+    # that is saved with the model
+    if feature_extractor.hashing:
+        cv_scores = cross_val_score(
+            model, feature_extractor.transform(X_combined), y_combined_encoded,
+            cv=5, scoring='f1_weighted'
+        )
+    else:
+        cv_scores = cross_val_score_cached(
+            model, feature_extractor.vectorizer, feature_extractor.texts(X_combined), y_combined_encoded,
+            cv=StratifiedKFold(n_splits=5), cache=FeatureMatrixCache('data/cache/features'),
+            scoring='f1_weighted'
+        )
     
     # Generate classification report
     class_report = classification_report(
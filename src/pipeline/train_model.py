@@ -57,6 +57,29 @@ def parse_args() -> argparse.Namespace:
         default=5000,
         help="Maximum TF-IDF features"
     )
+    parser.add_argument(
+        "--feature-mode",
+        choices=["tfidf", "hashing"],
+        default="tfidf",
+        help="TF-IDF vocabulary or stateless hashed features"
+    )
+    parser.add_argument(
+        "--n-features",
+        type=int,
+        default=2 ** 18,
+        help="Number of hashed features (hashing mode)"
+    )
+    parser.add_argument(
+        "--fast-linear",
+        action="store_true",
+        help="Train the calibrated liblinear model instead of SVC"
+    )
+    parser.add_argument(
+        "--calibration",
+        choices=["sigmoid", "isotonic"],
+        default="sigmoid",
+        help="Probability calibration of the fast linear model"
+    )
     parser.add_argument(
         "--tune-hyperparameters",
         action="store_true",
@@ -113,8 +136,15 @@ def main():
     print(f"   Test:  {len(X_test)} samples")
     
     # Feature extraction
-    print(f"\n3. Extracting TF-IDF features (max_features={args.max_features})...")
-    feature_extractor = FeatureExtractor(max_features=args.max_features)
+    if args.feature_mode == "hashing":
+        print(f"\n3. Extracting hashed TF-IDF features (n_features={args.n_features})...")
+    else:
+        print(f"\n3. Extracting TF-IDF features (max_features={args.max_features})...")
+    feature_extractor = FeatureExtractor(
+        max_features=args.max_features,
+        mode=args.feature_mode,
+        n_features=args.n_features
+    )
     X_train_features = feature_extractor.fit_transform(X_train)
     X_test_features = feature_extractor.transform(X_test)
     print(f"   Feature matrix shape: {X_train_features.shape}")
@@ -125,7 +155,7 @@ def main():
     
     # Train model
     print(f"\n4. Training SVM model...")
-    model = SVMSentimentModel()
+    model = SVMSentimentModel(fast_linear=args.fast_linear, calibration=args.calibration)
     
     if args.tune_hyperparameters:
         print("   Performing hyperparameter tuning...")
@@ -169,6 +199,8 @@ def main():
         "train_samples": len(X_train),
         "test_samples": len(X_test),
         "max_features": args.max_features,
+        "feature_mode": args.feature_mode,
+        "model_type": "fast_linear" if args.fast_linear else "svc",
         "hyperparameter_tuning": args.tune_hyperparameters,
         "test_accuracy": results['accuracy'],
         "test_f1_score": results['f1_score'],
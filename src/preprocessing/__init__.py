@@ -6,15 +6,26 @@ for Indonesian language including cleaning, tokenization, and normalization.
 """
 
 from .text_cleaner import TextCleaner
+from .slang_normalizer import SlangNormalizer
+from .resources import ResourceRegistry, get_registry
 from .tokenizer import IndonesianTokenizer
 from .normalizer import TextNormalizer
+from .document import AnalyzedDocument
 from .preprocessor import TextPreprocessor
+from .record_cache import ProcessedRecordCache
+from .instrumentation import PipelineProfiler
 from .sentiment_labeler import SentimentLexiconLabeler
 
 __all__ = [
     "TextCleaner",
+    "SlangNormalizer",
+    "ResourceRegistry",
+    "get_registry",
     "IndonesianTokenizer", 
     "TextNormalizer",
+    "AnalyzedDocument",
     "TextPreprocessor",
+    "ProcessedRecordCache",
+    "PipelineProfiler",
     "SentimentLexiconLabeler",
 ]
\ No newline at end of file
@@ -4,6 +4,8 @@ Auto-label Unknown Sentiments dengan Keyword Matching
 import pandas as pd
 import logging
 
+from src.preprocessing.rule_engine import KeywordRuleEngine, polarity_rules
+
 logger = logging.getLogger(__name__)
 
 # Sentiment keywords
@@ -21,38 +23,18 @@ NEGATIVE_KEYWORDS = [
     'tidak bisa', 'tidak mampu', 'lemah', 'buruk', 'parah', 'mengerikan'
 ]
 
+# Label hanya jika salah satu polaritas unggul; sisanya tetap unknown
+AUTO_LABEL_ENGINE = KeywordRuleEngine(
+    'Auto-label',
+    keyword_groups={'pos': POSITIVE_KEYWORDS, 'neg': NEGATIVE_KEYWORDS},
+    rules=polarity_rules(flip_on_negation=False)
+)
+
 def auto_label_unknown(df, text_column='clean_text', sentiment_column='core_sentiment'):
     """
     Auto-label unknown sentiments berdasarkan keyword matching
     """
-    df = df.copy()
-    
-    # Find unknown rows
-    unknown_mask = df[sentiment_column].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Found {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, text_column]).lower()
-        
-        # Count positive and negative keywords
-        pos_count = sum(1 for kw in POSITIVE_KEYWORDS if kw in text)
-        neg_count = sum(1 for kw in NEGATIVE_KEYWORDS if kw in text)
-        
-        # Assign label based on keyword count
-        if pos_count > neg_count and pos_count > 0:
-            df.loc[idx, sentiment_column] = 'positive'
-            labeled_count += 1
-        elif neg_count > pos_count and neg_count > 0:
-            df.loc[idx, sentiment_column] = 'negative'
-            labeled_count += 1
-    
-    logger.info(f"Auto-labeled {labeled_count} unknown sentiments")
-    
-    return df
+    return AUTO_LABEL_ENGINE.apply(df, text_column, sentiment_column)
 
 def get_labeling_stats(df, sentiment_column='core_sentiment'):
     """Get labeling statistics"""
@@ -0,0 +1,218 @@
+"""
+Batch Lexicon Scorer - 5-Layer Framework
+Label a whole corpus with sparse matrix products instead of per-comment loops
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.preprocessing.optimized_sentiment_labeler import OptimizedSentimentLabeler
+
+logger = logging.getLogger(__name__)
+
+# (layer, label column, score column, confidence column) in label_text order
+LAYER_COLUMNS: Tuple[Tuple[str, str, str, str], ...] = (
+    ('layer1_core', 'core_sentiment', 'core_sentiment_score', 'core_sentiment_confidence'),
+    ('layer2_target', 'target_kritik', 'target_score', 'target_confidence'),
+    ('layer3_cause', 'root_cause', 'cause_score', 'cause_confidence'),
+    ('layer4_time', 'time_perspective', 'time_score', 'time_confidence'),
+    ('layer5_constructive', 'constructiveness', 'constructive_score', 'constructive_confidence'),
+)
+
+
+class BatchLexiconScorer:
+    """
+    Corpus-level equivalent of ``OptimizedSentimentLabeler.label_text``
+
+    Every distinct comment is stemmed and scanned once by the labeler's
+    keyword automaton, giving a binary document x stem matrix (multiword
+    phrases are single columns). Multiplying it by a stem x category matrix
+    of keyword counts yields the match count of every category for every
+    comment; weights, best label per layer, confidences and the primary
+    label are then derived column-wise with NumPy.
+
+    Ties, unknown layers, float summation order of ``total_score`` and
+    ``avg_confidence`` all follow ``label_text``, so the output is identical
+    row for row.
+    """
+
+    def __init__(self, labeler: Optional[OptimizedSentimentLabeler] = None):
+        self.labeler = labeler if labeler is not None else OptimizedSentimentLabeler()
+
+        stems = sorted(set(self.labeler.stemmed_keywords_cache.values()))
+        self.vocabulary: Dict[str, int] = {stem: col for col, stem in enumerate(stems)}
+
+        # Categories of all layers side by side; one matrix column each
+        self.category_names: List[str] = []
+        self.layer_slices: Dict[str, slice] = {}
+        weights: List[float] = []
+        rows: List[int] = []
+        cols: List[int] = []
+        # Per category: stem column -> [(position in keyword list, keyword)]
+        self._category_keywords: List[Dict[int, List[Tuple[int, str]]]] = []
+        for layer_name, layer_cats in self.labeler.all_categories.items():
+            start = len(self.category_names)
+            for cat_name, config in layer_cats.items():
+                column = len(self.category_names)
+                keyword_cols: Dict[int, List[Tuple[int, str]]] = {}
+                keyword_stems = self.labeler.layer_keyword_stems[layer_name][cat_name]
+                for position, (keyword, stem) in enumerate(keyword_stems):
+                    rows.append(self.vocabulary[stem])
+                    cols.append(column)
+                    keyword_cols.setdefault(self.vocabulary[stem], []).append((position, keyword))
+                self.category_names.append(cat_name)
+                weights.append(config.get('weight', 1.0))
+                self._category_keywords.append(keyword_cols)
+            self.layer_slices[layer_name] = slice(start, len(self.category_names))
+
+        # Duplicate (stem, category) entries are summed: a keyword listed twice counts twice
+        self.keyword_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+            shape=(len(stems), len(self.category_names))
+        )
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def presence_matrix(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Binary document x stem matrix of the keyword stems found in each text"""
+        find = self.labeler.keyword_automaton.find
+        stem_text = self.labeler.stem_text
+        vocabulary = self.vocabulary
+
+        seen: Dict[str, List[int]] = {}
+        indptr = [0]
+        indices: List[int] = []
+        for text in texts:
+            if not text or not isinstance(text, str):
+                columns = []
+            else:
+                columns = seen.get(text)
+                if columns is None:
+                    columns = sorted(vocabulary[stem] for stem in find(stem_text(text)))
+                    seen[text] = columns
+            indices.extend(columns)
+            indptr.append(len(indices))
+
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+
+    def score(self, texts: Iterable[str], keywords: bool = True) -> pd.DataFrame:
+        """
+        Label every text; one row per text with the ``label_text`` fields as columns
+
+        Args:
+            texts: Comments (list or Series; a Series keeps its index)
+            keywords: Also build ``all_matched_keywords`` (the only per-row Python step)
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = list(texts)
+        n_rows = len(texts)
+        valid = np.fromiter(
+            (bool(text) and isinstance(text, str) for text in texts),
+            dtype=bool, count=n_rows
+        )
+
+        presence = self.presence_matrix(texts)
+        counts = (presence @ self.keyword_matrix).toarray()
+        scores = counts * self.weights
+
+        columns: Dict[str, Any] = {}
+        layer_scores = []
+        layer_confidences = []
+        best_columns = []
+        names = np.asarray(self.category_names + ['unknown'], dtype=object)
+        rows = np.arange(n_rows)
+        for layer_name, label_col, score_col, conf_col in LAYER_COLUMNS:
+            part = self.layer_slices[layer_name]
+            matched = counts[:, part] > 0
+            has_match = matched.any(axis=1)
+            # First category with the highest score among matched ones, as max(dict)
+            candidates = np.where(matched, scores[:, part], -np.inf)
+            best = candidates.argmax(axis=1)
+            best_score = np.where(has_match, candidates[rows, best], 0.0)
+            best_column = np.where(has_match, best + part.start, len(self.category_names))
+
+            columns[label_col] = names[best_column]
+            columns[score_col] = best_score
+            columns[conf_col] = np.where(has_match, np.minimum(best_score / 10.0, 1.0), 0.0)
+            layer_scores.append(best_score)
+            layer_confidences.append(columns[conf_col])
+            best_columns.append(best_column)
+
+        # Primary label: most confident known non-core layer, else core sentiment
+        non_core = np.column_stack([
+            np.where(columns[label_col] != 'unknown', columns[conf_col], -np.inf)
+            for _, label_col, _, conf_col in LAYER_COLUMNS[1:]
+        ])
+        non_core_labels = np.column_stack([columns[label_col] for _, label_col, _, _ in LAYER_COLUMNS[1:]])
+        primary = non_core_labels[rows, non_core.argmax(axis=1)]
+        columns['primary_label'] = np.where(
+            np.isfinite(non_core.max(axis=1)), primary, columns['core_sentiment']
+        )
+
+        # Same left-to-right summation as label_text
+        total = layer_scores[0] + layer_scores[1]
+        confidence_sum = layer_confidences[0] + layer_confidences[1]
+        for layer_score, layer_confidence in zip(layer_scores[2:], layer_confidences[2:]):
+            total = total + layer_score
+            confidence_sum = confidence_sum + layer_confidence
+        columns['total_score'] = total
+        columns['avg_confidence'] = confidence_sum / len(LAYER_COLUMNS)
+
+        # Empty / non-string comments get label_text's defaults
+        if not valid.all():
+            defaults = self.labeler._get_default_labels()
+            for column, values in columns.items():
+                values = values.copy()
+                values[~valid] = defaults[column]
+                columns[column] = values
+
+        if keywords:
+            # Invalid rows have no keyword hits, so their lists are already empty
+            columns['all_matched_keywords'] = self._matched_keywords(presence, best_columns)
+
+        result = pd.DataFrame(columns, index=index)
+        logger.info(f"Scored {n_rows:,} comments ({presence.nnz:,} keyword hits)")
+        return result
+
+    def _matched_keywords(self, presence: sparse.csr_matrix, best_columns: List[np.ndarray]) -> List[List[str]]:
+        """Keywords of each layer's winning category present in each row, in label_text order"""
+        unknown = len(self.category_names)
+        indptr, indices = presence.indptr, presence.indices
+        matched_keywords = []
+        best_rows = np.column_stack(best_columns).tolist() if best_columns else []
+        for row, row_best in enumerate(best_rows):
+            present = indices[indptr[row]:indptr[row + 1]].tolist()
+            row_keywords = []
+            for column in row_best:
+                if column == unknown:
+                    continue
+                # Walk the few present stems, then restore keyword-list order
+                stem_keywords = self._category_keywords[column]
+                hits = []
+                for stem_col in present:
+                    hits.extend(stem_keywords.get(stem_col, ()))
+                hits.sort()
+                row_keywords.extend(keyword for _, keyword in hits)
+            matched_keywords.append(row_keywords)
+        return matched_keywords
+
+    def label_texts(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """``label_text`` dictionaries for every text, computed in one batch"""
+        frame = self.score(texts)
+        return [
+            {
+                key: (value.item() if isinstance(value, np.generic) else value)
+                for key, value in record.items()
+            }
+            for record in frame.to_dict('records')
+        ]
+
+
+# Export scorer
+__all__ = ['BatchLexiconScorer']
@@ -10,6 +10,7 @@ from typing import Any, Dict
 import pandas as pd
 
 from src.preprocessing.preprocessor import TextPreprocessor
+from src.preprocessing.resources import get_registry
 
 
 def _parse_args() -> argparse.Namespace:
@@ -50,6 +51,36 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Apply lexicon-based sentiment labeling (default off).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for preprocessing (0 = all cores).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows per chunk handed to each worker.",
+    )
+    parser.add_argument(
+        "--stem-cache",
+        type=str,
+        default=None,
+        help="SQLite file used as a persistent stem cache across runs.",
+    )
+    parser.add_argument(
+        "--record-cache",
+        type=str,
+        default=None,
+        help="SQLite file caching whole processed records across runs.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Write per-stage timing (JSON) to this path.",
+    )
     return parser.parse_args()
 
 
@@ -87,11 +118,16 @@ def main() -> None:
         min_tokens=args.min_tokens,
         remove_stopwords=not args.no_stopword_removal,
         enable_labeling=args.enable_labeling,
+        stem_cache_path=args.stem_cache,
+        record_cache_path=args.record_cache,
+        profile=bool(args.profile),
     )
 
     processed_df = preprocessor.process_dataframe(
         df,
         text_column=args.text_column,
+        batch_size=args.batch_size,
+        workers=args.workers,
     )
 
     processed_df = _serialize_lists(processed_df)
@@ -103,8 +139,14 @@ def main() -> None:
         "rows_in": len(df),
         "rows_out": len(processed_df),
         "columns_out": list(processed_df.columns),
+        "resource_startup_seconds": get_registry().startup_report(),
+        "record_cache": preprocessor.record_cache_stats(),
     }
 
+    if args.profile:
+        preprocessor.profiler.write_json(args.profile)
+        summary["profile_path"] = args.profile
+
     summary_path = output_path.with_suffix(".summary.json")
     with open(summary_path, "w", encoding="utf-8") as f:
         json.dump(summary, f, indent=2, ensure_ascii=False)
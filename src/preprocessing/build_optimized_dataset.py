@@ -13,6 +13,9 @@ from src.preprocessing.text_cleaner import TextCleaner
 from src.preprocessing.tokenizer import IndonesianTokenizer
 from src.preprocessing.normalizer import TextNormalizer
 from src.preprocessing.optimized_sentiment_labeler import OptimizedSentimentLabeler
+from src.preprocessing.record_cache import ProcessedRecordCache, fingerprint
+from src.preprocessing.instrumentation import PipelineProfiler
+from src.preprocessing.document import AnalyzedDocument
 
 # Setup logging
 logging.basicConfig(
@@ -22,10 +25,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def label_fields(labels: dict, label_summary: str) -> dict:
+    """Dataset columns for one comment's 5-layer labels (in output column order)"""
+    return {
+        # Layer 1: Core Sentiment
+        'core_sentiment': labels['core_sentiment'],
+        'core_sentiment_score': labels['core_sentiment_score'],
+        'core_sentiment_confidence': labels['core_sentiment_confidence'],
+        
+        # Layer 2: Target Kritik (WHO)
+        'target_kritik': labels['target_kritik'],
+        'target_score': labels['target_score'],
+        'target_confidence': labels['target_confidence'],
+        
+        # Layer 3: Root Cause (WHY)
+        'root_cause': labels['root_cause'],
+        'cause_score': labels['cause_score'],
+        'cause_confidence': labels['cause_confidence'],
+        
+        # Layer 4: Time Perspective (WHEN)
+        'time_perspective': labels['time_perspective'],
+        'time_score': labels['time_score'],
+        'time_confidence': labels['time_confidence'],
+        
+        # Layer 5: Constructiveness (HOW)
+        'constructiveness': labels['constructiveness'],
+        'constructive_score': labels['constructive_score'],
+        'constructive_confidence': labels['constructive_confidence'],
+        
+        # Summary fields
+        'primary_label': labels['primary_label'],
+        'total_score': labels['total_score'],
+        'avg_confidence': labels['avg_confidence'],
+        'matched_keywords': json.dumps(labels['all_matched_keywords']),
+        
+        # Summary text
+        'label_summary': label_summary
+    }
+
+
 def build_optimized_dataset(
     input_path: str,
     output_path: str,
-    min_tokens: int = 3
+    min_tokens: int = 3,
+    stem_cache_path: str = None,
+    record_cache_path: str = None,
+    profile_path: str = None
 ):
     """
     Build cleaned and labeled dataset with 5-layer framework
@@ -34,6 +79,9 @@ def build_optimized_dataset(
         input_path: Path to raw comments CSV
         output_path: Path for output clean CSV
         min_tokens: Minimum tokens to keep comment
+        stem_cache_path: Optional SQLite file for a persistent stem cache
+        record_cache_path: Optional SQLite file caching processed comments
+        profile_path: Optional JSON file for per-stage timings
     """
     
     logger.info(f"Loading raw comments from {input_path}")
@@ -44,37 +92,90 @@ def build_optimized_dataset(
     # Initialize processors
     logger.info("Initializing text processors...")
     cleaner = TextCleaner()
-    tokenizer = IndonesianTokenizer()
-    normalizer = TextNormalizer()
+    tokenizer = IndonesianTokenizer(mode="fast")
+    normalizer = TextNormalizer(stem_cache_path=stem_cache_path)
     labeler = OptimizedSentimentLabeler()
     
+    # Duplicate comments (spam, chants) reuse the result of their first copy
+    record_cache = ProcessedRecordCache(
+        fingerprint(
+            'OptimizedSentimentLabeler',
+            sorted(normalizer.stopwords),
+            labeler.all_categories,
+        ),
+        path=record_cache_path
+    )
+    
+    profiler = PipelineProfiler(enabled=bool(profile_path))
+    stage = profiler.stage
+    
+    # Clean the whole text column in one vectorized pass
+    logger.info("Cleaning text column...")
+    with stage('cleaning'):
+        clean_texts, too_short = cleaner.clean_column(df['text'])
+    
+    # Rows cleaned down to under 3 characters come back empty and can never
+    # reach min_tokens, so they skip tokenizing and the per-row loop
+    rows = df.loc[~too_short] if min_tokens > 0 else df
+    
     # Process each comment
     logger.info("Processing comments...")
     processed_data = []
     
-    for idx, row in df.iterrows():
+    for idx, row in rows.iterrows():
         if (idx + 1) % 1000 == 0:
             logger.info(f"   Processed {idx + 1:,} / {initial_count:,} comments...")
         
         try:
             text = row['text']
             
-            # 1. Clean text
-            clean_text = cleaner.clean_text(text)
+            # 1. Clean text (precomputed for the whole column)
+            clean_text = clean_texts.at[idx]
             
             # 2. Tokenize
-            tokens = tokenizer.tokenize(clean_text)
+            with stage('tokenize'):
+                tokens = tokenizer.tokenize(clean_text)
             
             # Skip if too short
             if len(tokens) < min_tokens:
                 continue
             
-            # 3. Normalize (remove stopwords + stemming)
-            normalized_tokens = normalizer.normalize_tokens(tokens)
-            normalized_text = ' '.join(normalized_tokens)
+            cached = record_cache.get(clean_text)
+            if cached is None:
+                profiler.count('record_cache', 'misses')
+                # 3. Normalize (remove stopwords + stemming)
+                with stage('stopword_removal'):
+                    kept_tokens = normalizer.remove_stopwords(tokens)
+                stemmer_calls = normalizer.stem_calls
+                with stage('stemming'):
+                    normalized_tokens = normalizer.stem_tokens(kept_tokens)
+                profiler.count('stemming', 'cache_misses', normalizer.stem_calls - stemmer_calls)
+                profiler.count('stemming', 'cache_hits', len(kept_tokens) - (normalizer.stem_calls - stemmer_calls))
+                document = AnalyzedDocument(
+                    raw_text=text if isinstance(text, str) else '',
+                    clean_text=clean_text,
+                    tokens=tokens,
+                    stems=normalized_tokens
+                )
+                normalized_text = document.normalized_text
+                
+                # 4. Label with 5-layer framework
+                with stage('labeling'):
+                    labels = labeler.label_document(document)
+                
+                cached = {
+                    'normalized_tokens': normalized_tokens,
+                    'normalized_text': normalized_text,
+                    'labels': labels,
+                    'label_summary': labeler.get_summary(labels)
+                }
+                record_cache.put(clean_text, cached)
+            else:
+                profiler.count('record_cache', 'hits')
             
-            # 4. Label with 5-layer framework
-            labels = labeler.label_text(normalized_text)
+            normalized_tokens = cached['normalized_tokens']
+            normalized_text = cached['normalized_text']
+            labels = cached['labels']
             
             # Prepare row
             processed_row = {
@@ -97,39 +198,8 @@ def build_optimized_dataset(
                 'tokens_no_stop': json.dumps(normalized_tokens),
                 'normalized_text': normalized_text,
                 
-                # Layer 1: Core Sentiment
-                'core_sentiment': labels['core_sentiment'],
-                'core_sentiment_score': labels['core_sentiment_score'],
-                'core_sentiment_confidence': labels['core_sentiment_confidence'],
-                
-                # Layer 2: Target Kritik (WHO)
-                'target_kritik': labels['target_kritik'],
-                'target_score': labels['target_score'],
-                'target_confidence': labels['target_confidence'],
-                
-                # Layer 3: Root Cause (WHY)
-                'root_cause': labels['root_cause'],
-                'cause_score': labels['cause_score'],
-                'cause_confidence': labels['cause_confidence'],
-                
-                # Layer 4: Time Perspective (WHEN)
-                'time_perspective': labels['time_perspective'],
-                'time_score': labels['time_score'],
-                'time_confidence': labels['time_confidence'],
-                
-                # Layer 5: Constructiveness (HOW)
-                'constructiveness': labels['constructiveness'],
-                'constructive_score': labels['constructive_score'],
-                'constructive_confidence': labels['constructive_confidence'],
-                
-                # Summary fields
-                'primary_label': labels['primary_label'],
-                'total_score': labels['total_score'],
-                'avg_confidence': labels['avg_confidence'],
-                'matched_keywords': json.dumps(labels['all_matched_keywords']),
-                
-                # Summary text
-                'label_summary': labeler.get_summary(labels)
+                # 5-layer labels and summary
+                **label_fields(labels, cached['label_summary'])
             }
             
             processed_data.append(processed_row)
@@ -138,6 +208,16 @@ def build_optimized_dataset(
             logger.warning(f"Error processing row {idx}: {e}")
             continue
     
+    normalizer.flush_stem_cache()
+    record_cache.flush()
+    logger.info(f"Stem cache: {normalizer.stem_cache_stats()}")
+    logger.info(f"Record cache: {record_cache.stats()}")
+    if profile_path:
+        profile = profiler.write_json(profile_path)
+        for name, stats in profile['stages'].items():
+            logger.info(f"   {name}: {stats['seconds']:.2f}s over {stats['calls']:,} calls")
+        logger.info(f"Stage profile saved to {profile_path}")
+    
     # Create DataFrame
     logger.info("Creating output DataFrame...")
     output_df = pd.DataFrame(processed_data)
@@ -206,6 +286,8 @@ def build_optimized_dataset(
         'framework': 'Optimized 5-Layer',
         'layers': 5,
         'total_categories': 18,
+        'lexicon_hash': labeler.compiled_lexicon.config_hash,
+        'record_cache': record_cache.stats(),
         'distributions': {
             'core_sentiment': core_dist.to_dict(),
             'target_kritik': target_dist.to_dict(),
@@ -247,12 +329,34 @@ def main():
         help='Minimum tokens to keep comment (default: 3)'
     )
     
+    parser.add_argument(
+        '--stem-cache',
+        type=str,
+        default=None,
+        help='SQLite file used as a persistent stem cache across runs'
+    )
+    parser.add_argument(
+        '--record-cache',
+        type=str,
+        default=None,
+        help='SQLite file caching processed comments across runs'
+    )
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        help='Write per-stage timings (JSON) to this path'
+    )
+    
     args = parser.parse_args()
     
     build_optimized_dataset(
         input_path=args.input,
         output_path=args.output,
-        min_tokens=args.min_tokens
+        min_tokens=args.min_tokens,
+        stem_cache_path=args.stem_cache,
+        record_cache_path=args.record_cache,
+        profile_path=args.profile
     )
 
 
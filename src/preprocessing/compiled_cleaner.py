@@ -0,0 +1,373 @@
+"""
+Compiled Cleaning Pipelines for TextCleaner
+
+This module turns a TextCleaner option set into a fixed sequence of fused
+regex passes. Every fusion below is chosen so that the output stays
+byte-identical to ``TextCleaner.clean_text`` (and, optionally,
+``clean_indonesian_text``); the parity mode re-runs the reference path to
+prove it.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+import pandas as pd
+
+from .instrumentation import no_stage as _no_stage
+
+# A URL match (``http\S+`` / ``www\S+``) can start at any of these positions.
+# Mentions and hashtags see URL-free text in the reference path, so their word
+# runs must stop right before the first URL start when fused with the URL pass.
+_URL_START = r'(?!http\S|www\S)'
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+# (name, pattern, replacement, literal every match must contain or None)
+CleaningPass = Tuple[str, Pattern[str], Replacement, Optional[str]]
+
+
+def _replace_tag_or_space(match: re.Match) -> str:
+    """Keep hashtag text, blank out everything else in a fused pass"""
+    tag = match.group('tag')
+    return tag if tag is not None else ' '
+
+
+class CompiledCleaner:
+    """
+    Fused, option-specific version of the TextCleaner pipeline
+
+    Use ``TextCleaner.compile(options)`` to obtain a cached instance instead
+    of constructing this class directly.
+    """
+
+    def __init__(
+        self,
+        cleaner,
+        options: Optional[Dict] = None,
+        indonesian: bool = False,
+        parity_check: bool = False,
+    ):
+        """
+        Build the fused pass list for an option set
+
+        Args:
+            cleaner (TextCleaner): Cleaner providing the reference patterns
+            options (Dict): Cleaning options, merged with the defaults
+            indonesian (bool): Also apply ``clean_indonesian_text``
+            parity_check (bool): Re-run the reference path on every call
+        """
+        self.cleaner = cleaner
+        self.logger = cleaner.logger
+        self.options = dict(cleaner.DEFAULT_OPTIONS, **(options or {}))
+        self.indonesian = indonesian
+        self.parity_check = parity_check
+        self.parity_mismatches: List[Tuple[str, str, str]] = []
+        # Optional PipelineProfiler timing the cleaning stages
+        self.profiler = None
+
+        self.passes: List[CleaningPass] = self._build_clean_passes()
+        self.lowercase = bool(self.options['convert_to_lowercase'])
+        self.indonesian_passes: List[CleaningPass] = (
+            self._build_indonesian_passes() if indonesian else []
+        )
+        self.normalize_characters = indonesian and self._needs_character_pass()
+        self.words_only = (
+            self.options['remove_special_chars']
+            and self.options['normalize_whitespace']
+            and self.lowercase
+        )
+
+    def _build_clean_passes(self) -> List[CleaningPass]:
+        """Translate the option set into the minimal list of regex passes"""
+        opts = self.options
+        patterns = self.cleaner.patterns
+        indo = self.cleaner.indonesian_patterns
+        passes: List[CleaningPass] = []
+
+        # HTML tags always go first; URLs may span tags so they cannot be fused
+        passes.append(('html', patterns['html'], ' ', '<'))
+
+        # URLs, mentions and hashtags start with distinct characters. Mention
+        # and hashtag runs stop before a URL start, which is exactly what the
+        # reference path sees after the URL pass.
+        guard = _URL_START if opts['remove_urls'] else ''
+        parts = []
+        if opts['remove_urls']:
+            parts.append(patterns['url'].pattern)
+        if opts['remove_mentions']:
+            parts.append(r'@(?:%s\w)+' % guard)
+        if opts['process_hashtags']:
+            parts.append(r'#(?P<tag>(?:%s\w)+)' % guard)
+        if parts:
+            name = '+'.join(
+                key for key, flag in (
+                    ('url', 'remove_urls'),
+                    ('mention', 'remove_mentions'),
+                    ('hashtag', 'process_hashtags'),
+                ) if opts[flag]
+            )
+            repl: Replacement = _replace_tag_or_space if opts['process_hashtags'] else ' '
+            passes.append((name, re.compile('|'.join(parts), re.IGNORECASE), repl, None))
+
+        # Emails are matched on hashtag-processed text and change the word
+        # boundaries seen by phone numbers, so they keep their own pass
+        if opts['remove_emails']:
+            passes.append(('email', patterns['email'], ' ', '@'))
+
+        # Phone numbers always cover whole digit runs, and emojis are single
+        # context-free characters, so these three removals fuse safely
+        parts = []
+        names = []
+        if opts['remove_phones']:
+            parts.append('(?i:%s)' % patterns['phone'].pattern)
+            names.append('phone')
+        if opts['remove_numbers']:
+            parts.append(patterns['numbers'].pattern)
+            names.append('numbers')
+        if opts['remove_emojis']:
+            parts.append(patterns['emoji'].pattern)
+            names.append('emoji')
+        if parts:
+            passes.append(('+'.join(names), re.compile('|'.join(parts)), ' ', None))
+
+        # Punctuation runs and letter runs use disjoint character classes
+        parts = []
+        names = []
+        if opts['remove_excessive_punctuation']:
+            parts.append(r'(?P<punct>[!?.,])(?P=punct){2,}')
+            names.append('excessive_punctuation')
+        if opts['remove_repeated_chars']:
+            parts.append(r'(?P<char>[a-zA-Z])(?P=char){2,}')
+            names.append('repeated_chars')
+        if parts:
+            passes.append((
+                '+'.join(names),
+                re.compile('|'.join(parts), re.IGNORECASE),
+                r'\g<punct>' * opts['remove_excessive_punctuation']
+                + r'\g<char>' * opts['remove_repeated_chars'],
+                None,
+            ))
+
+        if opts['remove_repeated_words']:
+            passes.append(('repeated_words', indo['repeated_words'], r'\1', None))
+
+        # Line breaks are a subset of \s, and a special character followed by
+        # whitespace collapsing is the same as collapsing any non-letter run
+        if opts['remove_special_chars'] and opts['normalize_whitespace']:
+            passes.append(('special_chars+whitespace', re.compile(r'[^a-zA-Z]+'), ' ', None))
+        elif opts['remove_special_chars']:
+            passes.append(('special_chars', patterns['special_chars'], ' ', None))
+        elif opts['normalize_whitespace']:
+            passes.append(('whitespace', patterns['whitespace'], ' ', None))
+
+        return passes
+
+    def _slang_values_match(self, pattern: Pattern[str]) -> bool:
+        """Check whether any abbreviation expansion contains the pattern"""
+        return any(
+            pattern.search(value)
+            for value in self.cleaner.slang_normalizer.lookup.values()
+        )
+
+    def _build_indonesian_passes(self) -> List[CleaningPass]:
+        """Indonesian passes, minus those the clean pass already guarantees"""
+        opts = self.options
+        indo = self.cleaner.indonesian_patterns
+        passes: List[CleaningPass] = []
+
+        # After the clean pass no letter run of three survives (letters are
+        # never joined by later passes), unless an expansion introduces one
+        letters_only = opts['remove_special_chars']
+        if not (
+            letters_only
+            and opts['remove_repeated_chars']
+            and not self._slang_values_match(indo['repeated_chars'])
+        ):
+            passes.append(('repeated_chars', indo['repeated_chars'], r'\1', None))
+
+        # Repeated words can reappear once punctuation between them is removed
+        # or abbreviations are expanded, so this pass is always needed
+        passes.append(('repeated_words', indo['repeated_words'], r'\1', None))
+        return passes
+
+    def _needs_character_pass(self) -> bool:
+        """Accented characters only survive when special chars are kept"""
+        if not self.options['remove_special_chars']:
+            return True
+        accented = set(self.cleaner.INDONESIAN_CHAR_MAP)
+        return any(
+            accented.intersection(value)
+            for value in self.cleaner.slang_normalizer.lookup.values()
+        )
+
+    def _clean_fused(self, text: str) -> str:
+        """Run the fused passes without reference fallback"""
+        stage = self.profiler.stage if self.profiler is not None else _no_stage
+        with stage('cleaning'):
+            cleaned_text = text
+            for _, pattern, repl, required in self.passes:
+                if required is None or required in cleaned_text:
+                    cleaned_text = pattern.sub(repl, cleaned_text)
+
+            if self.lowercase:
+                cleaned_text = cleaned_text.lower()
+            cleaned_text = cleaned_text.strip()
+
+        if len(cleaned_text) < 3:
+            self.logger.warning(f"Text too short after cleaning: '{text}' -> '{cleaned_text}'")
+            return ""
+
+        if not self.indonesian:
+            return cleaned_text
+
+        with stage('indonesian_cleaning'):
+            if self.words_only:
+                # Text is single-space separated lowercase letters at this point
+                lookup = self.cleaner.slang_normalizer.lookup
+                cleaned_text = ' '.join([lookup.get(word, word) for word in cleaned_text.split(' ')])
+            else:
+                cleaned_text = self.cleaner.slang_normalizer.normalize(cleaned_text)
+            for _, pattern, repl, _ in self.indonesian_passes:
+                cleaned_text = pattern.sub(repl, cleaned_text)
+            if self.normalize_characters:
+                cleaned_text = cleaned_text.translate(self.cleaner._char_table)
+        return cleaned_text
+
+    def reference(self, text: str) -> str:
+        """Clean text through the original, unfused TextCleaner path"""
+        cleaned_text = self.cleaner.clean_text(text, self.options)
+        if self.indonesian:
+            cleaned_text = self.cleaner.clean_indonesian_text(cleaned_text)
+        return cleaned_text
+
+    def clean(self, text: str) -> str:
+        """
+        Clean text with the compiled pipeline
+
+        Args:
+            text (str): Input text to clean
+
+        Returns:
+            str: Cleaned text, identical to the reference path
+        """
+        if not text or not isinstance(text, str):
+            return ""
+
+        try:
+            cleaned_text = self._clean_fused(text)
+        except Exception as e:
+            self.logger.error(f"Compiled cleaner failed, using reference path: {e}")
+            return self.reference(text)
+
+        if self.parity_check:
+            expected = self.reference(text)
+            if cleaned_text != expected:
+                self.parity_mismatches.append((text, expected, cleaned_text))
+                self.logger.error(f"Compiled cleaner parity mismatch: '{text}'")
+                return expected
+
+        return cleaned_text
+
+    __call__ = clean
+
+    def check_parity(self, texts: Iterable[str]) -> List[Tuple[str, str, str]]:
+        """
+        Compare compiled and reference output for many texts
+
+        Args:
+            texts (Iterable[str]): Texts to compare
+
+        Returns:
+            List[Tuple[str, str, str]]: (text, expected, actual) for each mismatch
+        """
+        mismatches = []
+        for text in texts:
+            if not text or not isinstance(text, str):
+                continue
+            actual = self._clean_fused(text)
+            expected = self.reference(text)
+            if actual != expected:
+                mismatches.append((text, expected, actual))
+        return mismatches
+
+    @staticmethod
+    def _apply_series_pass(
+        texts: pd.Series,
+        pattern: Pattern[str],
+        repl: Replacement,
+        required: Optional[str],
+    ) -> pd.Series:
+        """Apply one regex pass to a string column"""
+        if required is None:
+            return texts.str.replace(pattern, repl, regex=True)
+        mask = texts.str.contains(required, regex=False)
+        if mask.any():
+            texts = texts.copy()
+            texts[mask] = texts[mask].str.replace(pattern, repl, regex=True)
+        return texts
+
+    def clean_series(self, texts: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Clean a whole column with vectorized string operations
+
+        Every pass runs once over the column through the pandas string
+        accessor, so the result matches ``clean`` row for row. The column is
+        cast to ``object`` first (the passes use compiled patterns and
+        callable replacements), so each pass is a per-row ``re`` call in C,
+        not Arrow compute; passes with a required substring only touch the
+        rows that contain it.
+
+        Args:
+            texts (pd.Series): Column of raw texts
+
+        Returns:
+            Tuple[pd.Series, pd.Series]: Cleaned column (same index, empty
+            string for unusable rows) and a boolean mask marking rows that
+            became too short after cleaning
+        """
+        is_text = texts.map(lambda value: isinstance(value, str) and len(value) > 0)
+        cleaned = pd.Series("", index=texts.index, dtype=object)
+        too_short = pd.Series(False, index=texts.index, dtype=bool)
+
+        column = texts[is_text].astype(object)
+        if column.empty:
+            return cleaned, too_short
+
+        for _, pattern, repl, required in self.passes:
+            column = self._apply_series_pass(column, pattern, repl, required)
+        if self.lowercase:
+            column = column.str.lower()
+        column = column.str.strip()
+
+        short = column.str.len() < 3
+        too_short[short.index] = short
+        column = column[~short]
+
+        if self.indonesian and not column.empty:
+            normalizer = self.cleaner.slang_normalizer
+            if self.words_only:
+                lookup = normalizer.lookup
+                column = column.map(
+                    lambda text: ' '.join([lookup.get(word, word) for word in text.split(' ')])
+                )
+            else:
+                column = column.str.replace(normalizer._word_pattern, normalizer._replace, regex=True)
+            for _, pattern, repl, required in self.indonesian_passes:
+                column = self._apply_series_pass(column, pattern, repl, required)
+            if self.normalize_characters:
+                column = column.str.translate(self.cleaner._char_table)
+
+        cleaned[column.index] = column
+        return cleaned, too_short
+
+    def describe(self) -> List[str]:
+        """Names of the passes that will run, in order"""
+        names = [name for name, _, _, _ in self.passes]
+        if self.lowercase:
+            names.append('lowercase')
+        if self.indonesian:
+            names.append('abbreviations')
+            names.extend(name for name, _, _, _ in self.indonesian_passes)
+            if self.normalize_characters:
+                names.append('indonesian_characters')
+        return names
@@ -0,0 +1,78 @@
+"""Immutable analyzed-document representation shared by labelers and feature extractors."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class AnalyzedDocument:
+    """One comment after cleaning, tokenization and stemming.
+
+    Built once per comment (see ``TextPreprocessor.analyze``) and handed to
+    every consumer, so labelers and feature extractors read the fields they
+    need instead of re-cleaning, re-tokenizing or re-stemming the text.
+
+    Attributes:
+        raw_text: Text as scraped.
+        clean_text: Output of the Indonesian cleaning pipeline (lowercase).
+        tokens: Tokens of ``clean_text``.
+        stems: Stemmed tokens after stopword removal.
+        normalized_text: ``stems`` joined by single spaces.
+    """
+
+    raw_text: str
+    clean_text: str
+    tokens: Tuple[str, ...]
+    stems: Tuple[str, ...]
+    normalized_text: str = field(default="")
+
+    def __post_init__(self) -> None:
+        # Accept lists from callers but store tuples so the document is hashable
+        object.__setattr__(self, "tokens", tuple(self.tokens))
+        object.__setattr__(self, "stems", tuple(self.stems))
+        if not self.normalized_text and self.stems:
+            object.__setattr__(self, "normalized_text", " ".join(self.stems))
+
+    @classmethod
+    def from_record(cls, raw_text: str, record: Mapping[str, Any]) -> "AnalyzedDocument":
+        """Build a document from a ``TextPreprocessor.process_text`` record."""
+        return cls(
+            raw_text=raw_text,
+            clean_text=record["clean_text"],
+            tokens=record["tokens"],
+            stems=record["stemmed_tokens"],
+            normalized_text=record["normalized_text"],
+        )
+
+    def text(self, field_name: str = "clean_text") -> str:
+        """Return one of the text fields by name (``raw_text``, ``clean_text``, ``normalized_text``)."""
+        if field_name not in ("raw_text", "clean_text", "normalized_text"):
+            raise ValueError(f"Unknown document text field '{field_name}'")
+        return getattr(self, field_name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "raw_text": self.raw_text,
+            "clean_text": self.clean_text,
+            "tokens": list(self.tokens),
+            "stems": list(self.stems),
+            "normalized_text": self.normalized_text,
+        }
+
+
+def document_texts(items: Iterable[Any], field_name: str = "clean_text") -> List[Any]:
+    """Map AnalyzedDocument items to one of their text fields, pass anything else through."""
+    return [
+        item.text(field_name) if isinstance(item, AnalyzedDocument) else item
+        for item in items
+    ]
+
+
+def documents_from_records(
+    raw_texts: Sequence[str], records: Sequence[Mapping[str, Any]]
+) -> List[AnalyzedDocument]:
+    return [
+        AnalyzedDocument.from_record(raw, record)
+        for raw, record in zip(raw_texts, records)
+    ]
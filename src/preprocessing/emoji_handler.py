@@ -1,7 +1,14 @@
 """
 Emoji and Emoticon Handler for Indonesian Text
 """
+import csv
+import json
 import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+from src.preprocessing.trie_regex import TriePattern
 
 EMOJI_DICT = {
     '😂': 'tertawa',
@@ -34,26 +41,91 @@ EMOTICON_DICT = {
     ':@': 'marah',
 }
 
+class EmojiTranslator:
+    """
+    Translate emoji and emoticons to words in a single scan
+
+    The lexicon is compiled once into a prefix-trie pattern, so a full Unicode
+    emoji list with thousands of entries costs about the same per comment as
+    the small built-in dictionaries. When one entry is a prefix of another
+    (e.g. an emoji with and without a skin tone) the longest one wins.
+    """
+
+    def __init__(self, lexicon: Optional[Mapping[str, str]] = None):
+        if lexicon is None:
+            lexicon = {**EMOJI_DICT, **EMOTICON_DICT}
+        self.lexicon: Dict[str, str] = {
+            str(symbol): str(word) for symbol, word in lexicon.items() if symbol
+        }
+        self._replacements = {
+            symbol: f' {word} ' for symbol, word in self.lexicon.items()
+        }
+        self._pattern = TriePattern(self.lexicon)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Union[str, Path],
+        include_defaults: bool = True,
+    ) -> "EmojiTranslator":
+        """
+        Build a translator from an external lexicon file
+
+        Supported formats are JSON objects (``{"😂": "tertawa"}``) and
+        two-column CSV/TSV files (``symbol,word``). Entries from the file
+        override the defaults when ``include_defaults`` is True.
+        """
+        path = Path(path)
+        entries: Dict[str, str] = {**EMOJI_DICT, **EMOTICON_DICT} if include_defaults else {}
+
+        if path.suffix.lower() == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                entries.update(json.load(f))
+        else:
+            delimiter = '\t' if path.suffix.lower() in ('.tsv', '.txt') else ','
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.reader(f, delimiter=delimiter):
+                    if len(row) < 2 or row[0].startswith('#'):
+                        continue
+                    entries[row[0]] = row[1]
+
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.lexicon)
+
+
+    def translate(self, text: str) -> str:
+        """Replace every known emoji/emoticon with `` word ``"""
+        if not text:
+            return text
+        return self._pattern.sub(self._replacements.__getitem__, text)
+
+
+_EMOJI_TRANSLATOR = EmojiTranslator(EMOJI_DICT)
+_EMOTICON_TRANSLATOR = EmojiTranslator(EMOTICON_DICT)
+_DEFAULT_TRANSLATOR = EmojiTranslator()
+
+
+@lru_cache(maxsize=None)
+def _repeated_chars_pattern(max_repeat: int) -> re.Pattern:
+    return re.compile(r'(.)\1{' + str(max_repeat) + ',}')
+
+
 def convert_emoji_to_text(text: str) -> str:
     """Convert emoji to text representation"""
-    for emoji, word in EMOJI_DICT.items():
-        text = text.replace(emoji, f' {word} ')
-    return text
+    return _EMOJI_TRANSLATOR.translate(text)
 
 def convert_emoticon_to_text(text: str) -> str:
     """Convert emoticon to text representation"""
-    for emoticon, word in EMOTICON_DICT.items():
-        text = text.replace(emoticon, f' {word} ')
-    return text
+    return _EMOTICON_TRANSLATOR.translate(text)
 
 def handle_repeated_chars(text: str, max_repeat: int = 2) -> str:
     """Handle repeated characters (e.g., 'saaangat' -> 'sangat')"""
-    pattern = r'(.)\1{' + str(max_repeat) + ',}'
-    return re.sub(pattern, r'\1' * max_repeat, text)
+    return _repeated_chars_pattern(max_repeat).sub(r'\1' * max_repeat, text)
 
-def process_emoji_emoticon(text: str) -> str:
+def process_emoji_emoticon(text: str, translator: Optional[EmojiTranslator] = None) -> str:
     """Process emoji and emoticon in text"""
-    text = convert_emoji_to_text(text)
-    text = convert_emoticon_to_text(text)
+    text = (translator or _DEFAULT_TRANSLATOR).translate(text)
     text = handle_repeated_chars(text)
     return text
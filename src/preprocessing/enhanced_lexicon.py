@@ -4,7 +4,8 @@ Lebih comprehensive dan aggressive labeling
 """
 import pandas as pd
 import logging
-import re
+
+from src.preprocessing.rule_engine import KeywordRuleEngine, Rule, polarity_rules
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,8 @@ NEUTRAL_KEYWORDS = [
     'formasi', 'substitusi', 'kartu', 'wasit', 'referee', 'lapangan', 'stadion'
 ]
 
+NEGATION_WORDS = ['tidak', 'bukan', 'jangan', 'belum', 'nggak', 'gak', 'ga']
+
 def count_keywords(text, keywords_dict):
     """Count keywords in text"""
     text = str(text).lower()
@@ -49,59 +52,30 @@ def count_keywords(text, keywords_dict):
 
 def has_negation(text):
     """Check if text has negation"""
-    negations = ['tidak', 'bukan', 'jangan', 'belum', 'nggak', 'gak', 'ga']
     text = str(text).lower()
-    return any(neg in text for neg in negations)
+    return any(neg in text for neg in NEGATION_WORDS)
+
+AGGRESSIVE_ENGINE = KeywordRuleEngine(
+    'Enhanced lexicon',
+    keyword_groups={
+        # Keyword yang ada di dua kategori dihitung dua kali
+        'pos': [kw for keywords in POSITIVE_KEYWORDS.values() for kw in keywords],
+        'neg': [kw for keywords in NEGATIVE_KEYWORDS.values() for kw in keywords],
+        'neutral': NEUTRAL_KEYWORDS,
+        'negation': NEGATION_WORDS,
+    },
+    rules=polarity_rules() + [
+        Rule('neutral_keywords', lambda f: (f.neutral > 0) & (f.pos == 0) & (f.neg == 0), 'neutral'),
+        # Fallback: text sangat pendek tanpa keputusan -> neutral
+        Rule('short', lambda f: (f.word_count > 0) & (f.word_count < 3), 'neutral'),
+    ]
+)
 
 def auto_label_aggressive(df, text_column='clean_text', sentiment_column='core_sentiment'):
     """
     Aggressive auto-labeling untuk minimize unknown
     """
-    df = df.copy()
-    
-    unknown_mask = df[sentiment_column].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Found {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, text_column]).lower()
-        
-        # Count keywords
-        pos_count = count_keywords(text, POSITIVE_KEYWORDS)
-        neg_count = count_keywords(text, NEGATIVE_KEYWORDS)
-        neutral_count = sum(1 for kw in NEUTRAL_KEYWORDS if kw in text)
-        
-        # Check for negation (flips sentiment)
-        has_neg = has_negation(text)
-        
-        # Decision logic
-        if pos_count > 0 and pos_count > neg_count:
-            if has_neg:
-                df.loc[idx, sentiment_column] = 'negative'
-            else:
-                df.loc[idx, sentiment_column] = 'positive'
-            labeled_count += 1
-        elif neg_count > 0 and neg_count > pos_count:
-            if has_neg:
-                df.loc[idx, sentiment_column] = 'positive'
-            else:
-                df.loc[idx, sentiment_column] = 'negative'
-            labeled_count += 1
-        elif neutral_count > 0 and pos_count == 0 and neg_count == 0:
-            df.loc[idx, sentiment_column] = 'neutral'
-            labeled_count += 1
-        elif len(text.split()) > 0:
-            # Fallback: if text is very short or has no keywords, mark as neutral
-            if len(text.split()) < 3:
-                df.loc[idx, sentiment_column] = 'neutral'
-                labeled_count += 1
-    
-    logger.info(f"Auto-labeled {labeled_count} unknown sentiments")
-    
-    return df
+    return AGGRESSIVE_ENGINE.apply(df, text_column, sentiment_column)
 
 def get_stats(df, sentiment_column='core_sentiment'):
     """Get statistics"""
@@ -3,17 +3,32 @@ Enhanced Text Preprocessor with Emoji, Emoticon, and Negation Handling
 """
 import re
 import logging
-from typing import List
-from src.preprocessing.emoji_handler import process_emoji_emoticon
-from src.preprocessing.negation_handler import process_negation_intensifiers
+from typing import List, Optional, Sequence, Union
+from src.preprocessing.emoji_handler import EmojiTranslator, process_emoji_emoticon
+from src.preprocessing.instrumentation import PipelineProfiler
+from src.preprocessing.negation_handler import NegationTagger
 from src.preprocessing.text_cleaner import TextCleaner
 
 class EnhancedPreprocessor:
     """Enhanced preprocessing pipeline"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        emoji_lexicon_path: Optional[str] = None,
+        negation_scope: int = 1,
+        profile: bool = False,
+    ):
         self.logger = self._setup_logger()
         self.text_cleaner = TextCleaner()
+        self.cleaner = self.text_cleaner.compile()
+        self.profiler = PipelineProfiler(enabled=profile)
+        if profile:
+            self.cleaner.profiler = self.profiler
+        self.negation_tagger = NegationTagger(scope=negation_scope)
+        # Optional full emoji lexicon (JSON or CSV/TSV), compiled once
+        self.emoji_translator = (
+            EmojiTranslator.from_file(emoji_lexicon_path) if emoji_lexicon_path else None
+        )
     
     def _setup_logger(self) -> logging.Logger:
         logger = logging.getLogger(__name__)
@@ -34,17 +49,34 @@ class EnhancedPreprocessor:
         2. Text cleaning
         3. Negation/intensifier handling
         """
+        stage = self.profiler.stage
+        
         # Step 1: Handle emoji and emoticon
-        text = process_emoji_emoticon(text)
+        with stage('emoji'):
+            text = process_emoji_emoticon(text, self.emoji_translator)
         
         # Step 2: Clean text
-        text = self.text_cleaner.clean(text)
+        text = self.cleaner.clean(text)
         
         # Step 3: Handle negation and intensifiers
-        text = process_negation_intensifiers(text)
+        with stage('negation'):
+            text = self.negation_tagger.tag_text(text)
         
         return text.strip()
     
-    def preprocess_batch(self, texts: List[str]) -> List[str]:
-        """Preprocess batch of texts"""
+    def preprocess_batch(
+        self,
+        texts: Union[Sequence[str], Sequence[Sequence[str]]],
+        pretokenized: bool = False,
+    ) -> List[str]:
+        """
+        Preprocess batch of texts
+        
+        With ``pretokenized=True`` each item is a list of tokens that was
+        already cleaned (e.g. the ``tokens`` column of TextPreprocessor), and
+        only the negation/intensifier tagger runs over it.
+        """
+        if pretokenized:
+            with self.profiler.stage('negation_batch'):
+                return [' '.join(tokens) for tokens in self.negation_tagger.tag_batch(texts)]
         return [self.preprocess(text) for text in texts]
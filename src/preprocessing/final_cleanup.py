@@ -3,75 +3,43 @@ Final Cleanup - Label remaining unknown dengan aggressive strategy
 """
 import pandas as pd
 import logging
-import numpy as np
+
+from src.preprocessing.rule_engine import KeywordRuleEngine, Rule, always
 
 logger = logging.getLogger(__name__)
 
+# Aggressive strategy: setiap unknown pasti diberi label
+FINAL_CLEANUP_ENGINE = KeywordRuleEngine(
+    'Final cleanup',
+    keyword_groups={
+        'pos': ['bagus', 'hebat', 'keren', 'mantap', 'sip', 'oke', 'baik', 'sempurna'],
+        'neg': ['jelek', 'buruk', 'payah', 'gagal', 'rugi', 'kecewa', 'sedih', 'marah'],
+        'support': ['ayo', 'semangat', 'dukung', 'support'],
+        'failure': ['kalah', 'gagal', 'hancur', 'rusak'],
+    },
+    rules=[
+        # Strategy 1: Question marks (usually neutral/inquiry)
+        Rule('question', lambda f: f.has_question, 'neutral'),
+        # Strategy 2: Exclamation marks (usually emotional) -> count pos/neg words
+        Rule('exclamation_pos', lambda f: f.has_exclamation & (f.pos > f.neg), 'positive'),
+        Rule('exclamation_neg', lambda f: f.has_exclamation & (f.neg > f.pos), 'negative'),
+        Rule('exclamation', lambda f: f.has_exclamation, 'neutral'),
+        # Strategy 3: Very short text (< 5 words) = neutral
+        Rule('short', lambda f: f.word_count < 5, 'neutral'),
+        # Strategy 4: Specific patterns
+        Rule('support', lambda f: f.support > 0, 'positive'),
+        Rule('failure', lambda f: f.failure > 0, 'negative'),
+        # Strategy 5: Default to neutral for remaining
+        Rule('default', always, 'neutral'),
+    ]
+)
+
 def final_cleanup(df):
     """
     Final aggressive cleanup untuk unknown
     Strategy: Gunakan text length, word count, dan pattern matching
     """
-    df = df.copy()
-    
-    unknown_mask = df['core_sentiment'].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Final cleanup: {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, 'clean_text']).lower()
-        
-        # Strategy 1: Check for question marks (usually neutral/inquiry)
-        if '?' in text:
-            df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            continue
-        
-        # Strategy 2: Check for exclamation marks (usually emotional)
-        if '!' in text:
-            # Count positive/negative words
-            pos_words = ['bagus', 'hebat', 'keren', 'mantap', 'sip', 'oke', 'baik', 'sempurna']
-            neg_words = ['jelek', 'buruk', 'payah', 'gagal', 'rugi', 'kecewa', 'sedih', 'marah']
-            
-            pos_count = sum(1 for w in pos_words if w in text)
-            neg_count = sum(1 for w in neg_words if w in text)
-            
-            if pos_count > neg_count:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            elif neg_count > pos_count:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            continue
-        
-        # Strategy 3: Very short text (< 5 words) = neutral
-        if len(text.split()) < 5:
-            df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            continue
-        
-        # Strategy 4: Check for specific patterns
-        if any(word in text for word in ['ayo', 'semangat', 'dukung', 'support']):
-            df.loc[idx, 'core_sentiment'] = 'positive'
-            labeled_count += 1
-            continue
-        
-        if any(word in text for word in ['kalah', 'gagal', 'hancur', 'rusak']):
-            df.loc[idx, 'core_sentiment'] = 'negative'
-            labeled_count += 1
-            continue
-        
-        # Strategy 5: Default to neutral for remaining
-        df.loc[idx, 'core_sentiment'] = 'neutral'
-        labeled_count += 1
-    
-    logger.info(f"Final cleanup labeled: {labeled_count} sentiments")
-    
-    return df
+    return FINAL_CLEANUP_ENGINE.apply(df)
 
 def get_final_stats(df):
     """Get final statistics"""
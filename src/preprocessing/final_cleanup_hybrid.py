@@ -5,6 +5,8 @@ Solid logic + Smart fallback untuk short text
 import pandas as pd
 import logging
 
+from src.preprocessing.rule_engine import KeywordRuleEngine, Rule, polarity_rules, tie_rules
+
 logger = logging.getLogger(__name__)
 
 POSITIVE_KEYWORDS = [
@@ -43,119 +45,31 @@ def has_negation(text):
     text = str(text).lower()
     return any(neg in text for neg in NEGATION_WORDS)
 
+# Phase 1: solid logic (ada keyword yang jelas)
+# Phase 2: smart fallback (tidak ada keyword). Semua strategi fallback
+# (pertanyaan, neutral keywords, panjang teks, tanda seru) berakhir neutral:
+# "tanda seru pada teks 1-2 kata -> positive" sudah tertangkap lebih dulu
+# oleh "tanda seru + < 5 kata -> neutral".
+HYBRID_ENGINE = KeywordRuleEngine(
+    'Final cleanup hybrid',
+    keyword_groups={
+        'pos': POSITIVE_KEYWORDS,
+        'neg': NEGATIVE_KEYWORDS,
+        'neutral': NEUTRAL_KEYWORDS,
+        'negation': NEGATION_WORDS,
+    },
+    rules=polarity_rules() + tie_rules() + [
+        Rule('no_keywords', lambda f: f.pos + f.neg == 0, 'neutral'),
+    ]
+)
+
 def final_cleanup_hybrid(df):
     """
     Hybrid approach:
     1. Solid logic untuk text dengan keywords
     2. Smart fallback untuk short text tanpa keywords
     """
-    df = df.copy()
-    
-    unknown_mask = df['core_sentiment'].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Final cleanup hybrid: {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, 'clean_text']).lower()
-        word_count = len(text.split())
-        
-        # Count keywords
-        pos_count = count_keywords(text, POSITIVE_KEYWORDS)
-        neg_count = count_keywords(text, NEGATIVE_KEYWORDS)
-        neutral_count = count_keywords(text, NEUTRAL_KEYWORDS)
-        has_neg = has_negation(text)
-        total_keywords = pos_count + neg_count
-        
-        # ===== PHASE 1: SOLID LOGIC (Ada keyword yang jelas) =====
-        
-        if pos_count > 0 and pos_count > neg_count:
-            if has_neg:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            labeled_count += 1
-            continue
-        
-        if neg_count > 0 and neg_count > pos_count:
-            if has_neg:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-            labeled_count += 1
-            continue
-        
-        if pos_count > 0 and pos_count == neg_count:
-            if '!' in text:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            elif '?' in text:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            continue
-        
-        # ===== PHASE 2: SMART FALLBACK (Tidak ada keyword) =====
-        
-        if total_keywords == 0:
-            # Strategy 1: Question mark = NEUTRAL (pasti pertanyaan)
-            if '?' in text:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Strategy 2: Neutral keywords found = NEUTRAL
-            if neutral_count > 0:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Strategy 3: Exclamation mark + short text
-            # Exclamation biasanya emotional, tapi tanpa keywords = ambiguous
-            # Jadi label sebagai NEUTRAL (conservative)
-            if '!' in text and word_count < 5:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Strategy 4: Very short text (1-2 words) tanpa keywords
-            # Terlalu pendek untuk determine sentiment dengan pasti
-            # Tapi jika ada punctuation, gunakan itu sebagai clue
-            if word_count <= 2:
-                if '!' in text:
-                    # Exclamation on very short text = likely positive
-                    df.loc[idx, 'core_sentiment'] = 'positive'
-                elif '?' in text:
-                    # Question = neutral
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                else:
-                    # No punctuation, no keywords = neutral (safest)
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Strategy 5: Medium text (3-5 words) tanpa keywords
-            # Gunakan punctuation sebagai clue
-            if word_count <= 5:
-                if '!' in text:
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                elif '?' in text:
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                else:
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Strategy 6: Longer text (> 5 words) tanpa keywords
-            # Jika masih tidak ada keywords, label sebagai neutral
-            df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-    
-    logger.info(f"Labeled: {labeled_count}")
-    
-    return df
+    return HYBRID_ENGINE.apply(df)
 
 def get_final_stats(df):
     """Get final statistics"""
@@ -5,6 +5,8 @@ Tidak asal tebak, tapi berdasarkan evidence
 import pandas as pd
 import logging
 
+from src.preprocessing.rule_engine import KeywordRuleEngine, Rule, polarity_rules, tie_rules
+
 logger = logging.getLogger(__name__)
 
 # Comprehensive keyword dictionary
@@ -38,106 +40,29 @@ def has_negation(text):
     text = str(text).lower()
     return any(neg in text for neg in NEGATION_WORDS)
 
+# Rule 1-3: evidence dari keyword; Rule 4: tanpa keyword -> neutral dengan
+# confidence sesuai karakteristik teks
+IMPROVED_ENGINE = KeywordRuleEngine(
+    'Final cleanup improved',
+    keyword_groups={
+        'pos': POSITIVE_KEYWORDS,
+        'neg': NEGATIVE_KEYWORDS,
+        'negation': NEGATION_WORDS,
+    },
+    rules=polarity_rules() + tie_rules() + [
+        Rule('no_keywords_question', lambda f: (f.pos + f.neg == 0) & f.has_question, 'neutral', 0.3),
+        Rule('no_keywords_exclamation', lambda f: (f.pos + f.neg == 0) & f.has_exclamation, 'neutral', 0.3),
+        Rule('no_keywords_short', lambda f: (f.pos + f.neg == 0) & (f.word_count < 3), 'neutral', 0.2),
+        Rule('no_keywords', lambda f: f.pos + f.neg == 0, 'neutral', 0.1),
+    ]
+)
+
 def final_cleanup_improved(df):
     """
     Final cleanup dengan logic yang lebih solid
     Hanya label jika ada evidence yang jelas
     """
-    df = df.copy()
-    
-    unknown_mask = df['core_sentiment'].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Final cleanup improved: {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    confidence_scores = []
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, 'clean_text']).lower()
-        
-        # Count keywords
-        pos_count = count_keywords(text, POSITIVE_KEYWORDS)
-        neg_count = count_keywords(text, NEGATIVE_KEYWORDS)
-        has_neg = has_negation(text)
-        
-        # Calculate confidence score
-        total_keywords = pos_count + neg_count
-        
-        # RULE 1: Clear positive evidence
-        if pos_count > 0 and pos_count > neg_count:
-            if has_neg:
-                # "tidak bagus" → negative
-                df.loc[idx, 'core_sentiment'] = 'negative'
-                confidence = neg_count / max(total_keywords, 1)
-            else:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-                confidence = pos_count / max(total_keywords, 1)
-            labeled_count += 1
-            confidence_scores.append(confidence)
-            continue
-        
-        # RULE 2: Clear negative evidence
-        if neg_count > 0 and neg_count > pos_count:
-            if has_neg:
-                # "tidak jelek" → positive
-                df.loc[idx, 'core_sentiment'] = 'positive'
-                confidence = pos_count / max(total_keywords, 1)
-            else:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-                confidence = neg_count / max(total_keywords, 1)
-            labeled_count += 1
-            confidence_scores.append(confidence)
-            continue
-        
-        # RULE 3: Equal keywords - use punctuation as tiebreaker
-        if pos_count > 0 and pos_count == neg_count:
-            if '!' in text:
-                # Exclamation usually positive
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            elif '?' in text:
-                # Question usually neutral
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            else:
-                # Default to neutral
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            confidence_scores.append(0.5)
-            continue
-        
-        # RULE 4: No keywords found - use text characteristics
-        if total_keywords == 0:
-            # Check for question mark
-            if '?' in text:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                confidence_scores.append(0.3)
-                continue
-            
-            # Check for exclamation mark (usually emotional, but without keywords = neutral)
-            if '!' in text:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                confidence_scores.append(0.3)
-                continue
-            
-            # Very short text (< 3 words) - likely neutral
-            if len(text.split()) < 3:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                confidence_scores.append(0.2)
-                continue
-            
-            # Default: neutral (conservative approach)
-            df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            confidence_scores.append(0.1)
-    
-    avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-    
-    logger.info(f"Labeled: {labeled_count}, Avg Confidence: {avg_confidence:.2f}")
-    
-    return df
+    return IMPROVED_ENGINE.apply(df)
 
 def get_final_stats(df):
     """Get final statistics"""
@@ -5,6 +5,8 @@ Tidak asal tebak, hanya label jika ada evidence yang jelas
 import pandas as pd
 import logging
 
+from src.preprocessing.rule_engine import KeywordRuleEngine, Rule, polarity_rules, tie_rules
+
 logger = logging.getLogger(__name__)
 
 POSITIVE_KEYWORDS = [
@@ -37,96 +39,32 @@ def has_negation(text):
     text = str(text).lower()
     return any(neg in text for neg in NEGATION_WORDS)
 
+NEUTRAL_PATTERNS = ['pemain', 'pelatih', 'tim', 'pertandingan', 'laga', 'match', 'game',
+                    'skor', 'score', 'hasil', 'statistik', 'data', 'analisis', 'taktik']
+
+# Tanpa keyword: hanya label jika ada evidence yang jelas, sisanya TETAP UNKNOWN.
+# ("tanda seru + kata neutral" sudah tercakup oleh NEUTRAL_PATTERNS.)
+SOLID_ENGINE = KeywordRuleEngine(
+    'Final cleanup solid',
+    keyword_groups={
+        'pos': POSITIVE_KEYWORDS,
+        'neg': NEGATIVE_KEYWORDS,
+        'negation': NEGATION_WORDS,
+        'neutral': NEUTRAL_PATTERNS,
+    },
+    rules=polarity_rules() + tie_rules() + [
+        Rule('question', lambda f: (f.pos + f.neg == 0) & f.has_question & (f.word_count >= 2), 'neutral'),
+        Rule('neutral_patterns', lambda f: (f.pos + f.neg == 0) & (f.neutral > 0), 'neutral'),
+    ]
+)
+
 def final_cleanup_solid(df):
     """
     Final cleanup dengan solid logic
     Untuk short text: HANYA label jika ada keyword yang jelas
     Jika tidak ada keyword → UNKNOWN (jangan asal tebak)
     """
-    df = df.copy()
-    
-    unknown_mask = df['core_sentiment'].str.lower().str.contains('unknown', na=False)
-    unknown_count = unknown_mask.sum()
-    
-    logger.info(f"Final cleanup solid: {unknown_count} unknown sentiments")
-    
-    labeled_count = 0
-    kept_unknown = 0
-    
-    for idx in df[unknown_mask].index:
-        text = str(df.loc[idx, 'clean_text']).lower()
-        word_count = len(text.split())
-        
-        # Count keywords
-        pos_count = count_keywords(text, POSITIVE_KEYWORDS)
-        neg_count = count_keywords(text, NEGATIVE_KEYWORDS)
-        has_neg = has_negation(text)
-        total_keywords = pos_count + neg_count
-        
-        # ===== RULE 1: Ada keyword yang jelas =====
-        if pos_count > 0 and pos_count > neg_count:
-            if has_neg:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            labeled_count += 1
-            continue
-        
-        if neg_count > 0 and neg_count > pos_count:
-            if has_neg:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'negative'
-            labeled_count += 1
-            continue
-        
-        # ===== RULE 2: Equal keywords - gunakan punctuation =====
-        if pos_count > 0 and pos_count == neg_count:
-            if '!' in text:
-                df.loc[idx, 'core_sentiment'] = 'positive'
-            elif '?' in text:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            else:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-            labeled_count += 1
-            continue
-        
-        # ===== RULE 3: Tidak ada keyword =====
-        # Untuk short text: JANGAN asal tebak, tetap UNKNOWN
-        if total_keywords == 0:
-            # Hanya label jika ada CLEAR evidence
-            
-            # Evidence 1: Question mark = NEUTRAL (pasti pertanyaan)
-            if '?' in text and word_count >= 2:
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Evidence 2: Exclamation + specific pattern
-            if '!' in text and word_count >= 2:
-                # Check untuk specific words yang pasti neutral
-                neutral_words = ['pemain', 'pelatih', 'tim', 'pertandingan', 'laga', 'match', 'game']
-                if any(w in text for w in neutral_words):
-                    df.loc[idx, 'core_sentiment'] = 'neutral'
-                    labeled_count += 1
-                    continue
-            
-            # Evidence 3: Specific neutral patterns
-            neutral_patterns = ['pemain', 'pelatih', 'tim', 'pertandingan', 'laga', 'match', 'game', 
-                              'skor', 'score', 'hasil', 'statistik', 'data', 'analisis', 'taktik']
-            if any(p in text for p in neutral_patterns):
-                df.loc[idx, 'core_sentiment'] = 'neutral'
-                labeled_count += 1
-                continue
-            
-            # Jika tidak ada evidence yang jelas → TETAP UNKNOWN
-            # Jangan asal tebak!
-            kept_unknown += 1
-            continue
-    
-    logger.info(f"Labeled: {labeled_count}, Kept Unknown: {kept_unknown}")
-    
-    return df
+    return SOLID_ENGINE.apply(df)
 
 def get_final_stats(df):
     """Get final statistics"""
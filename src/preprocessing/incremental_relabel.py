@@ -0,0 +1,471 @@
+"""
+Incremental Relabel - 5-Layer Framework
+Re-score only the comments a lexicon edit can affect and patch the dataset
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.preprocessing.build_optimized_dataset import label_fields
+from src.preprocessing.lexicon_compiler import (
+    OPTIMIZED_LEXICON,
+    CompiledLexicon,
+    _stemmer_version,
+    artifact_path,
+    config_hash,
+)
+from src.preprocessing.optimized_sentiment_labeler import OptimizedSentimentLabeler
+
+logger = logging.getLogger(__name__)
+
+# Bump when the index tables or the way comments are tokenized change
+RELABEL_INDEX_VERSION = 1
+
+_WORD_UNITS = re.compile(r'\w+')
+
+# {layer: {category: {'weight': w, 'stems': [[keyword, stem], ...]}}}
+Snapshot = Dict[str, Any]
+
+
+def lexicon_snapshot(all_categories: Dict, layer_keyword_stems: Dict, lexicon_hash: str = '') -> Snapshot:
+    """Everything about a lexicon that can change a comment's labels"""
+    return {
+        'lexicon_hash': lexicon_hash,
+        'stemmer': _stemmer_version(),
+        'layers': {
+            layer_name: {
+                cat_name: {
+                    'weight': config.get('weight', 1.0),
+                    'stems': [[keyword, stem] for keyword, stem in layer_keyword_stems[layer_name][cat_name]],
+                }
+                for cat_name, config in categories.items()
+            }
+            for layer_name, categories in all_categories.items()
+        },
+    }
+
+
+def labeler_snapshot(labeler: OptimizedSentimentLabeler) -> Snapshot:
+    return lexicon_snapshot(
+        labeler.all_categories,
+        labeler.layer_keyword_stems,
+        labeler.compiled_lexicon.config_hash,
+    )
+
+
+def compiled_snapshot(compiled: CompiledLexicon) -> Snapshot:
+    """Snapshot of a saved lexicon artifact (e.g. the one a dataset was built with)"""
+    snapshot = lexicon_snapshot(compiled.layers, compiled.structures['layer_keyword_stems'], compiled.config_hash)
+    if config_hash(compiled.name, compiled.layers) != compiled.config_hash:
+        # Hashed under another stemmer: its stems are not comparable to ours
+        snapshot['stemmer'] = 'unknown'
+    return snapshot
+
+
+def affected_stems(old: Snapshot, new: Snapshot) -> Optional[Set[str]]:
+    """
+    Keyword stems whose comments may be labeled differently under ``new``
+
+    A comment's labels only depend on the categories whose stems it
+    contains, so only comments containing one of the returned stems need
+    re-scoring. ``None`` means every comment (different stemmer or layers).
+
+    - added / removed category: all of its stems
+    - reweighted category: its old and new stems
+    - added / removed keyword: that keyword's stem
+    - reordered keywords: all stems of the category (matched_keywords order)
+    - reordered categories: all stems of the layer (tie-breaking order)
+    """
+    if old['stemmer'] != new['stemmer'] or list(old['layers']) != list(new['layers']):
+        return None
+
+    stems: Set[str] = set()
+    for layer_name, new_categories in new['layers'].items():
+        old_categories = old['layers'][layer_name]
+        layer_stems = {
+            stem
+            for categories in (old_categories, new_categories)
+            for config in categories.values()
+            for _, stem in config['stems']
+        }
+
+        common = [cat for cat in old_categories if cat in new_categories]
+        if common != [cat for cat in new_categories if cat in old_categories]:
+            stems |= layer_stems
+            continue
+
+        for cat_name in set(old_categories) | set(new_categories):
+            old_config = old_categories.get(cat_name)
+            new_config = new_categories.get(cat_name)
+            if old_config is None or new_config is None:
+                stems.update(stem for _, stem in (old_config or new_config)['stems'])
+                continue
+
+            old_pairs = [tuple(pair) for pair in old_config['stems']]
+            new_pairs = [tuple(pair) for pair in new_config['stems']]
+            if old_config['weight'] != new_config['weight']:
+                stems.update(stem for _, stem in old_pairs + new_pairs)
+            elif old_pairs != new_pairs:
+                changed = (Counter(old_pairs) - Counter(new_pairs)) + (Counter(new_pairs) - Counter(old_pairs))
+                if changed:
+                    stems.update(stem for _, stem in changed)
+                else:
+                    stems.update(stem for _, stem in new_pairs)
+    return stems
+
+
+def dataset_digest(df: pd.DataFrame) -> str:
+    """Hash of the comments (ids and normalized text) an index was built from"""
+    digest = hashlib.sha1()
+    digest.update(str(RELABEL_INDEX_VERSION).encode('utf-8'))
+    for comment_id, text in zip(df['comment_id'].fillna(''), df['normalized_text'].fillna('')):
+        digest.update(f"{comment_id}\0{text}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class RelabelIndex:
+    """
+    SQLite inverted index: stemmed word -> dataset rows containing it
+
+    Rows are indexed on the word units of ``labeler.stem_text(normalized_text)``,
+    i.e. the text the keyword automaton scans. Every word unit of a matched
+    keyword stem is a whole word unit of that text, so intersecting the
+    postings of a stem's words gives a superset of the rows it matches.
+    ``meta`` keeps the dataset digest and the snapshot of the lexicon the
+    dataset's labels currently reflect.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict:
+        # Connections are per process
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pid=None)
+        return state
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "token TEXT NOT NULL, row INTEGER NOT NULL, PRIMARY KEY (token, row)"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.commit()
+
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def snapshot(self) -> Optional[Snapshot]:
+        value = self.get_meta('snapshot')
+        return json.loads(value) if value else None
+
+    def set_snapshot(self, snapshot: Snapshot) -> None:
+        self.set_meta('snapshot', json.dumps(snapshot, ensure_ascii=False))
+
+    def rebuild(self, rows: Iterable[Tuple[int, Iterable[str]]], key: str, batch_size: int = 50_000) -> int:
+        """Replace all postings with ``(row, tokens)`` pairs; drops the stored snapshot"""
+        conn = self._connect()
+        postings = 0
+        with conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM meta")
+            batch: List[Tuple[str, int]] = []
+            for row, tokens in rows:
+                batch.extend((token, row) for token in set(tokens))
+                if len(batch) >= batch_size:
+                    conn.executemany("INSERT OR IGNORE INTO postings (token, row) VALUES (?, ?)", batch)
+                    postings += len(batch)
+                    batch.clear()
+            conn.executemany("INSERT OR IGNORE INTO postings (token, row) VALUES (?, ?)", batch)
+            postings += len(batch)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('index_key', ?)", (key,))
+        return postings
+
+    def rows_with(self, token: str) -> Set[int]:
+        return {row for (row,) in self._connect().execute("SELECT row FROM postings WHERE token = ?", (token,))}
+
+    def candidate_rows(self, stems: Iterable[str], n_rows: int) -> Set[int]:
+        """Rows that may contain any of ``stems`` (all rows for a stem without words)"""
+        postings: Dict[str, Set[int]] = {}
+        rows: Set[int] = set()
+        for stem in stems:
+            words = _WORD_UNITS.findall(stem)
+            if not words:
+                return set(range(n_rows))
+            for word in words:
+                if word not in postings:
+                    postings[word] = self.rows_with(word)
+            rows |= set.intersection(*(postings[word] for word in words))
+        return rows
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    if isinstance(new, str):
+        # Empty strings come back from the CSV as NaN
+        return (old if isinstance(old, str) else '') == new
+    return old == new
+
+
+def _summary_snapshot(dataset_path: str, cache_dir: Optional[str]) -> Optional[Snapshot]:
+    """Snapshot of the lexicon artifact recorded in the dataset's build summary"""
+    summary_path = Path(dataset_path.replace('.csv', '.summary.json'))
+    if not summary_path.exists():
+        return None
+    with open(summary_path) as f:
+        digest = json.load(f).get('lexicon_hash')
+    if not digest:
+        return None
+    path = artifact_path(OPTIMIZED_LEXICON, digest, cache_dir)
+    try:
+        compiled = CompiledLexicon.load(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Lexicon artifact {path} of the dataset build is unavailable: {e}")
+        return None
+    return compiled_snapshot(compiled)
+
+
+def apply_patch(dataset_path: str, patch: pd.DataFrame, output_path: str = None) -> int:
+    """Write patched label columns into the dataset (atomically); returns patched rows"""
+    output_path = output_path or dataset_path
+    df = pd.read_csv(dataset_path, float_precision='round_trip')
+    if len(patch):
+        rows = patch['row'].to_numpy()
+        if rows.max() >= len(df):
+            raise ValueError(f"Patch row {rows.max()} is outside {dataset_path} ({len(df)} rows)")
+        expected = df['comment_id'].iloc[rows].fillna('').astype(str).to_numpy()
+        if (expected != patch['comment_id'].fillna('').astype(str).to_numpy()).any():
+            raise ValueError(f"Patch does not match the comment ids of {dataset_path}")
+        for column in patch.columns.drop(['row', 'comment_id']):
+            if df[column].dtype != patch[column].dtype:
+                # e.g. an all-integer score column receiving a fractional score
+                numeric = pd.api.types.is_numeric_dtype(df[column]) and pd.api.types.is_numeric_dtype(patch[column])
+                df[column] = df[column].astype(float if numeric else object)
+            df.loc[df.index[rows], column] = patch[column].to_numpy()
+
+    output_dir = Path(output_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return len(patch)
+
+
+def relabel(
+    dataset_path: str,
+    patch_path: str = None,
+    index_path: str = None,
+    apply: bool = False,
+    labeler: OptimizedSentimentLabeler = None,
+    lexicon_cache_dir: str = None
+) -> Dict[str, Any]:
+    """
+    Re-score the comments of a built dataset affected by a lexicon change
+
+    The lexicon the dataset's labels reflect comes from the index (stored by
+    the last applied relabel) or, on the first run, from the artifact whose
+    hash ``build_optimized_dataset`` wrote to the summary JSON. Without
+    either, every comment is re-scored. Changed rows are written to
+    ``patch_path`` as ``row, comment_id`` plus all label columns.
+
+    Args:
+        dataset_path: Output CSV of ``build_optimized_dataset``
+        patch_path: Patch CSV (default: ``<dataset>.relabel_patch.csv``)
+        index_path: SQLite index (default: ``<dataset>.relabel.sqlite``)
+        apply: Write the patch into the dataset and make the current lexicon the baseline
+        labeler: Labeler with the new lexicon (default: current config)
+        lexicon_cache_dir: Directory of compiled lexicon artifacts
+    """
+    start = time.perf_counter()
+    patch_path = patch_path or dataset_path.replace('.csv', '.relabel_patch.csv')
+    index = RelabelIndex(index_path or dataset_path.replace('.csv', '.relabel.sqlite'))
+    if labeler is None:
+        labeler = OptimizedSentimentLabeler(lexicon_cache_dir=lexicon_cache_dir)
+
+    logger.info(f"Loading dataset from {dataset_path}")
+    df = pd.read_csv(dataset_path, float_precision='round_trip')
+    texts = df['normalized_text'].tolist()
+    n_rows = len(df)
+
+    new_snapshot = labeler_snapshot(labeler)
+    index_key = f"{dataset_digest(df)}:{new_snapshot['stemmer']}"
+    baseline = None
+    if index.get_meta('index_key') == index_key:
+        baseline = index.snapshot()
+    else:
+        logger.info("Indexing dataset tokens...")
+        postings = index.rebuild(
+            (
+                (row, _WORD_UNITS.findall(labeler.stem_text(text)))
+                for row, text in enumerate(texts)
+                if text and isinstance(text, str)
+            ),
+            key=index_key
+        )
+        logger.info(f"Indexed {n_rows:,} comments ({postings:,} postings)")
+    if baseline is None:
+        baseline = _summary_snapshot(dataset_path, lexicon_cache_dir)
+
+    stems = affected_stems(baseline, new_snapshot) if baseline is not None else None
+    if stems is None:
+        logger.info("No comparable baseline lexicon: re-scoring every comment")
+        candidates = list(range(n_rows))
+    else:
+        candidates = sorted(index.candidate_rows(stems, n_rows))
+    logger.info(f"Affected stems: {'all' if stems is None else len(stems)}, candidate comments: {len(candidates):,}")
+
+    # Re-score each distinct text once
+    fields_by_text: Dict[Any, Dict[str, Any]] = {}
+    patch_rows = []
+    changed_columns: Counter = Counter()
+    for row in candidates:
+        text = texts[row]
+        key = text if isinstance(text, str) else None
+        fields = fields_by_text.get(key)
+        if fields is None:
+            labels = labeler.label_text(text)
+            fields = label_fields(labels, labeler.get_summary(labels))
+            fields_by_text[key] = fields
+
+        old = df.iloc[row]
+        changed = [column for column, value in fields.items() if not _same_value(old[column], value)]
+        if changed:
+            changed_columns.update(changed)
+            patch_rows.append({'row': row, 'comment_id': old['comment_id'], **fields})
+
+    label_columns = list(label_fields(labeler._get_default_labels(), ''))
+    patch = pd.DataFrame(patch_rows, columns=['row', 'comment_id'] + label_columns)
+    Path(patch_path).parent.mkdir(parents=True, exist_ok=True)
+    patch.to_csv(patch_path, index=False)
+
+    summary = {
+        'dataset': dataset_path,
+        'patch': patch_path,
+        'old_lexicon_hash': baseline['lexicon_hash'] if baseline else None,
+        'new_lexicon_hash': new_snapshot['lexicon_hash'],
+        'total_comments': n_rows,
+        'affected_stems': None if stems is None else len(stems),
+        'rescored': len(candidates),
+        'changed': len(patch),
+        'changed_columns': dict(changed_columns.most_common()),
+        'applied': apply,
+    }
+
+    if apply:
+        apply_patch(dataset_path, patch)
+        index.set_snapshot(new_snapshot)
+        dataset_summary = Path(dataset_path.replace('.csv', '.summary.json'))
+        if dataset_summary.exists():
+            with open(dataset_summary) as f:
+                build_summary = json.load(f)
+            build_summary['lexicon_hash'] = new_snapshot['lexicon_hash']
+            with open(dataset_summary, 'w') as f:
+                json.dump(build_summary, f, indent=2)
+        logger.info(f"Applied {len(patch):,} changed rows to {dataset_path}")
+    index.close()
+
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    with open(patch_path.replace('.csv', '.summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(f"Re-scored {len(candidates):,} / {n_rows:,} comments, {len(patch):,} changed "
+                f"in {summary['seconds']:.1f}s -> {patch_path}")
+    return summary
+
+
+# Export relabeling API
+__all__ = ['RelabelIndex', 'relabel', 'apply_patch', 'affected_stems', 'lexicon_snapshot']
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-label only the comments affected by a lexicon change"
+    )
+    parser.add_argument(
+        '--dataset',
+        type=str,
+        default='data/processed/optimized_clean_comments.csv',
+        help='Dataset built by build_optimized_dataset'
+    )
+    parser.add_argument(
+        '--patch',
+        type=str,
+        default=None,
+        help='Output patch CSV (default: <dataset>.relabel_patch.csv)'
+    )
+    parser.add_argument(
+        '--index',
+        type=str,
+        default=None,
+        help='SQLite token index (default: <dataset>.relabel.sqlite)'
+    )
+    parser.add_argument(
+        '--apply',
+        action='store_true',
+        help='Write the patch into the dataset'
+    )
+    parser.add_argument(
+        '--lexicon-cache-dir',
+        type=str,
+        default=None,
+        help='Compiled lexicon artifact directory (default: <resource dir>/lexicon)'
+    )
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    relabel(
+        dataset_path=args.dataset,
+        patch_path=args.patch,
+        index_path=args.index,
+        apply=args.apply,
+        lexicon_cache_dir=args.lexicon_cache_dir
+    )
+
+
+if __name__ == '__main__':
+    main()
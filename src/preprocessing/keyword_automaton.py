@@ -0,0 +1,85 @@
+"""
+Keyword Phrase Automaton
+Find every stemmed keyword phrase of a lexicon in one pass over a text
+"""
+
+import re
+from typing import Dict, Iterable, List, Pattern, Set
+
+# Maximal runs of word / non-word characters. Phrases and texts are split
+# the same way, so "tiki-taka" is the units ["tiki", "-", "taka"].
+_UNIT_PATTERN = re.compile(r'\w+|\W+')
+_WORD_CHAR = re.compile(r'\w')
+
+# Trie key holding the phrase that ends at a node
+_END = None
+
+
+class KeywordAutomaton:
+    """
+    Token-level trie over keyword phrases with ``\\b...\\b`` semantics
+
+    ``find(text)`` returns exactly the phrases for which
+    ``re.search(r'\\b' + re.escape(phrase) + r'\\b', text)`` succeeds, but
+    walks the text once instead of running one regex per phrase. A phrase
+    that starts and ends with a word character matches only on unit
+    boundaries, so it is found by matching its unit sequence from each word
+    unit of the text. The rare phrases that start or end with punctuation
+    (or are empty) keep their regex.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._root: Dict = {}
+        self._fallback: Dict[str, Pattern] = {}
+
+        for phrase in set(phrases):
+            if (
+                phrase
+                and _WORD_CHAR.match(phrase[0])
+                and _WORD_CHAR.match(phrase[-1])
+            ):
+                node = self._root
+                for unit in _UNIT_PATTERN.findall(phrase):
+                    node = node.setdefault(unit, {})
+                node[_END] = phrase
+            else:
+                self._fallback[phrase] = re.compile(r'\b' + re.escape(phrase) + r'\b')
+
+    def __len__(self) -> int:
+        return self._count(self._root) + len(self._fallback)
+
+    def _count(self, node: Dict) -> int:
+        return sum(
+            1 if key is _END else self._count(child)
+            for key, child in node.items()
+        )
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of phrases present in ``text``"""
+        found: Set[str] = set()
+        if not text:
+            return found
+
+        units: List[str] = _UNIT_PATTERN.findall(text)
+        root = self._root
+        n_units = len(units)
+        for start in range(n_units):
+            node = root.get(units[start])
+            if node is None:
+                continue
+            position = start
+            while True:
+                phrase = node.get(_END)
+                if phrase is not None:
+                    found.add(phrase)
+                position += 1
+                if position == n_units:
+                    break
+                node = node.get(units[position])
+                if node is None:
+                    break
+
+        for phrase, pattern in self._fallback.items():
+            if pattern.search(text):
+                found.add(phrase)
+        return found
@@ -0,0 +1,352 @@
+"""Compile lexicon configs into validated, versioned artifacts cached by config hash."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .keyword_automaton import KeywordAutomaton
+from .resources import get_registry
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout or the way keywords are stemmed/indexed changes
+LEXICON_FORMAT_VERSION = 1
+
+OPTIMIZED_LEXICON = "sentiment_config_v2_optimized"
+NINE_LAYER_LEXICON = "sentiment_config"
+
+Layers = Dict[str, Dict[str, Any]]
+
+
+class LexiconValidationError(ValueError):
+    """A lexicon config cannot be compiled (wrong types, empty keywords, ...)."""
+
+
+@dataclass(frozen=True)
+class LexiconIssue:
+    """A suspicious but compilable config entry.
+
+    ``duplicate``: a keyword listed more than once in one category (it counts
+    once per listing). ``collision``: a keyword listed in several categories.
+    ``category_override``: a category name defined in several layers, where
+    the later definition wins.
+    """
+
+    kind: str
+    keyword: str
+    locations: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        return f"{self.kind}: '{self.keyword}' in {', '.join(self.locations)}"
+
+
+def optimized_layers() -> Layers:
+    """The five layers of the optimized config, keyed as OptimizedSentimentLabeler keys them."""
+    from config.sentiment_config_v2_optimized import (
+        CONSTRUCTIVENESS,
+        CORE_SENTIMENT,
+        ROOT_CAUSE,
+        TARGET_KRITIK,
+        TIME_PERSPECTIVE,
+    )
+
+    return {
+        "layer1_core": CORE_SENTIMENT,
+        "layer2_target": TARGET_KRITIK,
+        "layer3_cause": ROOT_CAUSE,
+        "layer4_time": TIME_PERSPECTIVE,
+        "layer5_constructive": CONSTRUCTIVENESS,
+    }
+
+
+def nine_layer_layers() -> Layers:
+    """Every upper-case dict of the 9-layer config, keyed by lower-cased name, in ``dir`` order."""
+    from config import sentiment_config
+
+    layers: Layers = {}
+    for attr in dir(sentiment_config):
+        if not attr.isupper():
+            continue
+        layer_value = getattr(sentiment_config, attr)
+        if isinstance(layer_value, dict):
+            layers[attr.lower()] = layer_value
+    return layers
+
+
+def flatten_lexicon(layers: Layers) -> Dict[str, Dict]:
+    """Category -> keywords/weight/layer mapping used by SentimentLexiconLabeler."""
+    lexicon: Dict[str, Dict] = {}
+    for layer, categories in layers.items():
+        for category, meta in categories.items():
+            if not isinstance(meta, dict):
+                continue
+
+            keywords = [kw.lower() for kw in meta.get("keywords", []) if kw]
+            lexicon[category] = {
+                "layer": layer,
+                "keywords": keywords,
+                "weight": float(meta.get("weight", 1.0)),
+                "description": meta.get("description", ""),
+            }
+    return lexicon
+
+
+def build_keyword_index(
+    lexicon: Dict[str, Dict],
+) -> Tuple[Dict[str, List[Tuple[str, int]]], List[Tuple[str, List[Tuple[str, int]]]]]:
+    """Map each keyword to the categories listing it and how many times.
+
+    Single-word keywords count token occurrences, so they go into a
+    token -> [(category, multiplicity)] index. Phrases are matched as
+    substrings of the text and are kept in a (much shorter) list.
+    """
+    token_index: Dict[str, List[Tuple[str, int]]] = {}
+    phrase_index: Dict[str, List[Tuple[str, int]]] = {}
+    for category, meta in lexicon.items():
+        for keyword, multiplicity in Counter(meta["keywords"]).items():
+            index = phrase_index if " " in keyword else token_index
+            index.setdefault(keyword, []).append((category, multiplicity))
+    return token_index, list(phrase_index.items())
+
+
+def validate_layers(layers: Layers) -> List[LexiconIssue]:
+    """Reject malformed entries and report duplicates and collisions.
+
+    Category entries that are not dicts are skipped, as the labelers skip
+    them. Raises ``LexiconValidationError`` for keyword lists that are not
+    lists of non-empty strings and for non-numeric weights.
+    """
+    issues: List[LexiconIssue] = []
+    keyword_locations: Dict[str, List[str]] = {}
+    category_layers: Dict[str, List[str]] = {}
+
+    for layer, categories in layers.items():
+        if not isinstance(categories, dict):
+            raise LexiconValidationError(f"Layer '{layer}' must be a dict of categories")
+        for category, meta in categories.items():
+            if not isinstance(meta, dict):
+                continue
+            location = f"{layer}/{category}"
+            category_layers.setdefault(category, []).append(layer)
+
+            keywords = meta.get("keywords", [])
+            if not isinstance(keywords, (list, tuple)):
+                raise LexiconValidationError(f"{location}: 'keywords' must be a list")
+            for keyword in keywords:
+                if not isinstance(keyword, str) or not keyword.strip():
+                    raise LexiconValidationError(f"{location}: invalid keyword {keyword!r}")
+            try:
+                float(meta.get("weight", 1.0))
+            except (TypeError, ValueError):
+                raise LexiconValidationError(
+                    f"{location}: weight {meta.get('weight')!r} is not a number"
+                ) from None
+
+            for keyword, count in Counter(kw.lower() for kw in keywords).items():
+                if count > 1:
+                    issues.append(LexiconIssue("duplicate", keyword, (location,) * count))
+                keyword_locations.setdefault(keyword, []).append(location)
+
+    for keyword, locations in keyword_locations.items():
+        if len(locations) > 1:
+            issues.append(LexiconIssue("collision", keyword, tuple(locations)))
+    for category, owners in category_layers.items():
+        if len(owners) > 1:
+            issues.append(LexiconIssue("category_override", category, tuple(owners)))
+    return issues
+
+
+def _stemmer_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return f"Sastrawi-{version('Sastrawi')}"
+    except Exception:
+        return "Sastrawi-unknown"
+
+
+def config_hash(name: str, layers: Layers) -> str:
+    """Hash of the config content; category and keyword order are significant."""
+    payload = json.dumps(
+        [LEXICON_FORMAT_VERSION, name, _stemmer_version(), layers],
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CompiledLexicon:
+    """Validated config snapshot plus the matcher structures a labeler needs.
+
+    ``structures`` holds ``layer_keyword_stems`` and ``automaton`` for the
+    optimized lexicon, ``lexicon``, ``token_index`` and ``phrase_index`` for
+    the 9-layer one.
+    """
+
+    name: str
+    config_hash: str
+    layers: Layers
+    issues: List[LexiconIssue]
+    stemmed_keywords: Dict[str, str] = field(default_factory=dict)
+    structures: Dict[str, Any] = field(default_factory=dict)
+    format_version: int = LEXICON_FORMAT_VERSION
+    compile_seconds: float = 0.0
+
+    def save(self, path: str | Path) -> Path:
+        """Write the artifact atomically (temp file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompiledLexicon":
+        with open(path, "rb") as f:
+            compiled = pickle.load(f)
+        if not isinstance(compiled, cls) or compiled.format_version != LEXICON_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a v{LEXICON_FORMAT_VERSION} compiled lexicon")
+        return compiled
+
+
+def _compile_optimized(layers: Layers, stemmer) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    if stemmer is None:
+        stemmer = get_registry().stemmer()
+
+    # Pre-stem all keywords to avoid repeated stemming during matching
+    stemmed_keywords: Dict[str, str] = {}
+    for categories in layers.values():
+        for config in categories.values():
+            for keyword in config.get("keywords", []):
+                if keyword not in stemmed_keywords:
+                    tokens = str(keyword).lower().split()
+                    stemmed_keywords[keyword] = " ".join(stemmer.stem(token) for token in tokens)
+
+    layer_keyword_stems = {
+        layer_name: {
+            cat_name: [(keyword, stemmed_keywords[keyword]) for keyword in config.get("keywords", [])]
+            for cat_name, config in categories.items()
+        }
+        for layer_name, categories in layers.items()
+    }
+    structures = {
+        "layer_keyword_stems": layer_keyword_stems,
+        "automaton": KeywordAutomaton(stemmed_keywords.values()),
+    }
+    return stemmed_keywords, structures
+
+
+def _compile_nine_layer(layers: Layers, stemmer) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    lexicon = flatten_lexicon(layers)
+    token_index, phrase_index = build_keyword_index(lexicon)
+    return {}, {"lexicon": lexicon, "token_index": token_index, "phrase_index": phrase_index}
+
+
+LEXICON_SOURCES: Dict[str, Tuple[Callable[[], Layers], Callable]] = {
+    OPTIMIZED_LEXICON: (optimized_layers, _compile_optimized),
+    NINE_LAYER_LEXICON: (nine_layer_layers, _compile_nine_layer),
+}
+
+
+def compile_lexicon(name: str = OPTIMIZED_LEXICON, layers: Optional[Layers] = None,
+                    stemmer=None) -> CompiledLexicon:
+    """Validate a config and build its matcher structures (no caching)."""
+    if name not in LEXICON_SOURCES:
+        raise ValueError(f"Unknown lexicon '{name}', expected one of {sorted(LEXICON_SOURCES)}")
+    load_layers, build = LEXICON_SOURCES[name]
+    if layers is None:
+        layers = load_layers()
+
+    start = time.perf_counter()
+    issues = validate_layers(layers)
+    stemmed_keywords, structures = build(layers, stemmer)
+    return CompiledLexicon(
+        name=name,
+        config_hash=config_hash(name, layers),
+        layers=layers,
+        issues=issues,
+        stemmed_keywords=stemmed_keywords,
+        structures=structures,
+        compile_seconds=time.perf_counter() - start,
+    )
+
+
+def lexicon_cache_dir() -> Path:
+    return get_registry().resource_dir / "lexicon"
+
+
+def artifact_path(name: str, digest: str, cache_dir: str | Path | None = None) -> Path:
+    return Path(cache_dir or lexicon_cache_dir()) / f"{name}-{digest[:16]}.pkl"
+
+
+def load_or_compile(name: str = OPTIMIZED_LEXICON, cache_dir: str | Path | None = None,
+                    stemmer=None) -> CompiledLexicon:
+    """Load the artifact for the current config, compiling and saving it on a miss.
+
+    A changed config hashes to a new file name, so stale artifacts are never
+    loaded. An unreadable cache directory only costs the compile.
+    """
+    load_layers, _ = LEXICON_SOURCES[name]
+    layers = load_layers()
+    digest = config_hash(name, layers)
+    path = artifact_path(name, digest, cache_dir)
+
+    if path.exists():
+        try:
+            compiled = CompiledLexicon.load(path)
+            if compiled.name == name and compiled.config_hash == digest:
+                return compiled
+        except Exception as e:  # corrupt or from another format version
+            logger.warning(f"Ignoring lexicon artifact {path}: {e}")
+
+    compiled = compile_lexicon(name, layers=layers, stemmer=stemmer)
+    if compiled.issues:
+        kinds = Counter(issue.kind for issue in compiled.issues)
+        logger.info(f"Lexicon {name}: {dict(kinds)} (see compile_lexicon().issues)")
+    try:
+        compiled.save(path)
+        logger.info(f"Compiled lexicon {name} in {compiled.compile_seconds:.1f}s -> {path}")
+    except OSError as e:
+        logger.warning(f"Could not write lexicon artifact {path}: {e}")
+    return compiled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile a sentiment lexicon config")
+    parser.add_argument("--name", choices=sorted(LEXICON_SOURCES), default=OPTIMIZED_LEXICON)
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Artifact directory (default: <resource dir>/lexicon)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with an error when duplicates or collisions are found")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    compiled = load_or_compile(args.name, cache_dir=args.cache_dir)
+    for issue in compiled.issues:
+        print(issue)
+    print(f"{args.name}: {len(compiled.issues)} issues, hash {compiled.config_hash[:16]}, "
+          f"artifact {artifact_path(args.name, compiled.config_hash, args.cache_dir)}")
+    if args.strict and compiled.issues:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
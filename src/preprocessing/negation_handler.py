@@ -3,6 +3,7 @@ Negation Handler for Indonesian Text
 Handles negation patterns to preserve context
 """
 import re
+from typing import Dict, Iterable, List, Optional, Sequence
 
 NEGATION_WORDS = {
     'tidak': 'NEG',
@@ -16,40 +17,96 @@ NEGATION_WORDS = {
     'ga': 'NEG',
 }
 
+INTENSIFIERS = ('sangat', 'sekali', 'banget', 'amat', 'luar_biasa')
+
+_WORD_START = re.compile(r'\w')
+
+
+class NegationTagger:
+    """
+    Single-pass negation scope and intensifier tagger over a token stream
+
+    A negation word becomes ``NEG`` and the next ``scope`` tokens are
+    prefixed with ``NEG_``; a negation word inside the window starts a new
+    window. An intensifier is merged with the following word into
+    ``INTENS_<intensifier>_<word>``, unless that word is itself a negation
+    (``sangat tidak bagus`` stays a negated phrase).
+    """
+
+    def __init__(
+        self,
+        scope: int = 1,
+        negation_words: Optional[Dict[str, str]] = None,
+        intensifiers: Optional[Iterable[str]] = None,
+        tag_negation: bool = True,
+        tag_intensifiers: bool = True,
+    ):
+        self.scope = max(0, scope)
+        self.negation_words = {
+            word.lower(): tag
+            for word, tag in (NEGATION_WORDS if negation_words is None else negation_words).items()
+        } if tag_negation else {}
+        self.intensifiers = {
+            word.lower() for word in (INTENSIFIERS if intensifiers is None else intensifiers)
+        } if tag_intensifiers else set()
+
+    def tag(self, tokens: Sequence[str]) -> List[str]:
+        """Tag one tokenized text"""
+        negations = self.negation_words
+        intensifiers = self.intensifiers
+        is_word = _WORD_START.match
+        result = []
+        remaining = 0
+        i = 0
+        n = len(tokens)
+        while i < n:
+            token = tokens[i]
+            lower = token.lower()
+            if lower in negations:
+                result.append(negations[lower])
+                remaining = self.scope
+            elif remaining:
+                result.append(f"NEG_{token}")
+                remaining -= 1
+            elif (
+                lower in intensifiers
+                and i + 1 < n
+                and is_word(tokens[i + 1])
+                and tokens[i + 1].lower() not in negations
+            ):
+                result.append(f"INTENS_{lower}_{tokens[i + 1]}")
+                i += 1
+            else:
+                result.append(token)
+            i += 1
+        return result
+
+    def tag_batch(self, batch: Iterable[Sequence[str]]) -> List[List[str]]:
+        """Tag a batch of pre-tokenized texts"""
+        tag = self.tag
+        return [tag(tokens) for tokens in batch]
+
+    def tag_text(self, text: str) -> str:
+        """Tag a whitespace-separated text"""
+        return ' '.join(self.tag(text.split()))
+
+
+_NEGATION_TAGGER = NegationTagger(tag_intensifiers=False)
+_INTENSIFIER_TAGGER = NegationTagger(tag_negation=False)
+_DEFAULT_TAGGER = NegationTagger()
+
+
 def handle_negation(text: str) -> str:
     """
     Handle negation by prefixing negation marker to following words
-    Example: 'tidak bagus' -> 'NEG_bagus'
+    Example: 'tidak bagus' -> 'NEG NEG_bagus'
     """
-    words = text.split()
-    result = []
-    
-    for i, word in enumerate(words):
-        lower_word = word.lower()
-        
-        if lower_word in NEGATION_WORDS:
-            result.append(NEGATION_WORDS[lower_word])
-            if i + 1 < len(words):
-                next_word = words[i + 1]
-                result.append(f"NEG_{next_word}")
-                words[i + 1] = None
-        elif word is not None:
-            result.append(word)
-    
-    return ' '.join([w for w in result if w is not None])
+    return _NEGATION_TAGGER.tag_text(text)
 
 def handle_intensifiers(text: str) -> str:
     """Handle intensifiers like 'sangat', 'sekali', 'banget'"""
-    intensifiers = ['sangat', 'sekali', 'banget', 'amat', 'luar_biasa']
-    
-    for intensifier in intensifiers:
-        pattern = rf'\b{intensifier}\s+(\w+)'
-        text = re.sub(pattern, rf'INTENS_{intensifier}_\1', text, flags=re.IGNORECASE)
-    
-    return text
+    return _INTENSIFIER_TAGGER.tag_text(text)
 
 def process_negation_intensifiers(text: str) -> str:
     """Process both negation and intensifiers"""
-    text = handle_negation(text)
-    text = handle_intensifiers(text)
-    return text
+    return _DEFAULT_TAGGER.tag_text(text)
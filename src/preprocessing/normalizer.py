@@ -2,19 +2,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Sequence, Set
+from typing import Dict, Iterable, List, Sequence, Set
 
-import nltk
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import (
-    StopWordRemoverFactory,
-)
+from .resources import get_registry
+from .stem_cache import PersistentStemCache
 
 
 class TextNormalizer:
     """Remove stopwords, apply stemming, and normalize Indonesian tokens."""
 
-    def __init__(self, extra_stopwords: Sequence[str] | None = None):
+    def __init__(
+        self,
+        extra_stopwords: Sequence[str] | None = None,
+        stem_cache_path: str | None = None,
+        stem_cache_max_entries: int = 200_000,
+        stem_cache_read_only: bool = False,
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
@@ -26,32 +29,31 @@ class TextNormalizer:
             self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
-        self.stemmer = StemmerFactory().create_stemmer()
-        self.stopwords = self._load_stopwords(extra_stopwords)
+        registry = get_registry()
+        self.stemmer = registry.stemmer()
+        self.stopwords = self._load_stopwords(registry, extra_stopwords)
         self._stem_cache = {}  # Cache untuk speed up
+        self.persistent_cache = (
+            PersistentStemCache(
+                stem_cache_path,
+                max_entries=stem_cache_max_entries,
+                read_only=stem_cache_read_only,
+            )
+            if stem_cache_path
+            else None
+        )
+        self.stem_calls = 0
 
-    def _load_stopwords(self, extra: Sequence[str] | None) -> Set[str]:
-        stopwords: Set[str] = set()
-
-        stop_factory = StopWordRemoverFactory()
-        stopwords.update(stop_factory.get_stop_words())
-
-        try:
-            nltk.data.find("corpora/stopwords")
-        except LookupError:
-            self.logger.info("Downloading NLTK stopwords corpus")
-            nltk.download("stopwords")
-
-        try:
-            from nltk.corpus import stopwords as nltk_stopwords
+    def _load_stopwords(self, registry, extra: Sequence[str] | None) -> Set[str]:
+        stopwords: Set[str] = set(registry.sastrawi_stopwords())
 
-            stopwords.update(nltk_stopwords.words("indonesian"))
-        except LookupError:
+        nltk_words = registry.nltk_stopwords("indonesian")
+        if nltk_words is None:
             self.logger.warning(
                 "NLTK Indonesian stopwords unavailable; proceeding with Sastrawi set"
             )
-        except Exception as exc:
-            self.logger.error("Failed loading NLTK stopwords: %s", exc)
+        else:
+            stopwords.update(nltk_words)
 
         if extra:
             stopwords.update(word.lower() for word in extra)
@@ -64,9 +66,36 @@ class TextNormalizer:
     def stem_word(self, token: str) -> str:
         if not token:
             return ""
-        if token not in self._stem_cache:
-            self._stem_cache[token] = self.stemmer.stem(token)
-        return self._stem_cache[token]
+        stem = self._stem_cache.get(token)
+        if stem is not None:
+            return stem
+
+        if self.persistent_cache is not None:
+            stem = self.persistent_cache.get(token)
+        if stem is None:
+            stem = self.stemmer.stem(token)
+            self.stem_calls += 1
+            if self.persistent_cache is not None:
+                self.persistent_cache.put(token, stem)
+
+        self._stem_cache[token] = stem
+        return stem
+
+    def flush_stem_cache(self) -> None:
+        """Persist newly stemmed tokens to the on-disk stem cache."""
+        if self.persistent_cache is not None:
+            self.persistent_cache.flush()
+
+    def stem_cache_stats(self) -> Dict[str, float]:
+        stats: Dict[str, float] = {
+            "memory_entries": len(self._stem_cache),
+            "stemmer_calls": self.stem_calls,
+        }
+        if self.persistent_cache is not None:
+            stats.update(
+                {f"persistent_{key}": value for key, value in self.persistent_cache.stats().items()}
+            )
+        return stats
 
     def stem_tokens(self, tokens: Iterable[str]) -> List[str]:
         return [self.stem_word(token) for token in tokens]
@@ -5,9 +5,18 @@ WITH STEMMED KEYWORD MATCHING for better coverage
 """
 
 import re
-from typing import Dict, List, Any, Tuple
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Any, Tuple, Union
+import pandas as pd
 from nltk.tokenize import word_tokenize
+from src.preprocessing.resources import get_registry
+from src.preprocessing.document import AnalyzedDocument
+from src.preprocessing.lexicon_compiler import (
+    OPTIMIZED_LEXICON,
+    compile_lexicon,
+    load_or_compile
+)
 from config.sentiment_config_v2_optimized import (
     CORE_SENTIMENT,
     TARGET_KRITIK,
@@ -17,6 +26,21 @@ from config.sentiment_config_v2_optimized import (
     CONFIG_METADATA
 )
 
+# Worker-local batch scorer, built once per process by _init_worker
+_WORKER_SCORER = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Build this worker's own labeler and batch scorer (lexicon loaded once)"""
+    global _WORKER_SCORER
+    from src.preprocessing.batch_lexicon_scorer import BatchLexiconScorer
+    _WORKER_SCORER = BatchLexiconScorer(OptimizedSentimentLabeler(**config))
+
+
+def _label_chunk(args: Tuple[List[Any], bool]) -> pd.DataFrame:
+    texts, keywords = args
+    return _WORKER_SCORER.score(texts, keywords=keywords)
+
 
 class OptimizedSentimentLabeler:
     """
@@ -27,11 +51,24 @@ class OptimizedSentimentLabeler:
     e.g., "menyerang", "penyerangan", "diserang" all match "serang"
     """
     
-    def __init__(self):
-        """Initialize labeler with 5-layer config and stemmer"""
-        # Initialize Sastrawi stemmer
-        factory = StemmerFactory()
-        self.stemmer = factory.create_stemmer()
+    def __init__(self, lexicon_cache: bool = True, lexicon_cache_dir: str = None):
+        """
+        Initialize labeler with 5-layer config and stemmer
+        
+        Args:
+            lexicon_cache: Load the compiled lexicon (pre-stemmed keywords and
+                matcher) from its config-hash artifact, compiling it on a miss
+            lexicon_cache_dir: Artifact directory (default: <resource dir>/lexicon)
+        """
+        # Constructor arguments, replayed by label_batch worker processes
+        self.config = {'lexicon_cache': lexicon_cache, 'lexicon_cache_dir': lexicon_cache_dir}
+        self._batch_scorer = None
+        
+        # Shared Sastrawi stemmer (built once per process)
+        self.stemmer = get_registry().stemmer()
+        self._punkt_missing = False
+        # stem_text of single stems, for documents that are already stemmed
+        self._unit_stems: Dict[str, str] = {}
         
         self.core_sentiment = CORE_SENTIMENT
         self.target_kritik = TARGET_KRITIK
@@ -48,9 +85,16 @@ class OptimizedSentimentLabeler:
             'layer5_constructive': self.constructiveness
         }
         
-        # Pre-stem all keywords for faster matching
-        self.stemmed_keywords_cache = {}
-        self._prepare_stemmed_keywords()
+        # Pre-stemmed keywords and the single-pass automaton over all layers
+        if lexicon_cache:
+            self.compiled_lexicon = load_or_compile(
+                OPTIMIZED_LEXICON, cache_dir=lexicon_cache_dir, stemmer=self.stemmer
+            )
+        else:
+            self.compiled_lexicon = compile_lexicon(OPTIMIZED_LEXICON, stemmer=self.stemmer)
+        self.stemmed_keywords_cache = self.compiled_lexicon.stemmed_keywords
+        self.keyword_automaton = self.compiled_lexicon.structures['automaton']
+        self.layer_keyword_stems = self.compiled_lexicon.structures['layer_keyword_stems']
         
         print(f"✅ Initialized OptimizedSentimentLabeler")
         print(f"   Framework: {CONFIG_METADATA['framework_name']}")
@@ -58,18 +102,25 @@ class OptimizedSentimentLabeler:
         print(f"   Total Layers: {CONFIG_METADATA['total_layers']}")
         print(f"   Stemmed Matching: ENABLED")
         print(f"   Cached Keywords: {len(self.stemmed_keywords_cache)}")
+        print(f"   Lexicon: {self.compiled_lexicon.config_hash[:16]}")
     
-    def _prepare_stemmed_keywords(self):
-        """Pre-stem all keywords to avoid repeated stemming during matching"""
-        for layer_name, layer_cats in self.all_categories.items():
-            for cat_name, config in layer_cats.items():
-                keywords = config.get('keywords', [])
-                for keyword in keywords:
-                    if keyword not in self.stemmed_keywords_cache:
-                        # Stem each word in the keyword
-                        tokens = str(keyword).lower().split()
-                        stemmed = ' '.join([self.stemmer.stem(token) for token in tokens])
-                        self.stemmed_keywords_cache[keyword] = stemmed
+    def stem_text(self, text: str) -> str:
+        """Lowercase, tokenize and stem text the way keywords are matched against"""
+        text_lower = text.lower()
+        if self._punkt_missing:
+            return text_lower
+        try:
+            tokens = word_tokenize(text_lower)
+            stemmed_tokens = [self.stemmer.stem(token) for token in tokens]
+            stemmed_text = ' '.join(stemmed_tokens)
+        except LookupError:
+            # punkt is not installed: every later call would fail the same way
+            self._punkt_missing = True
+            stemmed_text = text_lower
+        except:
+            # Fallback if tokenization fails
+            stemmed_text = text_lower
+        return stemmed_text
     
     def match_keywords(self, text: str, keywords: List[str]) -> Tuple[int, List[str]]:
         """
@@ -90,14 +141,7 @@ class OptimizedSentimentLabeler:
             return 0, []
         
         # Tokenize and stem input text
-        text_lower = text.lower()
-        try:
-            tokens = word_tokenize(text_lower)
-            stemmed_tokens = [self.stemmer.stem(token) for token in tokens]
-            stemmed_text = ' '.join(stemmed_tokens)
-        except:
-            # Fallback if tokenization fails
-            stemmed_text = text_lower
+        stemmed_text = self.stem_text(text)
         
         matched = []
         
@@ -127,14 +171,29 @@ class OptimizedSentimentLabeler:
                 'confidence': float
             }
         """
+        matches = {
+            category_name: self.match_keywords(text, config.get('keywords', []))
+            for category_name, config in layer_categories.items()
+        }
+        return self._score_layer(layer_categories, matches)
+    
+    def _match_layer(self, layer_name: str, present: set) -> Dict[str, Tuple[int, List[str]]]:
+        """(match_count, matched_keywords) per category from a set of found stems"""
+        matches = {}
+        for category_name, keyword_stems in self.layer_keyword_stems[layer_name].items():
+            matched = [keyword for keyword, stem in keyword_stems if stem in present]
+            matches[category_name] = (len(matched), matched)
+        return matches
+    
+    def _score_layer(self, layer_categories: Dict, matches: Dict[str, Tuple[int, List[str]]]) -> Dict:
+        """Pick the best category of a layer from its keyword matches"""
         scores = {}
         matches_detail = {}
         
         for category_name, config in layer_categories.items():
-            keywords = config.get('keywords', [])
             weight = config.get('weight', 1.0)
             
-            match_count, matched_keywords = self.match_keywords(text, keywords)
+            match_count, matched_keywords = matches[category_name]
             
             if match_count > 0:
                 # Score = match_count * weight
@@ -165,43 +224,60 @@ class OptimizedSentimentLabeler:
                 'all_matches': {}
             }
     
-    def label_text(self, text: str) -> Dict[str, Any]:
+    def label_text(self, text: str, use_automaton: bool = True) -> Dict[str, Any]:
         """
         Apply all 5 layers to text
         
+        The text is stemmed once and every layer's keywords are found in a
+        single automaton pass. ``use_automaton=False`` runs the original
+        per-category ``label_layer`` path, which gives identical labels.
+        
         Returns comprehensive labeling with all layers
         """
         if not text or not isinstance(text, str):
             return self._get_default_labels()
         
+        if use_automaton:
+            return self._label_stemmed(self.stem_text(text))
+        return self._combine_layers([
+            self.label_layer(text, categories)
+            for categories in self.all_categories.values()
+        ])
+    
+    def _label_stemmed(self, stemmed_text: str) -> Dict[str, Any]:
+        """All 5 layers from one automaton pass over already stemmed text"""
+        present = self.keyword_automaton.find(stemmed_text)
+        return self._combine_layers([
+            self._score_layer(categories, self._match_layer(layer_name, present))
+            for layer_name, categories in self.all_categories.items()
+        ])
+    
+    def _combine_layers(self, layers: List[Dict]) -> Dict[str, Any]:
+        """Flatten the 5 layer results into the label record"""
+        layer1, layer2, layer3, layer4, layer5 = layers
         results = {}
         
         # Layer 1: Core Sentiment
-        layer1 = self.label_layer(text, self.core_sentiment)
         results['core_sentiment'] = layer1['label']
         results['core_sentiment_score'] = layer1['score']
         results['core_sentiment_confidence'] = layer1['confidence']
         
         # Layer 2: Target Kritik (WHO to blame)
-        layer2 = self.label_layer(text, self.target_kritik)
         results['target_kritik'] = layer2['label']
         results['target_score'] = layer2['score']
         results['target_confidence'] = layer2['confidence']
         
         # Layer 3: Root Cause (WHY failed)
-        layer3 = self.label_layer(text, self.root_cause)
         results['root_cause'] = layer3['label']
         results['cause_score'] = layer3['score']
         results['cause_confidence'] = layer3['confidence']
         
         # Layer 4: Time Perspective (WHEN to fix)
-        layer4 = self.label_layer(text, self.time_perspective)
         results['time_perspective'] = layer4['label']
         results['time_score'] = layer4['score']
         results['time_confidence'] = layer4['confidence']
         
         # Layer 5: Constructiveness (HOW valuable)
-        layer5 = self.label_layer(text, self.constructiveness)
         results['constructiveness'] = layer5['label']
         results['constructive_score'] = layer5['score']
         results['constructive_confidence'] = layer5['confidence']
@@ -254,6 +330,102 @@ class OptimizedSentimentLabeler:
         
         return results
     
+    def label_document(self, document: AnalyzedDocument) -> Dict[str, Any]:
+        """
+        Apply all 5 layers to an analyzed document
+        
+        The automaton runs over the document's stems, so the comment is not
+        tokenized or stemmed again. Each stem still goes through
+        ``stem_text`` once per distinct stem (memoized), which keeps the
+        labels identical to ``label_text(document.normalized_text)``.
+        """
+        if not document.stems:
+            return self.label_text(document.normalized_text)
+        
+        units = []
+        for stem in document.stems:
+            unit = self._unit_stems.get(stem)
+            if unit is None:
+                unit = self._unit_stems[stem] = self.stem_text(stem)
+            if unit:
+                units.append(unit)
+        return self._label_stemmed(' '.join(units))
+    
+    def label_batch(
+        self,
+        texts: Iterable[str],
+        workers: int = 1,
+        chunk_size: int = 5000,
+        progress: Union[bool, Callable[[int, int], None]] = False,
+        keywords: bool = True
+    ) -> pd.DataFrame:
+        """
+        Label many texts at once; one row per text with the ``label_text`` fields as columns
+        
+        Texts are split into chunks of ``chunk_size`` and each chunk is scored
+        column-wise by ``BatchLexiconScorer`` (same labels as ``label_text``).
+        With ``workers > 1`` (``0`` = all CPUs) chunks fan out to a process
+        pool whose workers each build a labeler once from ``self.config``, so
+        in-memory edits to this labeler's lexicon are not seen by workers.
+        
+        Args:
+            texts: Comments (list or Series; a Series keeps its index)
+            workers: Worker processes
+            chunk_size: Texts per chunk
+            progress: True to print progress per chunk, or a ``callback(done, total)``
+            keywords: Also build the ``all_matched_keywords`` column
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = list(texts)
+        total = len(texts)
+        chunk_size = max(1, chunk_size)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        chunks = [(texts[i:i + chunk_size], keywords) for i in range(0, total, chunk_size)]
+        
+        if progress is True:
+            def report(done: int, total: int) -> None:
+                print(f"   Labeled {done:,} / {total:,} comments ({done / total * 100:.1f}%)")
+        else:
+            report = progress or None
+        
+        frames = []
+        done = 0
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(self.config,)
+            ) as executor:
+                for frame in executor.map(_label_chunk, chunks):
+                    frames.append(frame)
+                    done += len(frame)
+                    if report:
+                        report(done, total)
+        else:
+            if self._batch_scorer is None:
+                from src.preprocessing.batch_lexicon_scorer import BatchLexiconScorer
+                self._batch_scorer = BatchLexiconScorer(self)
+            for chunk, _ in chunks:
+                frames.append(self._batch_scorer.score(chunk, keywords=keywords))
+                done += len(chunk)
+                if report:
+                    report(done, total)
+        
+        if not frames:
+            return self._empty_batch(keywords)
+        result = pd.concat(frames, ignore_index=True)
+        if index is not None:
+            result.index = index
+        return result
+    
+    def _empty_batch(self, keywords: bool) -> pd.DataFrame:
+        """Empty batch result with the label_text columns"""
+        columns = list(self._get_default_labels())
+        if not keywords:
+            columns.remove('all_matched_keywords')
+        return pd.DataFrame(columns=columns)
+    
     def _get_default_labels(self) -> Dict[str, Any]:
         """Return default labels for empty/invalid text"""
         return {
@@ -2,15 +2,41 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from .document import AnalyzedDocument
+from .instrumentation import PipelineProfiler
 from .normalizer import TextNormalizer
+from .record_cache import ProcessedRecordCache, fingerprint
 from .sentiment_labeler import SentimentLexiconLabeler
 from .text_cleaner import TextCleaner
 from .tokenizer import IndonesianTokenizer
 
+# Worker-local preprocessor, built once per process by _init_worker
+_WORKER_PREPROCESSOR: Optional["TextPreprocessor"] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """Build and warm this worker's own cleaner, tokenizer, normalizer and labeler."""
+    global _WORKER_PREPROCESSOR
+    _WORKER_PREPROCESSOR = TextPreprocessor(**config)
+    _WORKER_PREPROCESSOR.warm_up()
+
+
+def _process_chunk(texts: List[str]) -> Tuple[List[Dict], Optional[Dict[str, Any]]]:
+    records = [_WORKER_PREPROCESSOR.process_text(text) for text in texts]
+    _WORKER_PREPROCESSOR.flush_caches()
+    profiler = _WORKER_PREPROCESSOR.profiler
+    if not profiler.enabled:
+        return records, None
+    report = profiler.report()
+    profiler.reset()
+    return records, report
+
 
 class TextPreprocessor:
     """Combine cleaning, tokenization, normalization, and labeling."""
@@ -22,6 +48,10 @@ class TextPreprocessor:
         remove_stopwords: bool = True,
         extra_stopwords: Optional[List[str]] = None,
         enable_labeling: bool = True,
+        stem_cache_path: Optional[str] = None,
+        record_cache_path: Optional[str] = None,
+        record_cache_size: int = 50_000,
+        profile: bool = False,
     ):
         self.logger = logging.getLogger(self.__class__.__name__)
         if not self.logger.handlers:
@@ -34,25 +64,115 @@ class TextPreprocessor:
             self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
+        self.config: Dict[str, Any] = {
+            "min_tokens": min_tokens,
+            "remove_stopwords": remove_stopwords,
+            "extra_stopwords": extra_stopwords,
+            "enable_labeling": enable_labeling,
+            "stem_cache_path": stem_cache_path,
+            "record_cache_path": record_cache_path,
+            "record_cache_size": record_cache_size,
+            "profile": profile,
+        }
         self.min_tokens = max(1, min_tokens)
         self.cleaner = TextCleaner()
-        self.tokenizer = IndonesianTokenizer()
-        self.normalizer = TextNormalizer(extra_stopwords=extra_stopwords)
+        self.compiled_cleaner = self.cleaner.compile(indonesian=True)
+        self.profiler = PipelineProfiler(enabled=profile)
+        if profile:
+            self.compiled_cleaner.profiler = self.profiler
+        self.tokenizer = IndonesianTokenizer(mode="fast")
+        self.normalizer = TextNormalizer(
+            extra_stopwords=extra_stopwords,
+            stem_cache_path=stem_cache_path,
+        )
         self.labeler = SentimentLexiconLabeler() if enable_labeling else None
         self.remove_stopwords = remove_stopwords
+        self.record_cache = (
+            ProcessedRecordCache(
+                self._record_fingerprint(),
+                max_entries=record_cache_size,
+                path=record_cache_path,
+            )
+            if record_cache_size > 0 or record_cache_path
+            else None
+        )
+
+    def _record_fingerprint(self) -> str:
+        """Everything after cleaning that decides what a record looks like."""
+        labeler = None
+        if self.labeler:
+            labeler = {
+                "lexicon": self.labeler.lexicon,
+                "min_hits": self.labeler.min_hits,
+                "min_score_threshold": self.labeler.min_score_threshold,
+            }
+        return fingerprint(
+            "TextPreprocessor",
+            self.min_tokens,
+            self.remove_stopwords,
+            sorted(self.normalizer.stopwords),
+            labeler,
+        )
+
+    def flush_caches(self) -> None:
+        """Persist new stems and processed records to their on-disk stores."""
+        self.normalizer.flush_stem_cache()
+        if self.record_cache is not None:
+            self.record_cache.flush()
+
+    def warm_up(self) -> int:
+        """Pre-stem the single-word lexicon keywords so the stem cache starts warm."""
+        if not self.labeler:
+            return 0
+        words = {
+            keyword
+            for meta in self.labeler.lexicon.values()
+            for keyword in meta["keywords"]
+            if " " not in keyword
+        }
+        self.normalizer.stem_tokens(sorted(words))
+        return len(words)
 
     def process_text(self, text: str) -> Dict:
-        cleaned = self.cleaner.clean_text(text)
-        cleaned = self.cleaner.clean_indonesian_text(cleaned)
-        tokens = self.tokenizer.tokenize(cleaned)
+        cleaned = self.compiled_cleaner.clean(text)
+        if self.record_cache is None:
+            return self._process_clean_text(cleaned)
 
-        if self.remove_stopwords:
-            tokens_no_stop = self.normalizer.remove_stopwords(tokens)
+        record = self.record_cache.get(cleaned)
+        if record is None:
+            self.profiler.count("record_cache", "misses")
+            record = self._process_clean_text(cleaned)
+            self.record_cache.put(cleaned, record)
         else:
-            tokens_no_stop = tokens
+            self.profiler.count("record_cache", "hits")
+        return record
+
+    def analyze(self, text: str) -> AnalyzedDocument:
+        """Clean, tokenize and stem a comment once and return it as a shared document."""
+        return AnalyzedDocument.from_record(text or "", self.process_text(text))
+
+    def analyze_batch(self, texts: List[str]) -> List[AnalyzedDocument]:
+        return [self.analyze(text) for text in texts]
+
+    def _process_clean_text(self, cleaned: str) -> Dict:
+        stage = self.profiler.stage
+        with stage("tokenize"):
+            tokens = self.tokenizer.tokenize(cleaned)
 
-        stemmed_tokens = self.normalizer.stem_tokens(tokens_no_stop)
-        stemmed_tokens = [tok for tok in stemmed_tokens if tok]
+        with stage("stopword_removal"):
+            if self.remove_stopwords:
+                tokens_no_stop = self.normalizer.remove_stopwords(tokens)
+            else:
+                tokens_no_stop = tokens
+
+        stemmer_calls = self.normalizer.stem_calls
+        with stage("stemming"):
+            stemmed_tokens = self.normalizer.stem_tokens(tokens_no_stop)
+            stemmed_tokens = [tok for tok in stemmed_tokens if tok]
+        if self.profiler.enabled:
+            misses = self.normalizer.stem_calls - stemmer_calls
+            self.profiler.count("stemming", "cache_hits", len(tokens_no_stop) - misses)
+            self.profiler.count("stemming", "cache_misses", misses)
 
         if len(stemmed_tokens) < self.min_tokens:
             return {
@@ -76,10 +196,11 @@ class TextPreprocessor:
         matched_categories: List[Dict] = []
 
         if self.labeler:
-            label_info = self.labeler.label_text(
-                normalized_text,
-                tokens=stemmed_tokens,
-            )
+            with stage("labeling"):
+                label_info = self.labeler.label_text(
+                    normalized_text,
+                    tokens=stemmed_tokens,
+                )
             sentiment_label = label_info.get("label", "unknown")
             sentiment_layer = label_info.get("layer", "unknown")
             sentiment_score = float(label_info.get("score", 0.0))
@@ -105,19 +226,39 @@ class TextPreprocessor:
         text_column: str = "text",
         drop_short: bool = True,
         batch_size: int = 1000,
+        workers: int = 1,
     ) -> pd.DataFrame:
-        """Process an entire dataframe and return augmented version."""
+        """Process an entire dataframe and return augmented version.
+
+        With ``workers > 1`` (or ``workers <= 0`` for all cores) the texts are
+        split into ``batch_size`` chunks and processed in a process pool; each
+        worker keeps its own components and stem cache across chunks.
+        """
         if text_column not in df.columns:
             raise ValueError(f"Column '{text_column}' not found in dataframe")
 
-        processed_records: List[Dict] = []
-        total = len(df)
-        
-        for idx, text in enumerate(df[text_column].fillna(""), 1):
-            if idx % 500 == 0 or idx == total:
-                cache_size = len(self.normalizer._stem_cache) if hasattr(self.normalizer, '_stem_cache') else 0
-                print(f"Processing: {idx}/{total} ({idx/total*100:.1f}%) | Cache: {cache_size} words", flush=True)
-            processed_records.append(self.process_text(text))
+        texts = df[text_column].fillna("").tolist()
+        batch_size = max(1, batch_size)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
+        if workers > 1 and len(texts) > batch_size:
+            processed_records = self._process_parallel(texts, batch_size, workers)
+        else:
+            processed_records = []
+            total = len(texts)
+            for start in range(0, total, batch_size):
+                batch = texts[start:start + batch_size]
+                processed_records.extend(self.process_text(text) for text in batch)
+                self.logger.info(
+                    "Processed %d/%d (%.1f%%) | Cache: %d words | Record hits: %.1f%%",
+                    len(processed_records),
+                    total,
+                    len(processed_records) / total * 100,
+                    len(self.normalizer._stem_cache),
+                    self.record_cache_stats().get("hit_rate", 0.0) * 100,
+                )
+            self.flush_caches()
 
         processed_df = pd.DataFrame(processed_records)
         result = pd.concat([df.reset_index(drop=True), processed_df], axis=1)
@@ -127,3 +268,42 @@ class TextPreprocessor:
             result = result[mask]
 
         return result.reset_index(drop=True)
+
+    def record_cache_stats(self) -> Dict[str, float]:
+        if self.record_cache is None:
+            return {}
+        return self.record_cache.stats()
+
+    def _process_parallel(
+        self,
+        texts: List[str],
+        batch_size: int,
+        workers: int,
+    ) -> List[Dict]:
+        """Fan chunks out to a process pool and reassemble them in order."""
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        total = len(texts)
+        processed_records: List[Dict] = []
+
+        self.logger.info(
+            "Processing %d texts in %d chunks with %d workers",
+            total,
+            len(chunks),
+            workers,
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as executor:
+            for records, report in executor.map(_process_chunk, chunks):
+                processed_records.extend(records)
+                self.profiler.merge(report)
+                self.logger.info(
+                    "Processed %d/%d (%.1f%%)",
+                    len(processed_records),
+                    total,
+                    len(processed_records) / total * 100,
+                )
+
+        return processed_records
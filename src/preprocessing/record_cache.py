@@ -0,0 +1,177 @@
+"""Memoization of whole-comment preprocessing results."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the shape of cached records changes
+RECORD_SCHEMA_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of the configuration that produced a cached record."""
+    payload = json.dumps([RECORD_SCHEMA_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ProcessedRecordCache:
+    """Bounded LRU of processed records with an optional SQLite store.
+
+    Records are keyed on the hash of the *cleaned* text plus a configuration
+    fingerprint. Cleaning already lowercases and collapses punctuation,
+    whitespace and repeated characters, so near-identical comments
+    ("Semangat Garuda!!!" / "semangat garuda !!") share one entry, and
+    everything downstream of cleaning (tokens, stems, labels) depends only
+    on that text. A different fingerprint (other stopwords, lexicon or
+    options) never sees stale entries.
+
+    Returned records are shallow copies; their list values are shared with
+    the cache and must not be mutated in place.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 50_000,
+        path: str | Path | None = None,
+        read_only: bool = False,
+        flush_every: int = 1000,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.namespace = namespace
+        self.max_entries = max(0, max_entries)
+        self.path = Path(path) if path else None
+        self.read_only = read_only
+        self.flush_every = max(1, flush_every)
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __getstate__(self) -> Dict:
+        # Connections and buffered rows are per process
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pid=None, _pending={})
+        return state
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def key(self, clean_text: str) -> str:
+        digest = hashlib.sha1()
+        digest.update(self.namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(clean_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        if self.read_only:
+            if not self.path.exists():
+                return None
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, record TEXT NOT NULL)"
+            )
+            conn.commit()
+
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def _remember(self, key: str, record: Dict[str, Any]) -> None:
+        if not self.max_entries:
+            return
+        self._memory[key] = record
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, clean_text: str) -> Optional[Dict[str, Any]]:
+        key = self.key(clean_text)
+        record = self._memory.get(key)
+        if record is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return dict(record)
+
+        serialized = self._pending.get(key)
+        if serialized is None:
+            conn = self._connect()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT record FROM records WHERE key = ?", (key,)
+                ).fetchone()
+                serialized = row[0] if row else None
+
+        if serialized is None:
+            self.misses += 1
+            return None
+
+        record = json.loads(serialized)
+        self._remember(key, record)
+        self.hits += 1
+        self.disk_hits += 1
+        return dict(record)
+
+    def put(self, clean_text: str, record: Dict[str, Any]) -> None:
+        key = self.key(clean_text)
+        self._remember(key, record)
+        if self.path is None or self.read_only:
+            return
+        self._pending[key] = json.dumps(record, ensure_ascii=False)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the on-disk store."""
+        if not self._pending or self.read_only:
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        with conn:
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO records (key, record) VALUES (?, ?)",
+                self._pending.items(),
+            )
+            self.writes += max(cursor.rowcount, 0)
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
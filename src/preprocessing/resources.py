@@ -0,0 +1,142 @@
+"""Process-wide registry for the NLP resources used by preprocessing components."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Optional, TypeVar
+
+import nltk
+
+T = TypeVar("T")
+
+DEFAULT_RESOURCE_DIR = "data/resources"
+
+
+class ResourceRegistry:
+    """Load stopword sets, the Sastrawi stemmer and NLTK data once per process.
+
+    Every resource is created lazily on first request and then shared, so
+    constructing several normalizers, tokenizers or labelers (or an API
+    replica) pays the startup cost only once. NLTK data is looked up in
+    ``<resource_dir>/nltk_data`` first; in offline mode nothing is ever
+    downloaded and missing resources are reported as unavailable.
+    """
+
+    def __init__(self, resource_dir: str | Path | None = None, offline: bool | None = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(
+                logging.Formatter(
+                    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+                )
+            )
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+        self.resource_dir = Path(
+            resource_dir or os.getenv("SENTIMENT_RESOURCE_DIR", DEFAULT_RESOURCE_DIR)
+        )
+        if offline is None:
+            offline = os.getenv("SENTIMENT_OFFLINE", "").lower() in ("1", "true", "yes")
+        self.offline = offline
+
+        self.nltk_data_dir = self.resource_dir / "nltk_data"
+        if str(self.nltk_data_dir) not in nltk.data.path:
+            nltk.data.path.insert(0, str(self.nltk_data_dir))
+
+        self._lock = threading.RLock()
+        self._resources: Dict[str, object] = {}
+        self._timings: Dict[str, float] = {}
+
+    def _get(self, key: str, loader: Callable[[], T]) -> T:
+        if key in self._resources:
+            return self._resources[key]  # type: ignore[return-value]
+        with self._lock:
+            if key not in self._resources:
+                start = time.perf_counter()
+                self._resources[key] = loader()
+                self._timings[key] = time.perf_counter() - start
+                self.logger.debug("Loaded %s in %.3fs", key, self._timings[key])
+        return self._resources[key]  # type: ignore[return-value]
+
+    def _find_or_download(self, resource: str) -> bool:
+        try:
+            nltk.data.find(resource)
+            return True
+        except LookupError:
+            pass
+
+        if self.offline:
+            self.logger.warning("NLTK resource %s not bundled and offline mode is on", resource)
+            return False
+
+        name = resource.rsplit("/", 1)[-1]
+        self.logger.info("Downloading NLTK resource: %s", name)
+        self.nltk_data_dir.mkdir(parents=True, exist_ok=True)
+        nltk.download(name, download_dir=str(self.nltk_data_dir), quiet=True)
+        try:
+            nltk.data.find(resource)
+            return True
+        except LookupError:
+            return False
+
+    def nltk_resource(self, resource: str) -> bool:
+        """Make sure an NLTK resource (e.g. ``tokenizers/punkt``) is available."""
+        return self._get(f"nltk:{resource}", lambda: self._find_or_download(resource))
+
+    def stemmer(self):
+        """Shared Sastrawi stemmer (its dictionary is built only once)."""
+        def load():
+            from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+            return StemmerFactory().create_stemmer()
+
+        return self._get("sastrawi:stemmer", load)
+
+    def sastrawi_stopwords(self) -> FrozenSet[str]:
+        def load():
+            from Sastrawi.StopWordRemover.StopWordRemoverFactory import (
+                StopWordRemoverFactory,
+            )
+
+            return frozenset(StopWordRemoverFactory().get_stop_words())
+
+        return self._get("sastrawi:stopwords", load)
+
+    def nltk_stopwords(self, language: str = "indonesian") -> Optional[FrozenSet[str]]:
+        """NLTK stopwords for a language, or None when the corpus is unavailable."""
+        def load():
+            if not self.nltk_resource("corpora/stopwords"):
+                return None
+            from nltk.corpus import stopwords as nltk_stopwords
+
+            try:
+                return frozenset(nltk_stopwords.words(language))
+            except (LookupError, OSError):
+                return None
+
+        return self._get(f"nltk:stopwords:{language}", load)
+
+    def startup_report(self) -> Dict[str, float]:
+        """Seconds spent loading each resource in this process."""
+        report = dict(self._timings)
+        report["total"] = sum(self._timings.values())
+        return report
+
+
+_REGISTRY: Optional[ResourceRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ResourceRegistry:
+    """Return the process-wide resource registry, creating it on first use."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ResourceRegistry()
+    return _REGISTRY
@@ -0,0 +1,166 @@
+"""
+Declarative Rule Engine untuk label unknown
+Heuristik keyword / negasi / tanda baca sebagai operasi kolom
+"""
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.trie_regex import SubstringFinder
+
+logger = logging.getLogger(__name__)
+
+Condition = Callable[[pd.DataFrame], pd.Series]
+Confidence = Union[float, Callable[[pd.DataFrame], pd.Series]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Satu aturan: baris yang memenuhi ``when`` (dan belum kena aturan
+    sebelumnya) diberi ``label``
+
+    ``when`` menerima DataFrame fitur (lihat ``KeywordRuleEngine.features``)
+    dan mengembalikan mask boolean.
+    """
+    name: str
+    when: Condition
+    label: str
+    confidence: Optional[Confidence] = None
+
+
+def always(features: pd.DataFrame) -> pd.Series:
+    """Kondisi fallback: cocok untuk setiap baris"""
+    return pd.Series(True, index=features.index)
+
+
+def polarity_rules(flip_on_negation: bool = True) -> List[Rule]:
+    """
+    Aturan dasar pos/neg yang dipakai semua varian cleanup
+
+    Keyword terbanyak menang; negasi di teks membalik polaritas. Grup
+    keyword harus bernama ``pos``, ``neg`` (dan ``negation`` jika
+    ``flip_on_negation``).
+    """
+    rules = []
+    if flip_on_negation:
+        rules.append(Rule('pos_negated', lambda f: (f.pos > 0) & (f.pos > f.neg) & (f.negation > 0), 'negative',
+                          confidence=lambda f: f.neg / np.maximum(f.pos + f.neg, 1)))
+    rules.append(Rule('pos', lambda f: (f.pos > 0) & (f.pos > f.neg), 'positive',
+                      confidence=lambda f: f.pos / np.maximum(f.pos + f.neg, 1)))
+    if flip_on_negation:
+        rules.append(Rule('neg_negated', lambda f: (f.neg > 0) & (f.neg > f.pos) & (f.negation > 0), 'positive',
+                          confidence=lambda f: f.pos / np.maximum(f.pos + f.neg, 1)))
+    rules.append(Rule('neg', lambda f: (f.neg > 0) & (f.neg > f.pos), 'negative',
+                      confidence=lambda f: f.neg / np.maximum(f.pos + f.neg, 1)))
+    return rules
+
+
+def tie_rules() -> List[Rule]:
+    """Jumlah keyword pos == neg > 0: tanda seru -> positive, selain itu neutral"""
+    return [
+        Rule('tie_exclamation', lambda f: (f.pos > 0) & (f.pos == f.neg) & f.has_exclamation, 'positive', 0.5),
+        Rule('tie', lambda f: (f.pos > 0) & (f.pos == f.neg), 'neutral', 0.5),
+    ]
+
+
+class KeywordRuleEngine:
+    """
+    Label ulang baris ``unknown`` dengan aturan berurutan (first match wins)
+
+    Semua teks unknown di-lowercase sekali, lalu setiap teks unik discan
+    sekali oleh ``SubstringFinder`` untuk semua grup keyword (semantik
+    ``kw in text``; keyword yang tercantum dua kali dihitung dua kali).
+    Hasilnya DataFrame fitur: ``<grup>`` (jumlah keyword), ``word_count``,
+    ``has_question``, ``has_exclamation``. Setiap aturan dievaluasi sekali
+    sebagai mask kolom atas seluruh subset unknown; baris yang tidak kena
+    aturan apa pun tetap dengan label lamanya.
+    """
+
+    def __init__(self, name: str, keyword_groups: Dict[str, Sequence[str]], rules: Sequence[Rule]):
+        self.name = name
+        self.keyword_groups = {group: list(keywords) for group, keywords in keyword_groups.items()}
+        self.rules = list(rules)
+
+        # keyword -> {grup: berapa kali tercantum}
+        self._keyword_groups: Dict[str, Dict[str, int]] = {}
+        for group, keywords in self.keyword_groups.items():
+            for keyword in keywords:
+                counts = self._keyword_groups.setdefault(keyword, {})
+                counts[group] = counts.get(group, 0) + 1
+        self._finder = SubstringFinder(self._keyword_groups)
+
+    def features(self, texts: pd.Series) -> pd.DataFrame:
+        """Fitur per teks (string yang sudah lowercase)"""
+        codes, uniques = pd.factorize(texts)
+        groups = list(self.keyword_groups)
+        group_index = {group: i for i, group in enumerate(groups)}
+        unique_counts = np.zeros((len(uniques), len(groups)), dtype=np.int64)
+        for row, text in enumerate(uniques):
+            for keyword in self._finder.find(text):
+                for group, count in self._keyword_groups[keyword].items():
+                    unique_counts[row, group_index[group]] += count
+
+        features = pd.DataFrame(unique_counts[codes], columns=groups, index=texts.index)
+        features['word_count'] = texts.str.split().str.len().to_numpy()
+        features['has_question'] = texts.str.contains('?', regex=False).to_numpy()
+        features['has_exclamation'] = texts.str.contains('!', regex=False).to_numpy()
+        return features
+
+    def label(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        Label, confidence dan nama aturan untuk setiap teks
+
+        Baris tanpa aturan yang cocok mendapat label/rule NaN.
+        """
+        features = self.features(texts)
+        n_rows = len(texts)
+        labels = np.full(n_rows, None, dtype=object)
+        names = np.full(n_rows, None, dtype=object)
+        confidence = np.full(n_rows, np.nan)
+        taken = np.zeros(n_rows, dtype=bool)
+        for rule in self.rules:
+            hit = np.asarray(rule.when(features), dtype=bool) & ~taken
+            if not hit.any():
+                continue
+            labels[hit] = rule.label
+            names[hit] = rule.name
+            if callable(rule.confidence):
+                confidence[hit] = np.asarray(rule.confidence(features), dtype=float)[hit]
+            elif rule.confidence is not None:
+                confidence[hit] = rule.confidence
+            taken |= hit
+
+        return pd.DataFrame(
+            {'label': labels, 'confidence': confidence, 'rule': names},
+            index=texts.index
+        )
+
+    def apply(self, df: pd.DataFrame, text_column: str = 'clean_text',
+              sentiment_column: str = 'core_sentiment') -> pd.DataFrame:
+        """Label ulang baris unknown di ``sentiment_column``; mengembalikan salinan df"""
+        df = df.copy()
+
+        unknown_mask = df[sentiment_column].str.lower().str.contains('unknown', na=False)
+        logger.info(f"{self.name}: {unknown_mask.sum()} unknown sentiments")
+
+        texts = df.loc[unknown_mask, text_column].map(str).str.lower()
+        result = self.label(texts)
+        matched = result['label'].notna()
+        df.loc[result.index[matched], sentiment_column] = result.loc[matched, 'label']
+
+        labeled_count = int(matched.sum())
+        logger.info(f"{self.name}: labeled {labeled_count}, kept unknown {len(result) - labeled_count}")
+        for rule_name, count in result.loc[matched, 'rule'].value_counts().items():
+            logger.info(f"   {rule_name}: {count}")
+        if result['confidence'].notna().any():
+            logger.info(f"{self.name}: avg confidence {result['confidence'].mean():.2f}")
+
+        return df
+
+
+# Export engine
+__all__ = ['Rule', 'KeywordRuleEngine', 'always', 'polarity_rules', 'tie_rules']
@@ -2,15 +2,33 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from config import sentiment_config
+import pandas as pd
+
+from .lexicon_compiler import (
+    NINE_LAYER_LEXICON,
+    build_keyword_index,
+    flatten_lexicon,
+    load_or_compile,
+    nine_layer_layers,
+)
+
+if TYPE_CHECKING:
+    from .document import AnalyzedDocument
 
 
 class SentimentLexiconLabeler:
     """Assign sentiment categories based on keyword matches per layer."""
 
-    def __init__(self, min_hits: int = 1, min_score_threshold: float = 0.5):
+    def __init__(
+        self,
+        min_hits: int = 1,
+        min_score_threshold: float = 0.5,
+        lexicon_cache: bool = True,
+        lexicon_cache_dir: str | None = None,
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
@@ -24,30 +42,24 @@ class SentimentLexiconLabeler:
 
         self.min_hits = min_hits
         self.min_score_threshold = min_score_threshold
-        self.lexicon = self._build_lexicon()
+        if lexicon_cache:
+            structures = load_or_compile(NINE_LAYER_LEXICON, cache_dir=lexicon_cache_dir).structures
+            self.lexicon = structures["lexicon"]
+            self.token_index = structures["token_index"]
+            self.phrase_index = structures["phrase_index"]
+        else:
+            self.lexicon = self._build_lexicon()
+            self.token_index, self.phrase_index = self._build_index()
         self.sentiment_groups = self._build_sentiment_groups()
 
     def _build_lexicon(self) -> Dict[str, Dict]:
-        lexicon: Dict[str, Dict] = {}
-        for attr in dir(sentiment_config):
-            if not attr.isupper():
-                continue
-            layer_value = getattr(sentiment_config, attr)
-            if not isinstance(layer_value, dict):
-                continue
-
-            for category, meta in layer_value.items():
-                if not isinstance(meta, dict):
-                    continue
-
-                keywords = [kw.lower() for kw in meta.get("keywords", []) if kw]
-                lexicon[category] = {
-                    "layer": attr.lower(),
-                    "keywords": keywords,
-                    "weight": float(meta.get("weight", 1.0)),
-                    "description": meta.get("description", ""),
-                }
-        return lexicon
+        return flatten_lexicon(nine_layer_layers())
+
+    def _build_index(
+        self,
+    ) -> Tuple[Dict[str, List[Tuple[str, int]]], List[Tuple[str, List[Tuple[str, int]]]]]:
+        """Keyword -> [(category, multiplicity)] for tokens, plus the phrase list."""
+        return build_keyword_index(self.lexicon)
 
     def _build_sentiment_groups(self) -> Dict[str, str]:
         """Map categories to sentiment polarity."""
@@ -66,20 +78,29 @@ class SentimentLexiconLabeler:
             groups[cat] = 'neutral'
         return groups
 
+    def label_document(self, document: AnalyzedDocument) -> Dict:
+        """Label an analyzed document using its stems (no re-tokenizing)."""
+        return self.label_text(document.normalized_text, tokens=list(document.stems))
+
     def label_text(self, text: str, tokens: List[str] | None = None) -> Dict:
         text_lower = (text or "").lower()
         token_list = [tok.lower() for tok in (tokens or text_lower.split()) if tok]
 
+        # Hits per category from the inverted index: O(tokens) lookups
+        # instead of one token_list.count per keyword
+        category_hits: Dict[str, int] = {}
+        token_index = self.token_index
+        for token, occurrences in Counter(token_list).items():
+            for category, multiplicity in token_index.get(token, ()):
+                category_hits[category] = category_hits.get(category, 0) + occurrences * multiplicity
+        for phrase, categories in self.phrase_index:
+            if phrase in text_lower:
+                for category, multiplicity in categories:
+                    category_hits[category] = category_hits.get(category, 0) + multiplicity
+
         matches: List[Tuple[str, float, int, Dict]] = []
         for category, meta in self.lexicon.items():
-            hit_count = 0
-            for keyword in meta["keywords"]:
-                if " " in keyword:
-                    if keyword in text_lower:
-                        hit_count += 1
-                else:
-                    hit_count += token_list.count(keyword)
-
+            hit_count = category_hits.get(category, 0)
             if hit_count >= self.min_hits:
                 score = hit_count * meta["weight"]
                 matches.append((category, score, hit_count, meta))
@@ -146,3 +167,24 @@ class SentimentLexiconLabeler:
             "sentiment_distribution": sentiment_counts,
             "matches": detailed_matches,
         }
+
+    def label_batch(
+        self,
+        texts: Iterable[str],
+        tokens: Optional[Iterable[List[str]]] = None,
+    ) -> pd.DataFrame:
+        """Label a column of texts (optionally with pre-tokenized stems).
+
+        Returns one row per text with the ``label_text`` fields as columns,
+        indexed like ``texts`` when it is a Series.
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        texts = ["" if not isinstance(text, str) else text for text in texts]
+        if tokens is None:
+            results = [self.label_text(text) for text in texts]
+        else:
+            results = [
+                self.label_text(text, tokens=list(toks) if toks is not None else None)
+                for text, toks in zip(texts, tokens)
+            ]
+        return pd.DataFrame(results, index=index)
@@ -0,0 +1,118 @@
+"""Single-pass slang and abbreviation normalization for Indonesian text."""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+# Default abbreviation dictionary. Identity entries are kept on purpose:
+# matching is case-insensitive, so they lowercase the matched word.
+DEFAULT_ABBREVIATIONS: Dict[str, str] = {
+    'yg': 'yang',
+    'ygga': 'yang',
+    'dgn': 'dengan',
+    'dg': 'dengan',
+    'tdk': 'tidak',
+    'gk': 'tidak',
+    'sdh': 'sudah',
+    'sdhkan': 'sudahkan',
+    'blm': 'belum',
+    'blmkan': 'belumlah',
+    'utk': 'untuk',
+    'krn': 'karena',
+    'karna': 'karena',
+    'bsk': 'bisa',
+    'bisa': 'bisa',
+    'jgn': 'jangan',
+    'jgnkan': 'jangan',
+    'dll': 'dan lain-lain',
+    'etc': 'dan lain-lain',
+    'wkt': 'waktu',
+    'skrg': 'sekarang',
+    'sekarang': 'sekarang',
+    'mrk': 'mereka',
+    'kita': 'kita',
+    'kami': 'kami',
+    'anda': 'anda',
+    'kalian': 'kalian',
+    'dia': 'dia',
+    'beliau': 'beliau',
+    'pd': 'pada',
+    'di': 'di',
+    'ke': 'ke',
+    'dari': 'dari',
+    'untuk': 'untuk',
+    'agar': 'agar',
+    'supaya': 'supaya'
+}
+
+
+class SlangNormalizer:
+    """
+    Replace slang words and abbreviations with their full forms.
+
+    The dictionary is compiled once into a lowercase lookup table and a
+    single word pattern, so each text is normalized in one scan regardless
+    of how many entries the dictionary holds.
+    """
+
+    def __init__(self, dictionary: Optional[Mapping[str, str]] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        entries = DEFAULT_ABBREVIATIONS if dictionary is None else dictionary
+        self.lookup: Dict[str, str] = {}
+        for word, replacement in entries.items():
+            word = str(word).strip()
+            if not word:
+                continue
+            if not re.fullmatch(r'\w+', word):
+                self.logger.warning("Skipping non-word dictionary entry: %r", word)
+                continue
+            self.lookup[word.lower()] = str(replacement)
+
+        self._word_pattern = re.compile(r'\w+')
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | Path,
+        include_defaults: bool = True,
+    ) -> "SlangNormalizer":
+        """
+        Build a normalizer from an external dictionary file
+
+        Supported formats are JSON objects (``{"yg": "yang"}``) and two-column
+        CSV/TSV files (``slang,formal``). Entries from the file override the
+        defaults when ``include_defaults`` is True.
+        """
+        path = Path(path)
+        entries: Dict[str, str] = dict(DEFAULT_ABBREVIATIONS) if include_defaults else {}
+
+        if path.suffix.lower() == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                entries.update(json.load(f))
+        else:
+            delimiter = '\t' if path.suffix.lower() in ('.tsv', '.txt') else ','
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.reader(f, delimiter=delimiter):
+                    if len(row) < 2 or row[0].startswith('#'):
+                        continue
+                    entries[row[0]] = row[1]
+
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.lookup)
+
+    def _replace(self, match: re.Match) -> str:
+        word = match.group(0)
+        return self.lookup.get(word.lower(), word)
+
+    def normalize(self, text: str) -> str:
+        """Normalize all dictionary words in a single pass over the text."""
+        if not text:
+            return text
+        return self._word_pattern.sub(self._replace, text)
@@ -0,0 +1,170 @@
+"""Persistent token -> stem dictionary shared between runs and processes."""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class PersistentStemCache:
+    """SQLite-backed stem table, loaded lazily and capped in size.
+
+    The table is read into memory on first lookup. Newly stemmed tokens are
+    buffered and written back in batches, so several worker processes can
+    share one file: readers never block each other and writers only touch
+    rows that are not there yet. Every flush stamps the rows it inserted or
+    hit with a new generation number; when the table grows past
+    ``max_entries`` the least recently used stems (oldest generation, then
+    fewest hits) are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 200_000,
+        read_only: bool = False,
+        flush_every: int = 1000,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.read_only = read_only
+        self.flush_every = max(1, flush_every)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._stems: Optional[Dict[str, str]] = None
+        self._pending: Dict[str, str] = {}
+        self._hit_counts: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> Dict:
+        # Connections and loaded tables are per process
+        state = self.__dict__.copy()
+        state.update(_conn=None, _pid=None, _stems=None, _pending={}, _hit_counts={})
+        return state
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        if self.read_only:
+            if not self.path.exists():
+                return None
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stems ("
+                "token TEXT PRIMARY KEY, stem TEXT NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+                "last_used INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(stems)")}
+            if "last_used" not in columns:
+                # Tables written before recency tracking: existing rows count as oldest
+                conn.execute("ALTER TABLE stems ADD COLUMN last_used INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS stems_recency ON stems (last_used, hits)")
+            conn.commit()
+
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def _load(self) -> Dict[str, str]:
+        if self._stems is not None and self._pid == os.getpid():
+            return self._stems
+
+        conn = self._connect()
+        if conn is None:
+            self._stems = {}
+        else:
+            self._stems = dict(conn.execute("SELECT token, stem FROM stems"))
+        self._pid = os.getpid()
+        self.logger.info("Loaded %d cached stems from %s", len(self._stems), self.path)
+        return self._stems
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def get(self, token: str) -> Optional[str]:
+        stem = self._load().get(token)
+        if stem is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._hit_counts[token] = self._hit_counts.get(token, 0) + 1
+        return stem
+
+    def put(self, token: str, stem: str) -> None:
+        self._load()[token] = stem
+        if self.read_only:
+            return
+        self._pending[token] = stem
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered stems and hit counts, then enforce the size cap."""
+        if self.read_only or not (self._pending or self._hit_counts):
+            return
+
+        conn = self._connect()
+        with conn:
+            (generation,) = conn.execute(
+                "SELECT COALESCE(MAX(last_used), 0) + 1 FROM stems"
+            ).fetchone()
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO stems (token, stem, last_used) VALUES (?, ?, ?)",
+                ((token, stem, generation) for token, stem in self._pending.items()),
+            )
+            self.writes += max(cursor.rowcount, 0)
+            conn.executemany(
+                "UPDATE stems SET hits = hits + ?, last_used = ? WHERE token = ?",
+                ((count, generation, token) for token, count in self._hit_counts.items()),
+            )
+            self._pending.clear()
+            self._hit_counts.clear()
+
+            (total,) = conn.execute("SELECT COUNT(*) FROM stems").fetchone()
+            overflow = total - self.max_entries
+            if overflow > 0:
+                evicted = [
+                    token
+                    for (token,) in conn.execute(
+                        "SELECT token FROM stems ORDER BY last_used ASC, hits ASC LIMIT ?",
+                        (overflow,),
+                    )
+                ]
+                conn.executemany(
+                    "DELETE FROM stems WHERE token = ?",
+                    ((token,) for token in evicted),
+                )
+                for token in evicted:
+                    self._stems.pop(token, None)
+                self.evictions += len(evicted)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._stems or {}),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
@@ -8,9 +8,14 @@ for Indonesian language text preprocessing.
 import re
 import string
 import logging
-from typing import List, Dict, Optional, Pattern
+from typing import List, Dict, Optional, Pattern, Tuple
 from urllib.parse import urlparse
 
+import pandas as pd
+
+from .compiled_cleaner import CompiledCleaner
+from .slang_normalizer import SlangNormalizer
+
 class TextCleaner:
     """
     Text Cleaner for Indonesian Language
@@ -18,10 +23,65 @@ class TextCleaner:
     This class handles various text cleaning operations including
     URL removal, mention removal, hashtag processing, etc.
     """
+
+    # Default cleaning options
+    DEFAULT_OPTIONS = {
+        'remove_urls': True,
+        'remove_mentions': True,
+        'process_hashtags': True,
+        'remove_emails': True,
+        'remove_phones': True,
+        'remove_numbers': True,
+        'remove_special_chars': True,
+        'remove_emojis': True,
+        'normalize_whitespace': True,
+        'convert_to_lowercase': True,
+        'remove_repeated_chars': True,
+        'remove_repeated_words': True,
+        'remove_excessive_punctuation': True
+    }
+
+    # Common Indonesian character variations
+    INDONESIAN_CHAR_MAP = {
+        'é': 'e',
+        'è': 'e',
+        'ë': 'e',
+        'á': 'a',
+        'à': 'a',
+        'â': 'a',
+        'ã': 'a',
+        'í': 'i',
+        'ì': 'i',
+        'î': 'i',
+        'ó': 'o',
+        'ò': 'o',
+        'ô': 'o',
+        'õ': 'o',
+        'ú': 'u',
+        'ù': 'u',
+        'û': 'u',
+        'ý': 'y',
+        'ÿ': 'y',
+        'ç': 'c',
+        'ñ': 'n',
+        'ß': 'ss'
+    }
     
-    def __init__(self):
-        """Initialize text cleaner with logging"""
+    def __init__(self, abbreviation_path: Optional[str] = None):
+        """
+        Initialize text cleaner with logging
+
+        Args:
+            abbreviation_path (str): Optional JSON/CSV slang dictionary that
+                extends the built-in Indonesian abbreviations
+        """
         self.logger = self._setup_logger()
+
+        # Abbreviation normalizer is compiled once and reused for every text
+        if abbreviation_path:
+            self.slang_normalizer = SlangNormalizer.from_file(abbreviation_path)
+        else:
+            self.slang_normalizer = SlangNormalizer()
         
         # Storage for compiled Indonesian regexes
         self.indonesian_patterns: Dict[str, Pattern[str]] = {}
@@ -37,6 +97,10 @@ class TextCleaner:
 
         # Compile regex patterns for efficiency
         self._compile_patterns()
+        self._char_table = str.maketrans(self.INDONESIAN_CHAR_MAP)
+
+        # Compiled pipelines keyed by option set
+        self._compiled_cleaners: Dict[tuple, CompiledCleaner] = {}
         
     def _setup_logger(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -135,26 +199,8 @@ class TextCleaner:
         if not text or not isinstance(text, str):
             return ""
         
-        # Default options
-        default_options = {
-            'remove_urls': True,
-            'remove_mentions': True,
-            'process_hashtags': True,
-            'remove_emails': True,
-            'remove_phones': True,
-            'remove_numbers': True,
-            'remove_special_chars': True,
-            'remove_emojis': True,
-            'normalize_whitespace': True,
-            'convert_to_lowercase': True,
-            'remove_repeated_chars': True,
-            'remove_repeated_words': True,
-            'remove_excessive_punctuation': True
-        }
-        
         # Merge with provided options
-        if options:
-            default_options.update(options)
+        default_options = dict(self.DEFAULT_OPTIONS, **options) if options else self.DEFAULT_OPTIONS
         
         cleaned_text = text
         
@@ -231,6 +277,32 @@ class TextCleaner:
             self.logger.error(f"Error cleaning text: {e}")
             return text
     
+    def compile(
+        self,
+        options: Optional[Dict] = None,
+        indonesian: bool = False,
+        parity_check: bool = False,
+    ) -> CompiledCleaner:
+        """
+        Get a cached, fused cleaning pipeline for an option set
+
+        Args:
+            options (Dict): Cleaning options (same keys as ``clean_text``)
+            indonesian (bool): Also apply ``clean_indonesian_text``
+            parity_check (bool): Verify every result against ``clean_text``
+
+        Returns:
+            CompiledCleaner: Pipeline whose ``clean`` output is identical
+            to the reference path
+        """
+        merged = dict(self.DEFAULT_OPTIONS, **(options or {}))
+        key = (tuple(sorted(merged.items())), indonesian, parity_check)
+        if key not in self._compiled_cleaners:
+            self._compiled_cleaners[key] = CompiledCleaner(
+                self, merged, indonesian=indonesian, parity_check=parity_check
+            )
+        return self._compiled_cleaners[key]
+    
     def _process_hashtags(self, text: str) -> str:
         """
         Process hashtags - remove # but keep the text
@@ -292,53 +364,7 @@ class TextCleaner:
         Returns:
             str: Text with normalized abbreviations
         """
-        abbreviations = {
-            'yg': 'yang',
-            'ygga': 'yang',
-            'dgn': 'dengan',
-            'dg': 'dengan',
-            'tdk': 'tidak',
-            'gk': 'tidak',
-            'sdh': 'sudah',
-            'sdhkan': 'sudahkan',
-            'blm': 'belum',
-            'blmkan': 'belumlah',
-            'utk': 'untuk',
-            'krn': 'karena',
-            'karna': 'karena',
-            'bsk': 'bisa',
-            'bisa': 'bisa',
-            'jgn': 'jangan',
-            'jgnkan': 'jangan',
-            'dll': 'dan lain-lain',
-            'dll': 'dan lain-lain',
-            'etc': 'dan lain-lain',
-            'wkt': 'waktu',
-            'skrg': 'sekarang',
-            'sekarang': 'sekarang',
-            'mrk': 'mereka',
-            'kita': 'kita',
-            'kami': 'kami',
-            'anda': 'anda',
-            'kalian': 'kalian',
-            'dia': 'dia',
-            'beliau': 'beliau',
-            'pd': 'pada',
-            'di': 'di',
-            'ke': 'ke',
-            'dari': 'dari',
-            'untuk': 'untuk',
-            'agar': 'agar',
-            'supaya': 'supaya'
-        }
-        
-        # Replace abbreviations
-        for abbr, full_form in abbreviations.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(abbr) + r'\b'
-            text = re.sub(pattern, full_form, text, flags=re.IGNORECASE)
-        
-        return text
+        return self.slang_normalizer.normalize(text)
     
     def _normalize_indonesian_characters(self, text: str) -> str:
         """
@@ -350,36 +376,7 @@ class TextCleaner:
         Returns:
             str: Text with normalized characters
         """
-        # Normalize common Indonesian character variations
-        char_map = {
-            'é': 'e',
-            'è': 'e',
-            'ë': 'e',
-            'á': 'a',
-            'à': 'a',
-            'â': 'a',
-            'ã': 'a',
-            'í': 'i',
-            'ì': 'i',
-            'î': 'i',
-            'ó': 'o',
-            'ò': 'o',
-            'ô': 'o',
-            'õ': 'o',
-            'ú': 'u',
-            'ù': 'u',
-            'û': 'u',
-            'ý': 'y',
-            'ÿ': 'y',
-            'ç': 'c',
-            'ñ': 'n',
-            'ß': 'ss'
-        }
-        
-        for char, replacement in char_map.items():
-            text = text.replace(char, replacement)
-        
-        return text
+        return text.translate(self._char_table)
     
     def get_cleaning_stats(self, original_text: str, cleaned_text: str) -> Dict:
         """
@@ -424,6 +421,35 @@ class TextCleaner:
         self.logger.info(f"Cleaned {len(texts)} texts")
         return cleaned_texts
     
+    def clean_column(
+        self,
+        texts: pd.Series,
+        options: Optional[Dict] = None,
+        indonesian: bool = False,
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Clean a whole text column at once
+        
+        Runs the same rules as ``clean_text`` as column-level regex passes
+        and reports short results through a mask instead of per-row warnings.
+        
+        Args:
+            texts (pd.Series): Column of texts to clean
+            options (Dict): Cleaning options
+            indonesian (bool): Also apply ``clean_indonesian_text``
+            
+        Returns:
+            Tuple[pd.Series, pd.Series]: Cleaned column and "too short" mask
+        """
+        if not isinstance(texts, pd.Series):
+            texts = pd.Series(list(texts), dtype=object)
+
+        cleaned, too_short = self.compile(options, indonesian=indonesian).clean_series(texts)
+        self.logger.info(
+            f"Cleaned {len(texts)} texts ({int(too_short.sum())} too short after cleaning)"
+        )
+        return cleaned, too_short
+    
     def validate_cleaned_text(self, text: str) -> bool:
         """
         Validate if cleaned text meets quality criteria
@@ -5,14 +5,36 @@ import logging
 import re
 from typing import Iterable, List
 
-import nltk
 from nltk.tokenize import word_tokenize
 
+from .resources import get_registry
+
+
+# Whole-word contractions that NLTK's Treebank rules split even in text that
+# has already been reduced to letters and spaces
+_TREEBANK_SPLITS = {
+    "cannot": 3,
+    "gimme": 3,
+    "gonna": 3,
+    "gotta": 3,
+    "lemme": 3,
+    "wanna": 3,
+}
+
 
 class IndonesianTokenizer:
-    """Word tokenizer with lightweight normalization for Indonesian text."""
+    """Word tokenizer with lightweight normalization for Indonesian text.
+
+    ``mode="nltk"`` runs NLTK's ``word_tokenize``. ``mode="fast"`` is meant
+    for text that already went through ``TextCleaner``: it splits on
+    whitespace, skips sentence splitting and the punkt resource, and agrees
+    with the NLTK path on such input. The punkt check in ``nltk`` mode is
+    deferred to the first text that needs it and shared process-wide.
+    """
 
-    def __init__(self, preserve_case: bool = False):
+    MODES = ("nltk", "fast")
+
+    def __init__(self, preserve_case: bool = False, mode: str = "nltk"):
         self.logger = logging.getLogger(self.__class__.__name__)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
@@ -24,22 +46,24 @@ class IndonesianTokenizer:
             self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown tokenizer mode '{mode}', expected one of {self.MODES}")
+
         self.preserve_case = preserve_case
+        self.mode = mode
         self._non_word_pattern = re.compile(r"^\W+$")
-        self._ensure_nltk_resource("punkt")
 
     def _ensure_nltk_resource(self, resource: str) -> None:
-        try:
-            nltk.data.find(f"tokenizers/{resource}")
-        except LookupError:
-            self.logger.info("Downloading NLTK resource: %s", resource)
-            nltk.download(resource)
+        get_registry().nltk_resource(f"tokenizers/{resource}")
 
     def tokenize(self, text: str) -> List[str]:
         """Tokenize a single text string."""
         if not text:
             return []
 
+        if self.mode == "fast":
+            return self._tokenize_fast(text)
+
         try:
             tokens = word_tokenize(text)
         except LookupError:
@@ -55,6 +79,24 @@ class IndonesianTokenizer:
 
         return processed
 
+    def _tokenize_fast(self, text: str) -> List[str]:
+        non_word = self._non_word_pattern.match
+        processed = []
+        for token in text.split():
+            if non_word(token):
+                continue
+            split_at = _TREEBANK_SPLITS.get(token.lower())
+            if split_at:
+                parts = (token[:split_at], token[split_at:])
+            else:
+                parts = (token,)
+            for part in parts:
+                processed.append(part if self.preserve_case else part.lower())
+        return processed
+
     def tokenize_batch(self, texts: Iterable[str]) -> List[List[str]]:
         """Tokenize an iterable of texts."""
+        if self.mode == "fast":
+            tokenize = self._tokenize_fast
+            return [tokenize(text) if text else [] for text in texts or []]
         return [self.tokenize(text) for text in texts or []]
@@ -0,0 +1,166 @@
+"""Compile large literal vocabularies into prefix-trie regexes."""
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+_END = ""
+
+
+def _build_trie(words: Iterable[str]) -> Dict:
+    trie: Dict = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return trie
+
+
+def _node_to_regex(node: Dict) -> Optional[str]:
+    """Regex for the suffixes below ``node`` (None when it is only a word end)."""
+    branches = []
+    singles = []
+    for char in sorted(key for key in node if key != _END):
+        suffix = _node_to_regex(node[char])
+        if suffix is None:
+            singles.append(re.escape(char))
+        else:
+            branches.append(re.escape(char) + suffix)
+
+    if singles:
+        branches.append(singles[0] if len(singles) == 1 else "[" + "".join(singles) + "]")
+    if not branches:
+        return None
+
+    if _END in node:
+        return "(?:" + "|".join(branches) + ")?"
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def _char_class(chars: Iterable[str]) -> str:
+    """Character class for ``chars`` with consecutive code points collapsed into ranges."""
+    codes = sorted({ord(char) for char in chars})
+    parts: List[str] = []
+    start = prev = codes[0]
+    for code in codes[1:] + [-1]:
+        if code == prev + 1:
+            prev = code
+            continue
+        if start == prev:
+            parts.append(re.escape(chr(start)))
+        else:
+            parts.append(re.escape(chr(start)) + "-" + re.escape(chr(prev)))
+        start = prev = code
+    return "[" + "".join(parts) + "]"
+
+
+def build_trie_regex(words: Iterable[str]) -> str:
+    """
+    Build one regex matching any of ``words``, preferring the longest match
+
+    Shared prefixes are factored out, so a word is matched in time
+    proportional to its length. ``re`` still tries the top-level branches one
+    by one at every position; use ``TriePattern`` for vocabularies with many
+    distinct first characters.
+    """
+    pattern = _node_to_regex(_build_trie(words))
+    return pattern if pattern is not None else "(?!)"
+
+
+class TriePattern:
+    """
+    Longest-match replacement of a literal vocabulary in a single scan
+
+    Candidate positions are found with one character-class search over the
+    first characters of all words, and each candidate is finished with the
+    trie regex for that first character only. Scanning cost therefore does
+    not grow with the size of the vocabulary: positions that cannot start a
+    word are skipped in C, and a match never tries unrelated branches.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        trie = _build_trie(words)
+        self._complete = {char for char, node in trie.items() if _END in node}
+        self._suffixes: Dict[str, Optional[re.Pattern]] = {}
+        for char, node in trie.items():
+            suffix = _node_to_regex(node)
+            self._suffixes[char] = re.compile(suffix) if suffix is not None else None
+
+        if not trie:
+            self._first = re.compile("(?!)")
+            return
+        # ``re`` only builds a constant-time lookup table for BMP characters;
+        # astral ones (most emoji) are checked as ranges behind a cheap guard
+        bmp = [char for char in trie if ord(char) <= 0xFFFF]
+        astral = [char for char in trie if ord(char) > 0xFFFF]
+        alternatives = []
+        if bmp:
+            alternatives.append(_char_class(bmp))
+        if astral:
+            alternatives.append("(?=[\U00010000-\U0010FFFF])" + _char_class(astral))
+        self._first = re.compile("|".join(alternatives))
+
+    def finditer(self, text: str):
+        """Yield ``(start, end)`` of successive non-overlapping longest matches."""
+        search = self._first.search
+        match = search(text)
+        while match:
+            start = match.start()
+            char = text[start]
+            suffix = self._suffixes[char]
+            end = None
+            if suffix is not None:
+                tail = suffix.match(text, start + 1)
+                if tail is not None and (tail.end() > start + 1 or char in self._complete):
+                    end = tail.end()
+            elif char in self._complete:
+                end = start + 1
+
+            if end is None:
+                match = search(text, start + 1)
+            else:
+                yield start, end
+                match = search(text, end)
+
+    def sub(self, replace: Callable[[str], str], text: str) -> str:
+        """Replace every match with ``replace(matched_word)``."""
+        pieces = []
+        pos = 0
+        for start, end in self.finditer(text):
+            pieces.append(text[pos:start])
+            pieces.append(replace(text[start:end]))
+            pos = end
+        if not pieces:
+            return text
+        pieces.append(text[pos:])
+        return "".join(pieces)
+
+
+class SubstringFinder:
+    """
+    Which words of a vocabulary occur anywhere in a text, as ``word in text`` would say
+
+    A lookahead trie regex reports the longest word starting at every
+    position in one scan. Every shorter word found at that position is a
+    prefix of it, so each hit expands to its precomputed set of prefixes.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        vocabulary = {word for word in words if word}
+        self._scan = re.compile("(?=(" + build_trie_regex(vocabulary) + "))")
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            word: frozenset(other for other in vocabulary if word.startswith(other))
+            for word in vocabulary
+        }
+
+    def find(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        prefixes = self._prefixes
+        for match in self._scan.finditer(text):
+            found |= prefixes[match.group(1)]
+        return found
@@ -130,5 +130,257 @@ def test_end_to_end_pipeline():
     except Exception as e:
         pytest.fail(f"End-to-end pipeline failed: {e}")
 
+# Feature extraction
+def test_hashing_features_match_tfidf_and_stream():
+    """Hashing mode reproduces TF-IDF weights without a vocabulary and fits chunk by chunk."""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from src.modeling.features import FeatureExtractor
+
+    texts = pd.Series(["timnas main bagus", "pssi gagal total", "timnas gagal lagi", "semoga timnas lolos"] * 5)
+    hashed = FeatureExtractor(mode="hashing", n_features=2 ** 12).fit(texts)
+    tfidf = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True).fit(texts)
+    for text in texts[:4]:
+        expected = sorted(tfidf.transform([text]).data)
+        assert np.allclose(sorted(hashed.transform([text]).data), expected)
+
+    streamed = FeatureExtractor(mode="hashing", n_features=2 ** 12).fit_stream(texts[i:i + 6] for i in range(0, 20, 6))
+    restored = pickle.loads(pickle.dumps(streamed))
+    assert (restored.transform(texts) != hashed.transform(texts)).nnz == 0
+    assert len(pickle.dumps(FeatureExtractor(mode="hashing", use_idf=False))) < 5000
+    with pytest.raises(ValueError):
+        FeatureExtractor().partial_fit(texts)
+
+def test_incremental_training_resumes_from_checkpoint(tmp_path):
+    """Streaming training resumed on an appended file equals one uninterrupted run."""
+    import numpy as np
+    from src.modeling.svm_model import SVMSentimentModel
+    from src.modeling.train_incremental import train_incremental
+
+    rows = [("timnas main bagus", "positive"), ("pssi gagal total", "negative"),
+            ("semoga timnas lolos", "positive"), ("wasit curang", "negative"),
+            ("", "positive"), ("pertandingan malam ini", "unknown")] * 10
+    df = pd.DataFrame(rows, columns=["normalized_text", "sentiment_label"])
+    full_path, growing_path = tmp_path / "full.csv", tmp_path / "growing.csv"
+    df.to_csv(full_path, index=False)
+    df.iloc[:30].to_csv(growing_path, index=False)
+
+    full = train_incremental(str(full_path), str(tmp_path / "full"), chunk_size=6)
+    train_incremental(str(growing_path), str(tmp_path / "growing"), chunk_size=6)
+    df.to_csv(growing_path, index=False)
+    resumed = train_incremental(str(growing_path), str(tmp_path / "growing"), chunk_size=6, resume=True)
+
+    assert resumed.stream_position_ == full.stream_position_ == 60
+    assert resumed.rows_seen_ == full.rows_seen_ == 40
+    assert np.array_equal(resumed.model.coef_, full.model.coef_)
+    loaded = SVMSentimentModel.load(str(tmp_path / "growing" / "svm_model.pkl"),
+                                    str(tmp_path / "growing" / "label_encoder.pkl"))
+    with open(tmp_path / "growing" / "feature_extractor.pkl", "rb") as f:
+        features = pickle.load(f).transform(["timnas main bagus"])
+    assert loaded.predict(features)[0] == "positive"
+    assert loaded.predict_proba(features).shape == (1, 2)
+
+def test_incremental_hinge_model_is_servable(tmp_path):
+    """Hinge models are saved with a calibration map, so artifacts give confidences."""
+    import numpy as np
+    from src.modeling.svm_model import SVMSentimentModel
+    from src.modeling.train_incremental import train_incremental
+
+    rows = [("timnas main bagus", "positive"), ("pssi gagal total", "negative"),
+            ("semoga timnas lolos", "positive"), ("wasit curang", "negative"),
+            ("jadwal laga besok", "neutral"), ("laga malam ini", "neutral")] * 10
+    path = tmp_path / "comments.csv"
+    pd.DataFrame(rows, columns=["normalized_text", "sentiment_label"]).to_csv(path, index=False)
+
+    model = train_incremental(str(path), str(tmp_path / "model"), chunk_size=12, loss="hinge")
+    with open(tmp_path / "model" / "feature_extractor.pkl", "rb") as f:
+        features = pickle.load(f).transform(["timnas main bagus", "wasit curang", "laga malam ini"])
+    labels, confidence = model.predict_with_confidence(features)
+    assert list(labels) == ["positive", "negative", "neutral"]
+    assert np.allclose(model.predict_proba(features).sum(axis=1), 1.0)
+    assert ((confidence > 0) & (confidence <= 1)).all()
+
+    loaded = SVMSentimentModel.load(str(tmp_path / "model" / "svm_model.pkl"),
+                                    str(tmp_path / "model" / "label_encoder.pkl"))
+    assert list(loaded.predict_with_confidence(features)[0]) == list(labels)
+    with open(tmp_path / "model" / "svm_model.pkl", "rb") as f:
+        artifact = pickle.load(f)  # what the inference API serves
+    assert np.allclose(artifact.predict_with_confidence(features)[1], confidence)
+
+@pytest.mark.parametrize("loss", ["log_loss", "hinge"])
+def test_incremental_hyperparameter_tuning_keeps_model_incremental(loss):
+    """Tuning an incremental model searches SGD alpha and leaves a model partial_fit can update."""
+    import numpy as np
+    from sklearn.linear_model import SGDClassifier
+    from src.modeling.features import FeatureExtractor
+    from src.modeling.svm_model import SVMSentimentModel
+
+    texts = pd.Series(["timnas main bagus", "pssi gagal total", "wasit curang banget",
+                       "semoga timnas lolos", "laga malam ini", "jadwal pertandingan besok"] * 10)
+    labels = pd.Series(["positive", "negative", "negative", "positive", "neutral", "neutral"] * 10)
+    features = FeatureExtractor(min_df=1).fit_transform(texts)
+
+    model = SVMSentimentModel(incremental=True, loss=loss)
+    best = model.hyperparameter_tuning(features, labels, param_grid={"alpha": [1e-4, 1e-3]}, cv=3)
+    assert isinstance(model.model, SGDClassifier) and model.model.loss == loss
+    assert model.alpha == best["best_params"]["alpha"]
+    model.partial_fit(features[:12], labels[:12], classes=["negative", "neutral", "positive"])
+    predicted, confidence = model.predict_with_confidence(features)
+    assert (predicted == labels).mean() == 1.0
+    assert ((confidence > 0) & (confidence <= 1)).all()
+
+@pytest.mark.parametrize("calibration", ["sigmoid", "isotonic"])
+def test_fast_linear_model_calibrated_in_one_pass(tmp_path, calibration):
+    """Fast linear model: labels from the decision function, stored calibration, same artifacts."""
+    import numpy as np
+    from src.modeling.features import FeatureExtractor
+    from src.modeling.svm_model import SVMSentimentModel
+
+    texts = pd.Series(["timnas main bagus", "pssi gagal total", "wasit curang banget",
+                       "semoga timnas lolos", "laga malam ini", "jadwal pertandingan besok"] * 10)
+    labels = pd.Series(["positive", "negative", "negative", "positive", "neutral", "neutral"] * 10)
+    features = FeatureExtractor(min_df=1).fit_transform(texts)
+
+    model = SVMSentimentModel(fast_linear=True, calibration=calibration).fit(features, labels)
+    predicted, confidence = model.predict_with_confidence(features)
+    proba = model.predict_proba(features)
+    assert list(predicted) == list(model.predict(features))
+    assert np.allclose(proba.sum(axis=1), 1.0)
+    columns = model.label_encoder.transform(predicted)
+    assert np.allclose(confidence, proba[np.arange(len(predicted)), columns])
+    assert (predicted == labels).mean() == 1.0
+
+    model.save(str(tmp_path / "svm_model.pkl"), str(tmp_path / "label_encoder.pkl"))
+    loaded = SVMSentimentModel.load(str(tmp_path / "svm_model.pkl"), str(tmp_path / "label_encoder.pkl"))
+    assert np.allclose(loaded.predict_proba(features), proba)
+
+def test_inference_api_returns_label_names(tmp_path, monkeypatch):
+    """The endpoints decode LabelEncoder codes from a fast linear artifact into label names."""
+    pytest.importorskip("fastapi")
+    import asyncio
+    from src.api import inference_api
+    from src.modeling.features import FeatureExtractor
+    from src.modeling.svm_model import SVMSentimentModel
+
+    texts = pd.Series(["timnas main bagus", "pssi gagal total", "wasit curang banget",
+                       "semoga timnas lolos", "laga malam ini", "jadwal pertandingan besok"] * 10)
+    labels = pd.Series(["positive", "negative", "negative", "positive", "neutral", "neutral"] * 10)
+    extractor = FeatureExtractor(min_df=1)
+    model = SVMSentimentModel(fast_linear=True).fit(extractor.fit_transform(texts), labels)
+    model.save(str(tmp_path / "svm_model.pkl"), str(tmp_path / "label_encoder.pkl"))
+    with open(tmp_path / "feature_extractor.pkl", "wb") as f:
+        pickle.dump(extractor, f)
+    monkeypatch.setattr(inference_api, "_model_cache", {})
+    inference_api.load_model(str(tmp_path / "svm_model.pkl"), str(tmp_path / "feature_extractor.pkl"),
+                             str(tmp_path / "label_encoder.pkl"))
+
+    single = asyncio.run(inference_api.predict(inference_api.TextInput(text="timnas main bagus")))
+    assert single.sentiment == "positive" and 0 < single.confidence <= 1
+    batch = asyncio.run(inference_api.predict_batch(
+        inference_api.BatchTextInput(texts=["wasit curang banget", "laga malam ini"])
+    ))
+    assert [result.sentiment for result in batch.results] == ["negative", "neutral"]
+
+def test_feature_cache_reuses_fold_matrices(tmp_path):
+    """Cached fold matrices equal a vectorizer pipeline and are shared across classifier settings and runs."""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.model_selection import StratifiedKFold, cross_val_score
+    from sklearn.pipeline import Pipeline
+    from sklearn.svm import LinearSVC
+    from src.modeling.feature_cache import FeatureMatrixCache, cross_val_score_cached
+
+    texts = ["timnas main bagus", "pssi gagal total", "wasit curang banget", "semoga timnas lolos",
+             "timnas gagal lagi", "main bagus sekali"] * 10
+    labels = ["positive", "negative", "negative", "positive", "negative", "positive"] * 10
+    folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+    cache = FeatureMatrixCache(str(tmp_path))
+    for C in (0.1, 1.0):
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True)
+        expected = cross_val_score(Pipeline([("vectorizer", vectorizer), ("svm", LinearSVC(C=C))]),
+                                   texts, labels, cv=folds)
+        scores = cross_val_score_cached(LinearSVC(C=C), vectorizer, texts, labels, folds, cache=cache)
+        assert np.allclose(scores, expected)
+    assert cache.stats()["tokenizations"] == 1 and cache.stats()["vectorizations"] == 3
+
+    rerun = FeatureMatrixCache(str(tmp_path))
+    cross_val_score_cached(LinearSVC(), TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True),
+                           texts, labels, folds, cache=rerun)
+    assert rerun.stats()["vectorizations"] == 0 and rerun.stats()["hits"] == 3
+
+def test_cached_grid_search_matches_vectorizer_pipeline(tmp_path):
+    """SVMTuner's cached search scores like GridSearchCV over a vectorizer + SVC pipeline."""
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+    from sklearn.pipeline import Pipeline
+    from sklearn.svm import SVC
+    from src.modeling.feature_cache import FeatureMatrixCache
+    from src.modeling.svm_tuner import SVMTuner
+
+    texts = pd.Series(["timnas main bagus", "pssi gagal total", "wasit curang banget", "semoga timnas lolos",
+                       "timnas gagal lagi", "main bagus sekali"] * 5)
+    labels = pd.Series(["positive", "negative", "negative", "positive", "negative", "positive"] * 5)
+    grid = {"C": [0.1, 10], "kernel": ["linear"]}
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    model, results = SVMTuner().cached_grid_search(texts, labels, vectorizer, grid, cv=3,
+                                                   cache=FeatureMatrixCache(str(tmp_path)))
+
+    reference = GridSearchCV(
+        Pipeline([("vectorizer", TfidfVectorizer(ngram_range=(1, 2))), ("svm", SVC(random_state=42))]),
+        {"svm__C": grid["C"], "svm__kernel": grid["kernel"]}, scoring="f1_weighted",
+        cv=StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+    ).fit(texts, labels)
+    assert np.allclose(results["cv_results"]["mean_test_score"], reference.cv_results_["mean_test_score"])
+    assert model.predict(vectorizer.transform(["timnas main bagus"]))[0] == 1
+
+def test_experiment_runner_resumes_from_result_store(tmp_path):
+    """Grid jobs are stored per (config, fold); a rerun only runs the missing ones."""
+    import sqlite3
+    from src.evaluation.experiment_runner import ExperimentRunner, ResultStore, expand_grid
+
+    texts = ["timnas main bagus", "pssi gagal total", "wasit curang banget", "semoga timnas lolos",
+             "timnas gagal lagi", "main bagus sekali"] * 10
+    labels = ["positive", "negative", "negative", "positive", "negative", "positive"] * 10
+    grid = [{"family": "regularization", "base": {"vectorizer_params": {"ngram_range": (1, 2)}},
+             "sweep": {"param": "C", "values": [0.1, 1.0]}},
+            {"family": "feature_extraction", "base": {"C": 1.0},
+             "variants": [{"name": "bigrams", "vectorizer_params": {"ngram_range": (1, 2)}},
+                          {"name": "counts", "vectorizer": "count"}]}]
+    configs = expand_grid(grid)
+    store_path = tmp_path / "results.sqlite"
+    runner = ExperimentRunner(ResultStore(str(store_path)), n_splits=3, workers=1, cache_dir=str(tmp_path / "cache"))
+
+    first = runner.run(configs, texts, labels)
+    assert first["jobs_run"] == first["jobs_total"] == 9  # "C = 1.0" and "bigrams" are one config
+    expected = runner.results(configs, first["dataset"])
+    with sqlite3.connect(str(store_path)) as conn:
+        conn.execute("DELETE FROM results WHERE fold = 2")
+    resumed = ExperimentRunner(ResultStore(str(store_path)), n_splits=3, workers=1,
+                               cache_dir=str(tmp_path / "cache")).run(configs, texts, labels)
+    assert resumed["jobs_run"] == 3 and resumed["jobs_skipped"] == 6
+    assert runner.results(configs, first["dataset"]) == expected
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_experiment_runner_records_jobs_around_a_failing_config(tmp_path, workers):
+    """A config that fails in every fold does not lose the other configs' results."""
+    from src.evaluation.experiment_runner import ExperimentRunner, ResultStore, expand_grid
+
+    texts = ["timnas main bagus", "pssi gagal total", "wasit curang banget", "semoga timnas lolos",
+             "timnas gagal lagi", "main bagus sekali"] * 10
+    labels = ["positive", "negative", "negative", "positive", "negative", "positive"] * 10
+    grid = [{"family": "feature_size", "base": {"C": 1.0},
+             "sweep": {"param": "min_df", "values": [1, 500, 2]}}]
+    configs = expand_grid(grid)
+    runner = ExperimentRunner(ResultStore(str(tmp_path / "results.sqlite")), n_splits=3,
+                              workers=workers, cache_dir=None)
+
+    summary = runner.run(configs, texts, labels)
+    assert summary["jobs_run"] == 6
+    assert sorted(failure["fold"] for failure in summary["jobs_failed"]) == [0, 1, 2]
+    assert {failure["name"] for failure in summary["jobs_failed"]} == {"min_df = 500"}
+    results = runner.results(configs, summary["dataset"])
+    assert [result["name"] for result in results] == ["min_df = 1", "min_df = 2"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
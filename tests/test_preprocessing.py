@@ -0,0 +1,514 @@
+"""Test suite for preprocessing fast paths."""
+import os
+import pytest
+import pandas as pd
+
+from src.preprocessing.text_cleaner import TextCleaner
+
+SAMPLE_PATH = "data/raw/sample_comments.csv"
+
+TRICKY_TEXTS = [
+    "Timnas!!! 123 @user #hashtag http://link.com",
+    "@http://x.com lihat #wwwberita dan #golhttp://a.b",
+    "kontak a@b.co+628123456789 atau a@-b.com sekarang",
+    "<b>http://x.com<i>y</i></b> <a href=http://z>link</a>",
+    "GOOOOL gol gol gol, gol, gol!!! aAaAa yg yg yg",
+    "Ⓐⓐ 😭😭 ０８１２３ ſſſ KKK İiİi é è ß",
+    "dll dll dll\tkrn\nTDK semangat...???",
+    "12", "!!", "   ",
+]
+
+
+@pytest.fixture(scope="module")
+def cleaner():
+    return TextCleaner()
+
+
+def _sample_texts():
+    texts = list(TRICKY_TEXTS)
+    if os.path.exists(SAMPLE_PATH):
+        texts += pd.read_csv(SAMPLE_PATH)["text"].dropna().astype(str).tolist()
+    return texts
+
+
+@pytest.mark.parametrize("indonesian", [False, True])
+@pytest.mark.parametrize("disabled", [None] + list(TextCleaner.DEFAULT_OPTIONS))
+def test_compiled_cleaner_parity(cleaner, indonesian, disabled):
+    """Compiled pipeline must match clean_text byte for byte."""
+    options = {disabled: False} if disabled else None
+    compiled = cleaner.compile(options, indonesian=indonesian)
+    assert compiled.check_parity(_sample_texts()) == []
+
+
+def test_compiled_cleaner_fuses_passes(cleaner):
+    """Default options should need fewer passes than the reference path."""
+    compiled = cleaner.compile()
+    assert cleaner.compile() is compiled
+    assert "special_chars+whitespace" in compiled.describe()
+    assert len(compiled.passes) < 14
+
+
+def test_abbreviation_normalizer(cleaner):
+    """Abbreviations are expanded case-insensitively on whole words."""
+    assert cleaner.clean_indonesian_text("YG krn tdk yguk") == "yang karena tidak yguk"
+
+
+@pytest.mark.parametrize("indonesian", [False, True])
+def test_clean_column_matches_clean_text(cleaner, indonesian):
+    """Column cleaning returns the same rows plus a too-short mask."""
+    texts = pd.Series(_sample_texts() + [None, "", 42])
+    cleaned, too_short = cleaner.clean_column(texts, indonesian=indonesian)
+    compiled = cleaner.compile(indonesian=indonesian)
+
+    assert cleaned.tolist() == [compiled.reference(text) for text in texts]
+    assert too_short.tolist() == [
+        isinstance(text, str) and bool(text) and cleaner.clean_text(text) == ""
+        for text in texts
+    ]
+
+
+def test_fast_tokenizer_on_clean_text(cleaner):
+    """Fast mode splits pre-cleaned text like NLTK's Treebank rules."""
+    from src.preprocessing.tokenizer import IndonesianTokenizer
+
+    tokenizer = IndonesianTokenizer(mode="fast")
+    text = cleaner.compile(indonesian=True).clean("Timnas GAGAL lagi, dll... cannot wanna")
+    assert tokenizer.tokenize(text) == [
+        "timnas", "gagal", "lagi", "dan", "lain-lain", "can", "not", "wan", "na"
+    ]
+    assert tokenizer.tokenize_batch([text, ""]) == [tokenizer.tokenize(text), []]
+
+
+def test_resource_registry_shares_and_stays_offline(tmp_path):
+    """Resources are built once per process and never downloaded offline."""
+    from src.preprocessing.normalizer import TextNormalizer
+    from src.preprocessing.resources import ResourceRegistry, get_registry
+
+    assert get_registry() is get_registry()
+    assert TextNormalizer().stemmer is TextNormalizer().stemmer
+
+    registry = ResourceRegistry(resource_dir=tmp_path, offline=True)
+    assert registry.nltk_resource("corpora/no_such_resource") is False
+    assert not (tmp_path / "nltk_data").exists()
+    assert "total" in registry.startup_report()
+
+
+def test_record_cache_reuses_processed_comments(tmp_path):
+    """Near-duplicate comments are processed once and survive a restart."""
+    from src.preprocessing.preprocessor import TextPreprocessor
+
+    path = tmp_path / "records.sqlite"
+    texts = ["Semangat Garuda!!! pemain main bagus", "semangat   garuda !! pemain main bagus"]
+
+    preprocessor = TextPreprocessor(record_cache_path=str(path))
+    uncached = TextPreprocessor(record_cache_size=0)
+    records = [preprocessor.process_text(text) for text in texts]
+    assert records == [uncached.process_text(text) for text in texts]
+    assert preprocessor.record_cache_stats()["hits"] == 1
+    preprocessor.flush_caches()
+
+    restarted = TextPreprocessor(record_cache_path=str(path))
+    assert restarted.process_text(texts[0]) == records[0]
+    assert restarted.record_cache_stats()["disk_hits"] == 1
+
+
+def test_stem_cache_round_trip_and_read_only(tmp_path):
+    """Stems survive a restart; a read-only cache serves them but never writes."""
+    from src.preprocessing.stem_cache import PersistentStemCache
+
+    path = tmp_path / "stems.sqlite"
+    assert PersistentStemCache(path, read_only=True).get("bermain") is None
+    assert not path.exists()
+
+    cache = PersistentStemCache(path)
+    cache.put("bermain", "main")
+    cache.put("pemainnya", "main")
+    cache.close()
+
+    reader = PersistentStemCache(path, read_only=True)
+    assert reader.get("bermain") == "main" and reader.get("kalah") is None
+    reader.put("kalah", "kalah")
+    reader.close()
+    restarted = PersistentStemCache(path)
+    assert len(restarted) == 2 and restarted.get("pemainnya") == "main"
+    assert restarted.get("kalah") is None
+
+
+def test_stem_cache_evicts_least_recently_used(tmp_path):
+    """A full cache keeps new and recently hit stems and drops stale ones."""
+    from src.preprocessing.stem_cache import PersistentStemCache
+
+    path = tmp_path / "stems.sqlite"
+    cache = PersistentStemCache(path, max_entries=3)
+    for token in ("lama", "sering", "jarang"):
+        cache.put(token, token)
+    cache.get("jarang")  # more hits than "baru", but longer ago
+    cache.flush()
+    for _ in range(5):
+        cache.get("lama")
+    cache.flush()
+    cache.get("sering")
+    cache.put("baru", "baru")
+    cache.close()
+
+    assert cache.stats()["evictions"] == 1
+    restarted = PersistentStemCache(path, max_entries=3)
+    assert restarted.get("jarang") is None
+    assert all(restarted.get(token) == token for token in ("lama", "sering", "baru"))
+
+
+def test_process_dataframe_workers_match_serial():
+    """The worker pool returns the serial rows, in order, with the same short rows dropped."""
+    from src.preprocessing.preprocessor import TextPreprocessor
+
+    texts = list(TRICKY_TEXTS) + [None, "", "timnas main bagus sekali", "pssi gagal total"] * 3
+    df = pd.DataFrame({"id": range(len(texts)), "text": texts})
+
+    preprocessor = TextPreprocessor()
+    serial = preprocessor.process_dataframe(df, batch_size=4, workers=1)
+    parallel = preprocessor.process_dataframe(df, batch_size=4, workers=2)
+
+    assert len(serial) < len(df)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_emoji_translator_single_pass(tmp_path):
+    """Emoji and emoticons are translated in one scan, longest entry first."""
+    from src.preprocessing.emoji_handler import EmojiTranslator, process_emoji_emoticon
+
+    assert process_emoji_emoticon("gol 😂😂 :) http://x") == "gol  tertawa  tertawa  senang  http bingung /x"
+
+    lexicon = tmp_path / "emoji.tsv"
+    lexicon.write_text("👍\tbagus\n👍🏻\tmantap\n", encoding="utf-8")
+    translator = EmojiTranslator.from_file(lexicon, include_defaults=False)
+    assert len(translator) == 2
+    assert translator.translate("👍🏻👍 ok") == " mantap  bagus  ok"
+
+
+def test_negation_tagger_scope_and_intensifiers():
+    """Negation scope and intensifiers are tagged in one pass over tokens."""
+    from src.preprocessing.emoji_handler import process_emoji_emoticon
+    from src.preprocessing.enhanced_preprocessor import EnhancedPreprocessor
+    from src.preprocessing.negation_handler import NegationTagger, process_negation_intensifiers
+
+    assert process_negation_intensifiers("Tidak bagus sangat buruk") == "NEG NEG_bagus INTENS_sangat_buruk"
+    assert process_negation_intensifiers("sangat tidak bagus") == "sangat NEG NEG_bagus"
+    assert NegationTagger(scope=2).tag("gak main gak lari cepat".split()) == [
+        "NEG", "NEG_main", "NEG", "NEG_lari", "NEG_cepat"
+    ]
+
+    preprocessor = EnhancedPreprocessor(negation_scope=2)
+    texts = ["Timnas TIDAK main bagus 😭😭", "pelatih sangat buruk!!!"]
+    expected = [preprocessor.preprocess(text) for text in texts]
+    assert expected[0] == "timnas NEG NEG_main NEG_bagus menangis menangis"
+    tokens = [preprocessor.cleaner.clean(process_emoji_emoticon(text)).split() for text in texts]
+    assert preprocessor.preprocess_batch(tokens, pretokenized=True) == expected
+
+
+def test_pipeline_profiler_stages():
+    """Profiling records every stage and leaves the output unchanged."""
+    from src.preprocessing.preprocessor import TextPreprocessor
+
+    text = "Pemain timnas YG bermain sangat bagus!!! 😂"
+    plain = TextPreprocessor(record_cache_size=0)
+    profiled = TextPreprocessor(record_cache_size=0, profile=True)
+    assert profiled.process_text(text) == plain.process_text(text)
+    assert plain.profiler.report()["stages"] == {}
+
+    stages = profiled.profiler.report()["stages"]
+    for name in ("cleaning", "indonesian_cleaning", "tokenize", "stopword_removal", "stemming", "labeling"):
+        assert stages[name]["calls"] == 1
+    assert stages["stemming"]["cache_hits"] + stages["stemming"]["cache_misses"] > 0
+
+
+def test_keyword_automaton_matches_regex_semantics():
+    """The phrase automaton finds exactly what per-keyword \\b regexes find."""
+    import re
+    from src.preprocessing.keyword_automaton import KeywordAutomaton
+
+    phrases = ["tiki-taka", "4-4-2", "main", "main bagus", "don t give up", "u-19", "-", ""]
+    automaton = KeywordAutomaton(phrases)
+    for text in ["main tiki-taka", "4-4-2-1 mainan", "main  bagus u-19!", "don t give up -", "x-main-"]:
+        expected = {p for p in phrases if re.search(r'\b' + re.escape(p) + r'\b', text)}
+        assert automaton.find(text) == expected
+
+
+@pytest.fixture(scope="module")
+def optimized_labeler(tmp_path_factory):
+    from src.preprocessing.optimized_sentiment_labeler import OptimizedSentimentLabeler
+
+    return OptimizedSentimentLabeler(lexicon_cache_dir=str(tmp_path_factory.mktemp("lexicon")))
+
+
+def test_optimized_labeler_automaton_parity(optimized_labeler):
+    """Single-pass labeling gives the same labels and scores as label_layer."""
+    labeler = optimized_labeler
+    keywords = list(labeler.stemmed_keywords_cache)
+    texts = [" ".join(keywords[i::97][:6]) for i in range(20)]
+    texts += ["pelatih harus diganti, strategi tiki-taka gagal total", "", "4-4-2 u-19"]
+    for text in texts:
+        assert labeler.label_text(text) == labeler.label_text(text, use_automaton=False)
+
+
+def test_optimized_label_document_reuses_stems(optimized_labeler, monkeypatch):
+    """Documents are labeled from their stems, like label_text on normalized_text, without re-tokenizing."""
+    from src.preprocessing import optimized_sentiment_labeler as module
+    from src.preprocessing.preprocessor import TextPreprocessor
+
+    labeler = optimized_labeler
+    keywords = list(labeler.stemmed_keywords_cache)
+    texts = [" ".join(keywords[i::89][:8]) for i in range(15)] + _sample_texts()
+    texts += ["Pelatih harus diganti, strategi tiki-taka gagal total", "4-4-2 u-19 menyerang", ""]
+    documents = TextPreprocessor(record_cache_size=0, enable_labeling=False).analyze_batch(texts)
+    expected = [labeler.label_text(document.normalized_text) for document in documents]
+
+    calls = []
+    original = module.word_tokenize
+    monkeypatch.setattr(module, "word_tokenize", lambda text: calls.append(text) or original(text))
+    assert [labeler.label_document(document) for document in documents] == expected
+    assert len(calls) <= len({stem for document in documents for stem in document.stems})
+
+
+def test_analyzed_document_feeds_all_consumers():
+    """Labelers and feature extractors consume one shared, immutable document."""
+    import dataclasses
+    from src.analysis.football_emotion_classifier import FootballEmotionClassifier
+    from src.modeling.features import FeatureExtractor
+    from src.preprocessing.preprocessor import TextPreprocessor
+
+    preprocessor = TextPreprocessor(record_cache_size=0)
+    texts = ["Strategi pelatih SALAH, kenapa tidak main?", "Optimis Indonesia bisa juara!!"]
+    documents = preprocessor.analyze_batch(texts)
+    document = documents[0]
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        document.clean_text = "x"
+    record = preprocessor.process_text(texts[0])
+    assert document.normalized_text == record["normalized_text"]
+    assert preprocessor.labeler.label_document(document)["label"] == record["sentiment_label"]
+
+    classifier = FootballEmotionClassifier()
+    assert classifier.classify_document(document) == classifier.classify_emotion(document.clean_text)
+
+    extractor = FeatureExtractor(min_df=1, max_df=1.0)
+    from_documents = extractor.fit_transform(documents).toarray()
+    from_strings = FeatureExtractor(min_df=1, max_df=1.0).fit_transform(
+        pd.Series([doc.clean_text for doc in documents])
+    ).toarray()
+    assert (from_documents == from_strings).all()
+
+
+def test_lexicon_labeler_inverted_index_parity(tmp_path):
+    """Index-based scoring counts keyword hits exactly like the per-keyword scan."""
+    from src.preprocessing.sentiment_labeler import SentimentLexiconLabeler
+
+    labeler = SentimentLexiconLabeler(lexicon_cache_dir=str(tmp_path))
+
+    def reference_hits(text, tokens=None):
+        text_lower = text.lower()
+        token_list = [tok.lower() for tok in (tokens or text_lower.split()) if tok]
+        hits = {}
+        for category, meta in labeler.lexicon.items():
+            hits[category] = sum(
+                (keyword in text_lower) if " " in keyword else token_list.count(keyword)
+                for keyword in meta["keywords"]
+            )
+        return hits
+
+    keywords = [kw for meta in labeler.lexicon.values() for kw in meta["keywords"]]
+    texts = [" ".join(keywords[i::37]) for i in range(37)] + ["", "timnas kalah lagi"]
+    for text in texts:
+        result = labeler.label_text(text)
+        hits = reference_hits(text)
+        for match in result["matches"]:
+            assert match["hits"] == hits[match["category"]]
+        assert {m["category"] for m in result["matches"]} <= {c for c, h in hits.items() if h >= labeler.min_hits}
+
+    batch = labeler.label_batch(pd.Series(texts[:3], index=[10, 11, 12]))
+    assert list(batch.index) == [10, 11, 12]
+    assert batch.loc[11, "label"] == labeler.label_text(texts[1])["label"]
+
+
+def test_batch_lexicon_scorer_matches_label_text(optimized_labeler):
+    """Matrix scoring reproduces label_text row for row, including defaults."""
+    from src.preprocessing.batch_lexicon_scorer import BatchLexiconScorer
+
+    scorer = BatchLexiconScorer(optimized_labeler)
+    keywords = list(optimized_labeler.stemmed_keywords_cache)
+    texts = [" ".join(keywords[i::53][:8]) for i in range(53)]
+    texts += ["pelatih harus diganti, strategi tiki-taka gagal total", "", None, "4-4-2 u-19"]
+    texts += texts[:5]
+
+    expected = [optimized_labeler.label_text(text) for text in texts]
+    assert scorer.label_texts(texts) == expected
+
+    frame = scorer.score(pd.Series(texts, index=range(100, 100 + len(texts))), keywords=False)
+    assert frame.index[0] == 100
+    assert frame["primary_label"].tolist() == [labels["primary_label"] for labels in expected]
+
+
+def test_compiled_emotion_engine_parity():
+    """Gated, precompiled emotion scoring and the vectorized DataFrame path match the loops."""
+    from src.analysis.football_emotion_classifier import FootballEmotionClassifier
+
+    classifier = FootballEmotionClassifier()
+    texts = [
+        "Sangat kecewa banget dengan performa timnas, gagal lagi lolos piala dunia",
+        "Strategi pelatih salah, KOK gak main pemain terbaik kita?",
+        "Demi kehormatan bangsa Indonesia, harus bangkit lagi!",
+        "Lawan memang lebih baik, kita harus belajar banyak. Respect!",
+        "ſedih banget, Kapan menang", "tidak ada apa-apa", "",
+    ]
+    for text in texts:
+        assert classifier._calculate_emotion_scores(text) == classifier._calculate_emotion_scores(text, use_engine=False)
+
+    sentiments = ["negative", "negative", None, "positive", "neutral", "positive", "negative"]
+    df = pd.DataFrame({"clean_text": texts + [None], "core_sentiment": sentiments + [None]})
+    output = classifier.process_dataframe(df)
+    for i, (text, sentiment) in enumerate(zip(df["clean_text"], df["core_sentiment"])):
+        emotion, confidence, scores = classifier.classify_emotion(text, sentiment)
+        assert output.at[i, "football_emotion"] == emotion
+        assert output.at[i, "emotion_confidence"] == confidence
+        for name, score in scores.items():
+            assert output.at[i, f"emotion_score_{name}"] == score
+
+
+def test_rule_engine_matches_row_loop():
+    """Declarative cleanup rules label the unknown subset like the old per-row checks."""
+    from src.preprocessing.final_cleanup_improved import IMPROVED_ENGINE, final_cleanup_improved
+
+    texts = [
+        "main bagus sekali!", "tidak bagus", "tidak jelek", "bagus tapi kalah!",
+        "bagus tapi kalah", "kapan main?", "oh", "hari ini cerah sekali ya", None,
+    ]
+    df = pd.DataFrame({
+        "clean_text": texts,
+        "core_sentiment": ["unknown"] * (len(texts) - 1) + ["positive"],
+    }, index=range(10, 10 + len(texts)))
+
+    output = final_cleanup_improved(df)
+    assert output["core_sentiment"].tolist() == [
+        "positive", "negative", "positive", "positive",
+        "neutral", "neutral", "neutral", "neutral", "positive",
+    ]
+    assert (df["core_sentiment"].iloc[:-1] == "unknown").all()
+
+    features = IMPROVED_ENGINE.features(pd.Series(["bagus bagus tidak"]))
+    assert features.loc[0, "pos"] == 1 and features.loc[0, "negation"] == 1
+
+
+def test_lexicon_compiler_validates_and_caches(tmp_path):
+    """Compiled lexicons are validated, keyed by config hash and reloaded from disk."""
+    from src.preprocessing.lexicon_compiler import (
+        LexiconValidationError,
+        NINE_LAYER_LEXICON,
+        OPTIMIZED_LEXICON,
+        compile_lexicon,
+        config_hash,
+        load_or_compile,
+        validate_layers,
+    )
+    from src.preprocessing.sentiment_labeler import SentimentLexiconLabeler
+
+    layers = {
+        "layer1_core": {
+            "positive": {"keywords": ["bagus", "bagus", "menang"], "weight": 1.0},
+            "negative": {"keywords": ["kalah", "menang"], "weight": 1.2},
+        }
+    }
+    kinds = sorted(issue.kind for issue in validate_layers(layers))
+    assert kinds == ["collision", "duplicate"]
+    with pytest.raises(LexiconValidationError):
+        validate_layers({"layer1_core": {"positive": {"keywords": ["bagus"], "weight": "tinggi"}}})
+
+    class UpperStemmer:
+        def stem(self, token):
+            return token.upper()
+
+    compiled = compile_lexicon(OPTIMIZED_LEXICON, layers=layers, stemmer=UpperStemmer())
+    assert compiled.stemmed_keywords["menang"] == "MENANG"
+    assert compiled.structures["automaton"].find("MENANG lagi") == {"MENANG"}
+    layers["layer1_core"]["negative"]["weight"] = 1.3
+    assert config_hash(OPTIMIZED_LEXICON, layers) != compiled.config_hash
+
+    first = load_or_compile(NINE_LAYER_LEXICON, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("sentiment_config-*.pkl"))) == 1
+    second = load_or_compile(NINE_LAYER_LEXICON, cache_dir=tmp_path)
+    assert second.config_hash == first.config_hash
+    assert second.structures["token_index"] == first.structures["token_index"]
+
+    cached = SentimentLexiconLabeler(lexicon_cache_dir=str(tmp_path))
+    fresh = SentimentLexiconLabeler(lexicon_cache=False)
+    assert cached.lexicon == fresh.lexicon and cached.phrase_index == fresh.phrase_index
+
+
+def test_incremental_relabel_patches_only_affected_comments(optimized_labeler, tmp_path):
+    """A lexicon edit re-scores only comments containing touched stems; the patch equals a full relabel."""
+    import copy
+    import json
+    from src.preprocessing.build_optimized_dataset import label_fields
+    from src.preprocessing.incremental_relabel import relabel
+
+    layer = optimized_labeler.layer_keyword_stems['layer2_target']
+    reweighted, edited = list(layer)[:2]
+    removed_keyword, removed_stem = layer[edited][0]
+    texts = [
+        f"pemain {layer[reweighted][0][1]} main jelek",
+        f"{removed_stem} harus mundur",
+        f"{layer[reweighted][0][1]} dan {removed_stem}",
+        "garuda semangat terus",
+        "hujan deras malam ini",
+        "",
+    ] * 3
+
+    def fields(labeler, text):
+        labels = labeler.label_text(text)
+        return label_fields(labels, labeler.get_summary(labels))
+
+    dataset_path = str(tmp_path / "dataset.csv")
+    pd.DataFrame([
+        {'comment_id': f"c{i}", 'normalized_text': text, **fields(optimized_labeler, text)}
+        for i, text in enumerate(texts)
+    ]).to_csv(dataset_path, index=False)
+
+    # First run has no baseline: everything is re-scored, nothing changes
+    summary = relabel(dataset_path, apply=True, labeler=optimized_labeler)
+    assert summary['rescored'] == len(texts) and summary['changed'] == 0
+
+    modified = copy.copy(optimized_labeler)
+    modified.all_categories = copy.deepcopy(optimized_labeler.all_categories)
+    modified.all_categories['layer2_target'][reweighted]['weight'] += 5.0
+    modified.layer_keyword_stems = copy.deepcopy(optimized_labeler.layer_keyword_stems)
+    modified.layer_keyword_stems['layer2_target'][edited] = [
+        pair for pair in layer[edited] if pair[0] != removed_keyword
+    ]
+
+    summary = relabel(dataset_path, apply=True, labeler=modified)
+    assert 0 < summary['rescored'] < len(texts)
+    patched = pd.read_csv(dataset_path, float_precision='round_trip', keep_default_na=False)
+    for _, row in patched.iterrows():
+        expected = fields(modified, row['normalized_text'])
+        assert row['target_kritik'] == expected['target_kritik']
+        assert row['target_score'] == expected['target_score']
+        assert json.loads(row['matched_keywords']) == json.loads(expected['matched_keywords'])
+
+    # Baseline is now the modified lexicon
+    assert relabel(dataset_path, labeler=modified)['rescored'] == 0
+
+
+def test_optimized_label_batch_chunks_and_workers(optimized_labeler):
+    """label_batch gives label_text's fields column-wise, serially and across worker processes."""
+    texts = pd.Series(
+        ["pelatih harus mundur", "timnas main bagus", "", None, "wasit curang banget"] * 3,
+        index=range(100, 115)
+    )
+    calls = []
+    serial = optimized_labeler.label_batch(texts, chunk_size=4, progress=lambda done, total: calls.append(done))
+    assert calls == [4, 8, 12, 15]
+    assert list(serial.index) == list(texts.index)
+    for position, text in enumerate(texts):
+        assert serial.iloc[position].to_dict() == optimized_labeler.label_text(text)
+
+    parallel = optimized_labeler.label_batch(texts, workers=2, chunk_size=4)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert optimized_labeler.label_batch([]).empty